@@ -0,0 +1,132 @@
+"""
+Replay benchmark for Agent 1 extraction (no network)
+
+Builds a synthetic inbox (default 10,000 emails: homework submissions
+mixed with newsletters, HTML-only mails, attachments and long reply
+chains), serves it through the in-memory Gmail service and measures
+end-to-end extraction throughput.
+
+Usage:
+    python scripts/benchmark_agent1_replay.py --emails 10000 --batch-size 50 --workers 4
+    python scripts/benchmark_agent1_replay.py --emails 10000 --list-workers 4   (date-window sharded listing)
+    python scripts/benchmark_agent1_replay.py --mbox temp/synthetic.mbox   (replay via mbox)
+"""
+import argparse
+import contextlib
+import mailbox
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
+from email.utils import format_datetime
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ui.agents.agent1_params import build_gmail_query
+from src.ui.agents.agent1_pipeline import run_extraction
+from src.ui.agents.mail_source_local import message_to_resource, open_local_mailbox
+from src.ui.agents.mail_source_memory import InMemoryGmailService
+
+HOMEWORK_SUBJECT = "AI Development Expert course - Homework - L"
+NOISE_SUBJECTS = ["Course newsletter", "Meeting notes", "Re: project question", "Invoice", "Weekly digest"]
+REPLY_LINE = "> On Mon, a student wrote: thanks for the feedback on the previous homework\n"
+
+
+def build_synthetic_inbox(count: int = 10000, homework_ratio: float = 0.3, seed: int = 19) -> list:
+    """
+    Build a reproducible synthetic inbox
+
+    Returns:
+        list: email.message.EmailMessage objects, newest last
+    """
+    rng = random.Random(seed)
+    start = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    messages = []
+    for i in range(count):
+        msg = EmailMessage()
+        student = f"student{rng.randrange(count // 10 + 1)}"
+        msg['From'] = f"Student {student} <{student}@example.com>"
+        msg['Date'] = format_datetime(start + timedelta(minutes=i * 17 + rng.randrange(10)))
+        msg['Message-ID'] = f"<synthetic-{seed}-{i}@example.com>"
+
+        if rng.random() < homework_ratio:
+            lesson = rng.randrange(1, 25)
+            msg['Subject'] = f"{HOMEWORK_SUBJECT}{lesson}"
+            url = f"https://github.com/{student}/homework-l{lesson}" if rng.random() < 0.9 else "(link to follow)"
+        else:
+            msg['Subject'] = f"{rng.choice(NOISE_SUBJECTS)} #{i}"
+            url = "https://example.com/unsubscribe"
+
+        body = f"Hello,\n\nMy submission: {url}\n\nRegards,\n{student}\n"
+        body += REPLY_LINE * (rng.randrange(500) if rng.random() < 0.2 else rng.randrange(5))
+        kind = rng.random()
+        if kind < 0.15:
+            msg.set_content(f'<html><body><p>My submission: <a href="{url}">repo</a></p></body></html>', subtype='html')
+        else:
+            msg.set_content(body)
+            if kind < 0.45:
+                msg.add_alternative(f"<html><body><pre>{body}</pre></body></html>", subtype='html')
+            if kind > 0.9:
+                msg.add_attachment(os.urandom(rng.randrange(1000, 50000)), maintype='application',
+                                   subtype='zip', filename=f"hw{i}.zip")
+        messages.append(msg)
+    return messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a synthetic inbox through Agent 1")
+    parser.add_argument('--emails', type=int, default=10000)
+    parser.add_argument('--homework-ratio', type=float, default=0.3)
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--list-workers', type=int, default=1, help="Date windows listed in parallel")
+    parser.add_argument('--subject', default=HOMEWORK_SUBJECT)
+    parser.add_argument('--mbox', help="Write the inbox to this mbox file and replay it via the local source")
+    parser.add_argument('--seed', type=int, default=19)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    inbox = build_synthetic_inbox(args.emails, args.homework_ratio, args.seed)
+    if args.mbox:
+        Path(args.mbox).unlink(missing_ok=True)
+        box = mailbox.mbox(args.mbox)
+        for msg in inbox:
+            box.add(msg)
+        box.close()
+        service = open_local_mailbox(args.mbox)
+    else:
+        converted = [message_to_resource(msg) for msg in inbox]
+        attachments = {key: value for _, found in converted for key, value in found.items()}
+        service = InMemoryGmailService([resource for resource, _ in converted], attachments)
+    setup_seconds = time.perf_counter() - start
+
+    params = {
+        'mail_source': service,
+        'email_subject': args.subject,
+        'max_emails': 0,
+        'query': build_gmail_query(args.subject),
+        'batch_size': args.batch_size,
+        'fetch_workers': args.workers,
+        'list_workers': args.list_workers,
+    }
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        submissions, _ = run_extraction(service, params, lambda: service)
+    elapsed = time.perf_counter() - start
+
+    ready = sum(1 for s in submissions if s['status'] == "Ready")
+    print("=" * 70)
+    print(f"Synthetic inbox: {args.emails} emails (setup {setup_seconds:.2f}s)")
+    print(f"Extracted:       {len(submissions)} submissions ({ready} Ready)")
+    print(f"Elapsed:         {elapsed:.2f}s  ->  {args.emails / elapsed:,.0f} emails/s scanned, "
+          f"{len(submissions) / elapsed:,.0f} submissions/s")
+    print(f"API calls:       {dict(service.calls)}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,19 +1,15 @@
 """
 Check what homework emails are actually available in Gmail
 """
+import sys
 from pathlib import Path
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from google.auth.transport.requests import Request
 
-SCOPES = ['https://www.googleapis.com/auth/gmail.readonly', 'https://www.googleapis.com/auth/gmail.compose']
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-creds = Credentials.from_authorized_user_file('Secrets/token.json', SCOPES)
-if not creds or not creds.valid:
-    if creds and creds.expired and creds.refresh_token:
-        creds.refresh(Request())
+from src.ui.agents.gmail_auth import get_gmail_service
 
-service = build('gmail', 'v1', credentials=creds)
+service = get_gmail_service()
 
 # Search for all homework emails
 query = 'subject:Homework'
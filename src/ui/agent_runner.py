@@ -30,7 +30,7 @@ def run_agent(agent_name: str) -> bool:
         Agent 1 will prompt the user for search parameters when it runs:
         - Email Subject (optional)
         - Sender Email (optional)
-        - Max Emails (1-100, default 10)
+        - Max Emails (default 10, 0 = no limit)
     """
     print_header(f"Running {agent_name}...")
 
@@ -147,9 +147,9 @@ def _prompt_agent1_parameters() -> dict:
         else:
             console.print(f"   -> Will filter by sender: [green]{sender_email}[/green]\n")
 
-    # Max emails (required, default 10)
+    # Max emails (required, default 10, 0 = no limit)
     while True:
-        max_emails_input = console.input("[bold]Max Emails (1-100)[/bold] [dim][Default: 10][/dim]: ").strip()
+        max_emails_input = console.input("[bold]Max Emails (0 = no limit)[/bold] [dim][Default: 10][/dim]: ").strip()
         if not max_emails_input:
             max_emails = 10
             console.print("   -> Using default: [green]10 emails[/green]\n")
@@ -157,11 +157,14 @@ def _prompt_agent1_parameters() -> dict:
         else:
             try:
                 max_emails = int(max_emails_input)
-                if 1 <= max_emails <= 100:
+                if max_emails == 0:
+                    console.print("   -> Will process [green]all matching emails[/green]\n")
+                    break
+                elif max_emails > 0:
                     console.print(f"   -> Will process up to [green]{max_emails} emails[/green]\n")
                     break
                 else:
-                    console.print("   [red][!] Please enter a number between 1 and 100[/red]")
+                    console.print("   [red][!] Please enter 0 or a positive number[/red]")
             except ValueError:
                 console.print("   [red][!] Please enter a valid number[/red]")
 
@@ -190,7 +193,7 @@ def _prompt_agent1_parameters() -> dict:
 
     console.print("[bold cyan]=====================================================================[/bold cyan]")
     console.print(f"[bold]Gmail Search Query:[/bold] [cyan]{query}[/cyan]")
-    console.print(f"[bold]Max Results:[/bold] [cyan]{max_emails}[/cyan]")
+    console.print(f"[bold]Max Results:[/bold] [cyan]{max_emails or 'no limit'}[/cyan]")
     console.print("[bold cyan]=====================================================================[/bold cyan]\n")
 
     return {
@@ -212,21 +215,7 @@ def _execute_agent1(params: dict) -> bool:
         bool: True if successful, False otherwise
     """
     try:
-        from google.oauth2.credentials import Credentials
-        from googleapiclient.discovery import build
-        from google_auth_oauthlib.flow import InstalledAppFlow
-        from google.auth.transport.requests import Request
         import openpyxl
-        import re
-        import hashlib
-        from email.utils import parsedate_to_datetime
-        import base64
-
-        # Gmail API scopes
-        SCOPES = [
-            'https://www.googleapis.com/auth/gmail.readonly',
-            'https://www.googleapis.com/auth/gmail.compose'
-        ]
 
         # Extract parameters
         email_subject = params.get('email_subject')
@@ -236,121 +225,24 @@ def _execute_agent1(params: dict) -> bool:
 
         console.print(f"[*] Email Subject: {email_subject or '(all subjects)'}")
         console.print(f"[*] Sender Email: {sender_email or '(all senders)'}")
-        console.print(f"[*] Max Emails: {max_emails}")
+        console.print(f"[*] Max Emails: {max_emails or 'no limit'}")
         console.print(f"[*] Gmail Query: {query}\n")
 
-        # Gmail Authentication
-        console.print("[*] Authenticating with Gmail API...")
-        creds = None
-        token_path = Path('Secrets/token.json')
-        credentials_path = Path('Secrets/credentials.json')
-
-        if token_path.exists():
-            creds = Credentials.from_authorized_user_file(str(token_path), SCOPES)
-
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                flow = InstalledAppFlow.from_client_secrets_file(str(credentials_path), SCOPES)
-                creds = flow.run_local_server(port=0)
-
-            with open(token_path, 'w') as token:
-                token.write(creds.to_json())
-
-        console.print("[+] Authentication successful\n")
+        # Authenticate with Gmail (or open the offline mailbox selected by mail_source);
+        # worker threads each build their own service
+        from .agents.mail_source import open_mail_source
+        service, service_factory = open_mail_source(params, console)
 
-        # Create Gmail service
-        service = build('gmail', 'v1', credentials=creds)
+        # Search and extract (incremental historyId sync or paginated full scan,
+        # batched messages.get, one error row per failed email)
+        from .agents.agent1_sync import save_sync_checkpoints
+        from .agents.agent1_pipeline import run_extraction, label_extracted
 
-        # Search emails
-        console.print("[*] Searching emails...")
-        results = service.users().messages().list(
-            userId='me',
-            q=query,
-            maxResults=max_emails
-        ).execute()
+        submissions, checkpoints = run_extraction(service, params, service_factory)
 
-        messages = results.get('messages', [])
-
-        if not messages:
+        if not submissions:
             console.print("[!] No emails found matching the criteria\n")
             console.print("[*] Creating empty Excel file with headers...\n")
-            submissions = []
-        else:
-            console.print(f"[+] Found {len(messages)} emails\n")
-
-            # Extract Data
-            submissions = []
-            for i, message in enumerate(messages, 1):
-                try:
-                    console.print(f"Processing email {i}/{len(messages)}...")
-
-                    msg = service.users().messages().get(userId='me', id=message['id'], format='full').execute()
-
-                    headers = msg['payload']['headers']
-                    sender = next((h['value'] for h in headers if h['name'] == 'From'), '')
-                    subject = next((h['value'] for h in headers if h['name'] == 'Subject'), '')
-                    date_str = next((h['value'] for h in headers if h['name'] == 'Date'), '')
-
-                    # Post-filter: if email_subject was specified, verify it's a substring (case-insensitive)
-                    if email_subject and email_subject.lower() not in subject.lower():
-                        console.print(f"  [-] Subject doesn't contain '{email_subject}', skipping")
-                        continue
-
-                    email_match = re.search(r'<(.+?)>', sender)
-                    sender_email_extracted = email_match.group(1) if email_match else sender
-
-                    received_time = parsedate_to_datetime(date_str).isoformat()
-                    thread_id = msg['threadId']
-
-                    def get_body(payload):
-                        if 'body' in payload and 'data' in payload['body']:
-                            return base64.urlsafe_b64decode(payload['body']['data']).decode('utf-8', errors='ignore')
-                        if 'parts' in payload:
-                            for part in payload['parts']:
-                                body = get_body(part)
-                                if body:
-                                    return body
-                        return ''
-
-                    body = get_body(msg['payload'])
-
-                    github_pattern = r'https://github\.com/([a-zA-Z0-9_-]+)/([a-zA-Z0-9_.-]+)(\.git)?'
-                    github_match = re.search(github_pattern, body)
-
-                    email_id = hashlib.sha256(f"{sender_email_extracted}|{subject}|{received_time}".encode()).hexdigest()
-
-                    if github_match:
-                        status = "Ready"
-                        github_url = github_match.group(0)
-                        console.print(f"  [+] Found GitHub URL: {github_url}")
-                    else:
-                        status = "Missing: github_url"
-                        github_url = ""
-                        console.print(f"  [!] No GitHub URL found")
-
-                    submissions.append({
-                        'email_id': email_id,
-                        'received_time': received_time,
-                        'email_subject': subject,
-                        'sender_email': sender_email_extracted,
-                        'github_url': github_url,
-                        'thread_id': thread_id,
-                        'status': status
-                    })
-
-                except Exception as e:
-                    console.print(f"  [-] Error processing email: {e}")
-                    submissions.append({
-                        'email_id': f"error_{i}",
-                        'received_time': '',
-                        'email_subject': '',
-                        'sender_email': '',
-                        'github_url': '',
-                        'thread_id': '',
-                        'status': f"Error: {str(e)}"
-                    })
 
         # Create Excel1.xlsx
         console.print("\n[*] Creating Excel1.xlsx...")
@@ -364,7 +256,7 @@ def _execute_agent1(params: dict) -> bool:
         ws.title = "Email Submissions"
 
         headers = ["email_id", "received_time", "email_subject", "sender_email",
-                   "github_url", "thread_id", "status"]
+                   "github_url", "thread_id", "status", "query"]
         ws.append(headers)
 
         for cell in ws[1]:
@@ -378,7 +270,8 @@ def _execute_agent1(params: dict) -> bool:
                 submission['sender_email'],
                 submission['github_url'],
                 submission['thread_id'],
-                submission['status']
+                submission['status'],
+                submission.get('query', '')
             ])
 
         for column in ws.columns:
@@ -395,11 +288,14 @@ def _execute_agent1(params: dict) -> bool:
 
         output_path = excel_dir / 'Excel1.xlsx'
         wb.save(output_path)
+        label_extracted(service, params, submissions)
+        save_sync_checkpoints(checkpoints)
 
         # Output Summary
         ready_count = sum(1 for s in submissions if s['status'] == "Ready")
         missing_count = sum(1 for s in submissions if "Missing" in s['status'])
         error_count = sum(1 for s in submissions if "Error" in s['status'])
+        superseded_count = sum(1 for s in submissions if s['status'].startswith("Superseded"))
 
         console.print("\n" + "="*70)
         console.print("EXTRACTION SUMMARY")
@@ -409,6 +305,7 @@ def _execute_agent1(params: dict) -> bool:
         console.print(f"\nStatus breakdown:")
         console.print(f"   - Ready (with GitHub URL): {ready_count}")
         console.print(f"   - Missing GitHub URL: {missing_count}")
+        console.print(f"   - Superseded by a newer submission: {superseded_count}")
         console.print(f"   - Errors: {error_count}")
         console.print("="*70 + "\n")
 
@@ -430,11 +327,13 @@ def _execute_agent2() -> bool:
     """
     try:
         import openpyxl
-        import git
-        from concurrent.futures import ThreadPoolExecutor, as_completed
-        import shutil
 
         from ..utils.paths import get_excel_file, get_excel_dir
+        from .agents.agent2_pipeline import run_analysis
+        from .agents.agent2_submissions import cache_summary
+        from .agents.agent2_ignore import ignore_summary
+        from .agents.agent2_similarity import add_similarity_sheet, find_similar, similarity_summary
+        from .agents.agent2_stats import file_cache_summary, stage_summary, transfer_summary
 
         # Check if Excel1.xlsx exists
         excel1_path = get_excel_file('Excel1.xlsx')
@@ -451,7 +350,7 @@ def _execute_agent2() -> bool:
         # Extract rows with status = "Ready"
         ready_rows = []
         for row in ws.iter_rows(min_row=2, values_only=True):
-            email_id, received_time, subject, sender, github_url, thread_id, status = row
+            email_id, received_time, subject, sender, github_url, thread_id, status = row[:7]
             if status == "Ready":
                 ready_rows.append({
                     'email_id': email_id,
@@ -464,95 +363,9 @@ def _execute_agent2() -> bool:
             console.print("[!] No repositories to analyze. Creating empty Excel2.xlsx...\n")
             results = []
         else:
-            # Define analysis function
-            def analyze_repository(email_id, github_url):
-                """Analyze a single repository"""
-                try:
-                    # Create unique directory for this repo
-                    repo_dir = Path(f"temp/repos/{email_id[:8]}")
-
-                    # Remove directory if it exists
-                    if repo_dir.exists():
-                        shutil.rmtree(repo_dir)
-
-                    # Clone repository (depth=1 for speed)
-                    console.print(f"[*] Cloning {github_url[:60]}...")
-                    git.Repo.clone_from(github_url, repo_dir, depth=1)
-
-                    # Find all Python files
-                    python_files = list(repo_dir.rglob("*.py"))
-
-                    # Count lines
-                    total_lines = 0
-                    compliant_lines = 0
-                    file_count = 0
-
-                    for py_file in python_files:
-                        try:
-                            with open(py_file, 'r', encoding='utf-8') as f:
-                                lines = len(f.readlines())
-                                total_lines += lines
-
-                                # Compliant if <= 150 lines
-                                if lines <= 150:
-                                    compliant_lines += lines
-
-                                file_count += 1
-                        except Exception:
-                            continue
-
-                    # Calculate grade
-                    if total_lines > 0:
-                        grade = round(100 * (compliant_lines / total_lines), 2)
-                    else:
-                        grade = 0
-
-                    console.print(f"  [+] {email_id[:8]} - Files: {file_count}, Grade: {grade}%")
-
-                    return {
-                        'email_id': email_id,
-                        'github_url': github_url,
-                        'total_files': file_count,
-                        'total_lines': total_lines,
-                        'compliant_lines': compliant_lines,
-                        'grade': grade,
-                        'status': 'Ready'
-                    }
-
-                except git.GitCommandError as e:
-                    console.print(f"  [!] {email_id[:8]} - Clone failed")
-                    return {
-                        'email_id': email_id,
-                        'github_url': github_url,
-                        'total_files': 0,
-                        'total_lines': 0,
-                        'compliant_lines': 0,
-                        'grade': 0,
-                        'status': 'Failed: clone'
-                    }
-                except Exception as e:
-                    console.print(f"  [!] {email_id[:8]} - Error: {str(e)[:50]}")
-                    return {
-                        'email_id': email_id,
-                        'github_url': github_url,
-                        'total_files': 0,
-                        'total_lines': 0,
-                        'compliant_lines': 0,
-                        'grade': 0,
-                        'status': f'Failed: {str(e)[:50]}'
-                    }
-
-            # Process repositories in parallel (5 workers)
-            results = []
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                futures = {
-                    executor.submit(analyze_repository, row['email_id'], row['github_url']): row
-                    for row in ready_rows
-                }
-
-                for future in as_completed(futures):
-                    result = future.result()
-                    results.append(result)
+            # Process repositories in parallel (result and mirror caches)
+            results = run_analysis(ready_rows)
+        pairs = find_similar(results)
 
         # Create Excel2.xlsx
         console.print("\n[*] Creating Excel2.xlsx...")
@@ -604,6 +417,7 @@ def _execute_agent2() -> bool:
                     pass
             adjusted_width = min(max_length + 2, 50)
             ws2.column_dimensions[column_letter].width = adjusted_width
+        add_similarity_sheet(wb2, pairs)
 
         # Save
         output_path = excel_dir / 'Excel2.xlsx'
@@ -621,6 +435,12 @@ def _execute_agent2() -> bool:
         console.print(f"[+] Successful: {successful_count}")
         console.print(f"[+] Failed: {failed_count}")
         console.print(f"[+] Average grade: {avg_grade:.2f}%")
+        console.print(f"[+] {cache_summary(results)}")
+        console.print(f"[+] {ignore_summary(results)}")
+        console.print(f"[+] {transfer_summary(reset=True)}")
+        console.print(f"[+] {stage_summary(reset=True)}")
+        console.print(f"[+] {file_cache_summary(reset=True)}")
+        console.print(f"[+] {similarity_summary(results, pairs)}")
         console.print(f"[+] Excel2.xlsx created: {output_path}")
         console.print("="*70 + "\n")
 
@@ -886,10 +706,6 @@ def _execute_agent4() -> bool:
     """
     try:
         import openpyxl
-        from google.oauth2.credentials import Credentials
-        from googleapiclient.discovery import build
-        from google.auth.transport.requests import Request
-        from google_auth_oauthlib.flow import InstalledAppFlow
         from email.mime.text import MIMEText
         import base64
 
@@ -935,7 +751,7 @@ def _execute_agent4() -> bool:
 
         email_metadata = {}
         for row in ws1.iter_rows(min_row=2, values_only=True):
-            email_id, received_time, subject, sender, github_url, thread_id, status = row
+            email_id, received_time, subject, sender, github_url, thread_id, status = row[:7]
             email_metadata[email_id] = {
                 'sender': sender,
                 'subject': subject,
@@ -960,39 +776,15 @@ def _execute_agent4() -> bool:
             except Exception as e:
                 console.print(f"[!] Could not load student mappings: {e}\n")
 
-        # Gmail Authentication
-        console.print("[*] Authenticating with Gmail API...")
-        SCOPES = [
-            'https://www.googleapis.com/auth/gmail.readonly',
-            'https://www.googleapis.com/auth/gmail.compose'
-        ]
-
-        creds = None
-        token_path = Path('Secrets/token.json')
-        credentials_path = Path('Secrets/credentials.json')
-
-        if token_path.exists():
-            creds = Credentials.from_authorized_user_file(str(token_path), SCOPES)
-
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                flow = InstalledAppFlow.from_client_secrets_file(str(credentials_path), SCOPES)
-                creds = flow.run_local_server(port=0)
-
-            with open(token_path, 'w') as token:
-                token.write(creds.to_json())
-
-        console.print("[+] Authentication successful\n")
-
-        # Create Gmail service
-        service = build('gmail', 'v1', credentials=creds)
+        # Gmail Authentication (credentials and service are reused within the process)
+        from .agents.gmail_auth import get_gmail_service
+        service = get_gmail_service(console)
 
         # Create drafts
         console.print("[*] Creating Gmail drafts...\n")
         drafts_created = 0
         drafts_failed = 0
+        drafted_ids = []
 
         for email_id, feedback in feedback_data.items():
             # Get email metadata
@@ -1048,11 +840,16 @@ Instructor
 
                 console.print(f"  [+] Draft created for {student_name} ({sender_email})")
                 drafts_created += 1
+                drafted_ids.append(email_id)
 
             except Exception as e:
                 console.print(f"  [!] Failed to create draft for {sender_email}: {str(e)[:50]}")
                 drafts_failed += 1
 
+        # Label work queue: drafted emails drop out of later Agent 1 searches
+        from .agents.gmail_labels import label_drafted
+        label_drafted(service, drafted_ids)
+
         # Output Summary
         console.print("\n" + "="*70)
         console.print("DRAFT CREATION SUMMARY")
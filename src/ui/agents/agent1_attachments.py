@@ -0,0 +1,96 @@
+"""
+Agent 1 Zip Attachments
+
+Downloads the zip attachment of a submission that has no GitHub URL
+(users.messages.attachments.get) to temp/attachments/<email_id>.zip and
+marks the row Ready with an "attachment:<filename>" reference, which
+Agent 2 analyzes in memory (see agent2_zip_analyzer).
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import base64
+import io
+import os
+import zipfile
+from pathlib import Path
+
+from rich.console import Console
+
+from .gmail_rate_limiter import QUOTA_UNITS, execute_with_backoff
+from .agent1_message_parser import ZIP_ATTACHMENT_KEY
+from ...utils.paths import get_attachments_dir
+
+console = Console()
+
+# github_url prefix of zipped submissions
+ATTACHMENT_PREFIX = "attachment:"
+TOO_LARGE_STATUS = "Missing: zip too large"
+
+
+def attachment_path(email_id: str) -> Path:
+    """Where the zip of a submission is stored"""
+    return get_attachments_dir() / f"{email_id}.zip"
+
+
+def is_attachment_url(github_url: str) -> bool:
+    """True for the github_url of a zipped submission"""
+    return bool(github_url) and github_url.startswith(ATTACHMENT_PREFIX)
+
+
+def fetch_zip_attachment(service, submission: dict, max_bytes: int, limiter=None) -> bool:
+    """
+    Download a submission's zip attachment and mark the row Ready
+
+    The zip_attachment entry left by parse_message is always removed, so
+    it never reaches the message cache or Excel1. An already downloaded
+    zip is not fetched again.
+
+    Args:
+        service: Gmail API service
+        submission: Submission from parse_message (updated in place)
+        max_bytes: Largest zip downloaded in bytes (0 = zip attachments ignored)
+        limiter: Optional quota TokenBucket
+
+    Returns:
+        bool: True if the submission is now backed by a zip
+    """
+    info = submission.pop(ZIP_ATTACHMENT_KEY, None)
+    if not info or not max_bytes or max_bytes <= 0:
+        return False
+    if info['size'] > max_bytes:
+        console.print(f"  [!] Zip attachment too large ({info['size']} bytes), skipping")
+        submission['status'] = TOO_LARGE_STATUS
+        return False
+
+    path = attachment_path(submission['email_id'])
+    if not path.exists():
+        content = _download(service, submission['message_id'], info, limiter)
+        if len(content) > max_bytes:
+            submission['status'] = TOO_LARGE_STATUS
+            return False
+        if not zipfile.is_zipfile(io.BytesIO(content)):
+            console.print(f"  [!] {info['filename']} is not a valid zip file")
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so an interrupted run never leaves a partial zip behind
+        partial = path.with_suffix('.part')
+        partial.write_bytes(content)
+        os.replace(partial, path)
+
+    submission['github_url'] = f"{ATTACHMENT_PREFIX}{info['filename']}"
+    submission['status'] = "Ready"
+    console.print(f"  [+] Zip attachment saved: {info['filename']}")
+    return True
+
+
+def _download(service, message_id: str, info: dict, limiter) -> bytes:
+    """Attachment bytes (small attachments may come inline with the message)"""
+    data = info.get('data')
+    if not data:
+        request = service.users().messages().attachments().get(
+            userId='me', messageId=message_id, id=info['attachment_id']
+        )
+        data = execute_with_backoff(request, limiter, QUOTA_UNITS['messages.attachments.get'])['data']
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
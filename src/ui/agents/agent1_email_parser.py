@@ -1,128 +1,106 @@
 """
 Agent 1 Email Parser
 
-Extracts and parses email data from Gmail messages.
+Extracts and parses email data from Gmail messages using a two-phase
+fetch: metadata first, full message bodies only for matching subjects.
 
 Author: Hadar Wayn
 Date: December 2025
 """
 
-import re
-import hashlib
-import base64
-from email.utils import parsedate_to_datetime
 from rich.console import Console
 
+from .gmail_batch import fetch_messages
+from .gmail_mime import MAX_BODY_BYTES
+from .agent1_metadata_filter import filter_by_headers
+from .agent1_message_parser import parse_message
+from .agent1_message_cache import split_cached, cache_submission
+from .agent1_attachments import fetch_zip_attachment
+
 console = Console()
 
 
-def extract_email_data(service, messages: list, email_subject: str = None) -> list:
+def extract_email_data(service, messages: list, email_subject: str = None, batch_size: int = 1,
+                       sender_email: str = None, cache=None, fetch_options: dict = None,
+                       max_body_bytes: int = MAX_BODY_BYTES, max_attachment_bytes: int = 0) -> list:
     """
     Extract data from Gmail messages
 
     Args:
         service: Gmail API service
-        messages: List of message objects
-        email_subject: Optional subject filter for post-filtering
+        messages: List or iterator of message objects (e.g. from iter_messages)
+        email_subject: Optional subject filter, applied to metadata before bodies are fetched
+        batch_size: messages.get calls per batch HTTP request (1 = one request per email)
+        sender_email: Optional sender filter applied to metadata (for sources that
+            were not already filtered by a from: query, e.g. history sync)
+        cache: Optional open message cache; cached emails skip the Gmail API
+        fetch_options: Extra fetch_messages options for concurrent, quota-limited
+            fetching (workers, service_factory, limiter, max_retries)
+        max_body_bytes: Body decode budget per email in bytes (0 = no limit)
+        max_attachment_bytes: Largest zip attachment downloaded for emails
+            without a GitHub URL (0 = zip attachments ignored)
 
     Returns:
-        list: List of submission dictionaries
+        list: List of submission dictionaries (failed emails become error rows)
     """
     submissions = []
-
-    for i, message in enumerate(messages, 1):
+    metadata_errors = []
+    cached_hits = []
+    prefilter = bool(email_subject or sender_email)
+    total = f"/{len(messages)}" if hasattr(messages, '__len__') and not (prefilter or cache) else ''
+    listing = {}
+    if cache is not None:
+        messages = split_cached(_numbered(messages, listing), cache, email_subject, sender_email, cached_hits)
+    message_ids = (m['id'] for m in messages)
+    if prefilter:
+        # Phase 1: headers only; bodies are downloaded just for matching emails
+        message_ids = filter_by_headers(
+            service, message_ids, email_subject, sender_email, batch_size, metadata_errors, fetch_options
+        )
+
+    fetched = fetch_messages(service, message_ids, batch_size=batch_size, **(fetch_options or {}))
+    for i, (message_id, msg, error) in enumerate(fetched, 1):
+        console.print(f"Processing email {i}{total}...")
         try:
-            console.print(f"Processing email {i}/{len(messages)}...")
-
-            # Get full message
-            msg = service.users().messages().get(
-                userId='me',
-                id=message['id'],
-                format='full'
-            ).execute()
-
-            # Extract headers
-            headers = msg['payload']['headers']
-            sender = next((h['value'] for h in headers if h['name'] == 'From'), '')
-            subject = next((h['value'] for h in headers if h['name'] == 'Subject'), '')
-            date_str = next((h['value'] for h in headers if h['name'] == 'Date'), '')
-
-            # Post-filter: verify substring match (case-insensitive)
-            if email_subject and email_subject.lower() not in subject.lower():
-                console.print(f"  [-] Subject doesn't contain '{email_subject}', skipping")
-                continue
-
-            # Extract sender email address
-            email_match = re.search(r'<(.+?)>', sender)
-            sender_email_extracted = email_match.group(1) if email_match else sender
-
-            # Parse timestamp and thread ID
-            received_time = parsedate_to_datetime(date_str).isoformat()
-            thread_id = msg['threadId']
-
-            # Extract email body
-            body = get_email_body(msg['payload'])
-
-            # Find GitHub URL in body
-            github_pattern = r'https://github\.com/([a-zA-Z0-9_-]+)/([a-zA-Z0-9_.-]+)(\.git)?'
-            github_match = re.search(github_pattern, body)
-
-            # Generate unique email ID
-            email_id = hashlib.sha256(
-                f"{sender_email_extracted}|{subject}|{received_time}".encode()
-            ).hexdigest()
-
-            # Determine status based on GitHub URL presence
-            if github_match:
-                status = "Ready"
-                github_url = github_match.group(0)
-                console.print(f"  [+] Found GitHub URL: {github_url}")
-            else:
-                status = "Missing: github_url"
-                github_url = ""
-                console.print(f"  [!] No GitHub URL found")
-
-            # Create submission record
-            submissions.append({
-                'email_id': email_id,
-                'received_time': received_time,
-                'email_subject': subject,
-                'sender_email': sender_email_extracted,
-                'github_url': github_url,
-                'thread_id': thread_id,
-                'status': status
-            })
+            if error is not None:
+                raise error
+
+            submission = parse_message(msg, email_subject, max_body_bytes)
+            if submission is not None:
+                fetch_zip_attachment(service, submission, max_attachment_bytes,
+                                     (fetch_options or {}).get('limiter'))
+                submissions.append(submission)
+                if cache is not None:
+                    cache_submission(cache, submission)
 
         except Exception as e:
             console.print(f"  [-] Error processing email: {e}")
+            submissions.append(_create_error_submission(i, message_id, e))
 
+    if cached_hits:
+        # Cached rows take their listing position, so Excel1 stays newest first
+        submissions = sorted(submissions + cached_hits, key=lambda s: listing.get(s['message_id'], len(listing)))
+    for i, (message_id, error) in enumerate(metadata_errors, 1):
+        submissions.append(_create_error_submission(f"metadata_{i}", message_id, error))
     return submissions
 
 
-def get_email_body(payload: dict) -> str:
-    """
-    Recursively extract email body from payload
-
-    Args:
-        payload: Gmail message payload
-
-    Returns:
-        str: Decoded email body text
-    """
-    # Check if body data is directly in payload
-    if 'body' in payload and 'data' in payload['body']:
-        try:
-            return base64.urlsafe_b64decode(
-                payload['body']['data']
-            ).decode('utf-8', errors='ignore')
-        except Exception:
-            return ''
-
-    # Recursively check parts
-    if 'parts' in payload:
-        for part in payload['parts']:
-            body = get_email_body(part)
-            if body:
-                return body
-
-    return ''
+def _numbered(messages, listing: dict):
+    """Pass message stubs through, recording each id's listing position"""
+    for message in messages:
+        listing.setdefault(message['id'], len(listing))
+        yield message
+
+
+def _create_error_submission(index, message_id: str, error: Exception) -> dict:
+    """Create error row for an email that could not be fetched or parsed"""
+    return {
+        'message_id': message_id,
+        'email_id': f"error_{index}",
+        'received_time': '',
+        'email_subject': '',
+        'sender_email': '',
+        'github_url': '',
+        'thread_id': '',
+        'status': f"Error: {str(error)}"
+    }
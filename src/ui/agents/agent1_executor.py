@@ -10,10 +10,12 @@ Date: December 2025
 import openpyxl
 from rich.console import Console
 
-from .gmail_auth import get_gmail_service
-from .agent1_email_parser import extract_email_data
+from .mail_source import open_mail_source
+from .agent1_sync import save_sync_checkpoints
+from .agent1_pipeline import run_extraction, label_extracted
 from .excel_utils import create_excel_workbook, auto_adjust_columns
 from ...utils.paths import get_excel_dir
+from ...utils.config import get_settings
 
 console = Console()
 
@@ -23,7 +25,9 @@ def execute_agent1(params: dict) -> bool:
     Execute Agent 1 email extraction logic
 
     Args:
-        params: Dictionary with email_subject, sender_email, max_emails, query
+        params: Dictionary with email_subject, sender_email, max_emails
+            (0 or None = no limit), query and optional batch_size / incremental /
+            fetch_workers / mail_source / mail_path (default to email_extraction settings)
 
     Returns:
         bool: True if successful, False otherwise
@@ -34,36 +38,29 @@ def execute_agent1(params: dict) -> bool:
         sender_email = params.get('sender_email')
         max_emails = params.get('max_emails', 10)
         query = params.get('query', '')
+        settings = get_settings().email_extraction
+        batch_size = params.get('batch_size') or settings.batch_size
 
         # Log parameters
         console.print(f"[*] Email Subject: {email_subject or '(all subjects)'}")
         console.print(f"[*] Sender Email: {sender_email or '(all senders)'}")
-        console.print(f"[*] Max Emails: {max_emails}")
+        console.print(f"[*] Max Emails: {max_emails or 'no limit'}")
+        console.print(f"[*] Batch Size: {batch_size}")
         console.print(f"[*] Gmail Query: {query}\n")
 
-        # Authenticate with Gmail
-        service = get_gmail_service(console)
+        # Authenticate with Gmail (or open the offline mailbox); worker threads
+        # each build their own service (httplib2 is not thread-safe)
+        service, service_factory = open_mail_source(params, console)
 
-        # Search emails
-        console.print("[*] Searching emails...")
-        results = service.users().messages().list(
-            userId='me',
-            q=query,
-            maxResults=max_emails
-        ).execute()
-
-        messages = results.get('messages', [])
-
-        # Extract email data
-        if not messages:
+        # Incremental historyId sync or paginated full scan; cached emails skip the API
+        submissions, checkpoints = run_extraction(service, params, service_factory)
+        if not submissions:
             console.print("[!] No emails found matching the criteria\n")
-            submissions = []
-        else:
-            console.print(f"[+] Found {len(messages)} emails\n")
-            submissions = extract_email_data(service, messages, email_subject)
 
-        # Create Excel file
+        # Create Excel file, then checkpoint (or label) the mailbox for the next run
         _create_excel1(submissions)
+        label_extracted(service, params, submissions)
+        save_sync_checkpoints(checkpoints)
 
         # Print summary
         _print_summary(submissions)
@@ -98,7 +95,8 @@ def _create_excel1(submissions: list):
         "sender_email",
         "github_url",
         "thread_id",
-        "status"
+        "status",
+        "query"
     ]
     wb = create_excel_workbook("Email Submissions", headers)
     ws = wb.active
@@ -112,7 +110,8 @@ def _create_excel1(submissions: list):
             submission['sender_email'],
             submission['github_url'],
             submission['thread_id'],
-            submission['status']
+            submission['status'],
+            submission.get('query', '')
         ])
 
     # Auto-adjust column widths
@@ -135,6 +134,7 @@ def _print_summary(submissions: list):
     ready_count = sum(1 for s in submissions if s['status'] == "Ready")
     missing_count = sum(1 for s in submissions if "Missing" in s['status'])
     error_count = sum(1 for s in submissions if "Error" in s['status'])
+    superseded_count = sum(1 for s in submissions if s['status'].startswith("Superseded"))
 
     # Print summary
     console.print("\n" + "="*70)
@@ -144,5 +144,6 @@ def _print_summary(submissions: list):
     console.print(f"\nStatus breakdown:")
     console.print(f"   - Ready (with GitHub URL): {ready_count}")
     console.print(f"   - Missing GitHub URL: {missing_count}")
+    console.print(f"   - Superseded by a newer submission: {superseded_count}")
     console.print(f"   - Errors: {error_count}")
     console.print("="*70 + "\n")
@@ -0,0 +1,139 @@
+"""
+Agent 1 History Sync
+
+Persists a Gmail historyId checkpoint per search so later Agent 1 runs
+can ask users.history.list for messages added since the last run
+instead of re-listing the whole mailbox.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import json
+
+from googleapiclient.errors import HttpError
+
+from .gmail_rate_limiter import QUOTA_UNITS, execute_with_backoff
+from ...utils.hash_utils import hash_string
+from ...utils.paths import get_cache_dir
+
+CHECKPOINT_FILE = "agent1_sync_checkpoints.json"
+
+# Messages with these labels never show up in a normal messages.list search
+SKIPPED_LABELS = {'DRAFT', 'SPAM', 'TRASH'}
+
+
+class CheckpointExpiredError(Exception):
+    """Raised when Gmail no longer keeps history for a stored historyId"""
+
+
+def make_sync_key(query: str, email_subject: str = None, sender_email: str = None) -> str:
+    """Build the checkpoint key for one Agent 1 search"""
+    return hash_string(f"{query or ''}|{email_subject or ''}|{sender_email or ''}")
+
+
+def load_checkpoint(sync_key: str) -> dict:
+    """
+    Load the checkpoint for a search
+
+    Returns:
+        dict: {'history_id', 'submissions', 'retry_ids', 'max_emails'} or None if missing
+    """
+    return _read_checkpoints().get(sync_key)
+
+
+def save_checkpoint(sync_key: str, history_id: str, submissions: list, max_emails: int = 0):
+    """
+    Save the checkpoint for a search after a successful run
+
+    Successful rows are kept so the next run can carry them forward;
+    emails that failed are remembered so they are retried. max_emails is
+    the cap the rows were listed under (0 = no limit): older emails are
+    not in the checkpoint, so a run with a higher cap needs a full scan.
+    """
+    checkpoints = _read_checkpoints()
+    checkpoints[sync_key] = {
+        'history_id': str(history_id),
+        'max_emails': max_emails,
+        'submissions': [s for s in submissions if not s['status'].startswith("Error")],
+        'retry_ids': [
+            s['message_id'] for s in submissions
+            if s['status'].startswith("Error") and s.get('message_id')
+        ]
+    }
+
+    path = get_cache_dir() / CHECKPOINT_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoints, f, indent=2)
+
+
+def get_current_history_id(service, limiter=None) -> str:
+    """Return the mailbox's current historyId"""
+    request = service.users().getProfile(userId='me')
+    return str(execute_with_backoff(request, limiter, QUOTA_UNITS['getProfile'])['historyId'])
+
+
+def list_history_changes(service, start_history_id: str, limiter=None) -> tuple:
+    """
+    List messages added and deleted since start_history_id
+
+    Args:
+        service: Gmail API service
+        start_history_id: historyId saved by a previous run
+        limiter: Optional quota TokenBucket charged for every page request
+
+    Returns:
+        tuple: (added_ids, deleted_ids) - added ids newest first
+
+    Raises:
+        CheckpointExpiredError: If the historyId is too old or invalid (HTTP 404)
+    """
+    added = []
+    deleted = set()
+    page_token = None
+
+    while True:
+        list_kwargs = {
+            'userId': 'me',
+            'startHistoryId': start_history_id,
+            'historyTypes': ['messageAdded', 'messageDeleted'],
+        }
+        if page_token:
+            list_kwargs['pageToken'] = page_token
+
+        try:
+            request = service.users().history().list(**list_kwargs)
+            response = execute_with_backoff(request, limiter, QUOTA_UNITS['history.list'])
+        except HttpError as e:
+            if e.resp.status == 404:
+                raise CheckpointExpiredError(f"historyId {start_history_id} has expired") from e
+            raise
+
+        for record in response.get('history', []):
+            for item in record.get('messagesAdded', []):
+                message = item['message']
+                if not SKIPPED_LABELS.intersection(message.get('labelIds', [])):
+                    added.append(message['id'])
+            for item in record.get('messagesDeleted', []):
+                deleted.add(item['message']['id'])
+
+        page_token = response.get('nextPageToken')
+        if not page_token:
+            break
+
+    # History is returned oldest first; Agent 1 lists newest first
+    added_ids = list(dict.fromkeys(reversed(added)))
+    return [mid for mid in added_ids if mid not in deleted], deleted
+
+
+def _read_checkpoints() -> dict:
+    """Read all checkpoints (empty dict if the file is missing or corrupt)"""
+    path = get_cache_dir() / CHECKPOINT_FILE
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
@@ -0,0 +1,74 @@
+"""
+Agent 1 Message Cache
+
+Gmail messages are immutable, so a parsed submission record can be
+reused forever. This module keeps them in a SQLite cache keyed by Gmail
+message id and lets Agent 1 skip the API entirely for cached emails.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+from itertools import islice
+
+from ...utils.paths import get_cache_dir
+from ...utils.sqlite_cache import SQLiteCache
+
+CACHE_FILE = "agent1_messages.sqlite"
+
+# Bump when parse_message changes what it extracts so stale records are re-parsed
+PARSER_VERSION = 5
+
+# Message stubs looked up per cache query
+LOOKUP_CHUNK = 100
+
+
+def open_message_cache(max_entries: int = 20000) -> SQLiteCache:
+    """Open the parsed-message cache (caller should close() it)"""
+    return SQLiteCache(get_cache_dir() / CACHE_FILE, max_entries=max_entries, table="messages")
+
+
+def split_cached(messages, cache: SQLiteCache, email_subject: str, sender_email: str, hits: list):
+    """
+    Yield message stubs that are not cached; collect cached submissions
+
+    Cached records are checked against the same subject/sender filters the
+    metadata phase would apply, so a cache hit never bypasses filtering.
+
+    Args:
+        messages: Iterable of message stubs ({'id': ...})
+        cache: Open message cache
+        email_subject: Optional subject substring filter
+        sender_email: Optional sender substring filter
+        hits: List that receives matching cached submission records
+
+    Yields:
+        dict: Message stubs that must be fetched from Gmail
+    """
+    stream = iter(messages)
+    while True:
+        chunk = list(islice(stream, LOOKUP_CHUNK))
+        if not chunk:
+            break
+
+        found = cache.get_many(m['id'] for m in chunk)
+        for message in chunk:
+            entry = found.get(message['id'])
+            if not entry or entry.get('version') != PARSER_VERSION:
+                yield message
+            elif _matches(entry['submission'], email_subject, sender_email):
+                hits.append(entry['submission'])
+
+
+def cache_submission(cache: SQLiteCache, submission: dict):
+    """Store a freshly parsed submission record"""
+    cache.set(submission['message_id'], {'version': PARSER_VERSION, 'submission': submission})
+
+
+def _matches(submission: dict, email_subject: str, sender_email: str) -> bool:
+    """Apply the case-insensitive subject/sender substring filters to a record"""
+    if email_subject and email_subject.lower() not in submission['email_subject'].lower():
+        return False
+    if sender_email and sender_email.lower() not in submission['sender_email'].lower():
+        return False
+    return True
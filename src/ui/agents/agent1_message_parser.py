@@ -0,0 +1,97 @@
+"""
+Agent 1 Message Parser
+
+Turns a full-format Gmail message into an Excel1 submission record.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import re
+from email.utils import parsedate_to_datetime
+from rich.console import Console
+
+from .agent1_metadata_filter import get_header
+from .gmail_mime import MAX_BODY_BYTES, extract_body_text, find_zip_attachments
+from .agent1_rules import ExtractionRules, get_extraction_rules
+from ...utils.hash_utils import generate_email_id
+
+console = Console()
+
+# Address inside "Name <address>" From headers
+SENDER_ADDRESS_PATTERN = re.compile(r'<(.+?)>')
+# Zip attachment found in an email without a GitHub URL (removed once downloaded)
+ZIP_ATTACHMENT_KEY = 'zip_attachment'
+
+
+def parse_message(msg: dict, email_subject: str = None, max_body_bytes: int = MAX_BODY_BYTES,
+                  rules: ExtractionRules = None) -> dict:
+    """
+    Parse a full-format Gmail message into a submission record
+
+    Args:
+        msg: Gmail message resource (format='full')
+        email_subject: Optional subject filter for post-filtering
+        max_body_bytes: Body decode budget in bytes (0 = no limit)
+        rules: Compiled extraction rules (defaults to the settings.yaml rules)
+
+    Returns:
+        dict: Submission dictionary, or None if the subject doesn't match
+    """
+    # Extract headers
+    headers = msg['payload']['headers']
+    sender = get_header(headers, 'From')
+    subject = get_header(headers, 'Subject')
+    date_str = get_header(headers, 'Date')
+
+    # Post-filter: verify substring match (case-insensitive)
+    if email_subject and email_subject.lower() not in subject.lower():
+        console.print(f"  [-] Subject doesn't contain '{email_subject}', skipping")
+        return None
+
+    # Extract sender email address
+    email_match = SENDER_ADDRESS_PATTERN.search(sender)
+    sender_email_extracted = email_match.group(1) if email_match else sender
+
+    # Parse timestamp and thread ID
+    received_time = parsedate_to_datetime(date_str).isoformat()
+    thread_id = msg['threadId']
+
+    # Extract email body (text/plain preferred, attachments skipped) and apply
+    # the configured rules (GitHub URL, homework number, extra fields) in one pass
+    body = extract_body_text(msg['payload'], max_body_bytes)
+    fields = (rules or get_extraction_rules()).evaluate(subject, sender, body)
+    github_url = fields.pop('github_url')
+
+    # Generate unique email ID
+    email_id = generate_email_id(sender_email_extracted, subject, received_time)
+
+    # Determine status based on GitHub URL presence; without one, a zipped
+    # submission is downloaded by agent1_attachments
+    zips = [] if github_url else find_zip_attachments(msg['payload'])
+    if github_url:
+        status = "Ready"
+        console.print(f"  [+] Found GitHub URL: {github_url}")
+    elif zips:
+        status = "Missing: github_url"
+        console.print(f"  [*] No GitHub URL, found zip attachment: {zips[0]['filename']}")
+    else:
+        status = "Missing: github_url"
+        console.print(f"  [!] No GitHub URL found")
+
+    submission = {
+        'message_id': msg['id'],
+        'email_id': email_id,
+        'received_time': received_time,
+        'email_subject': subject,
+        'sender_email': sender_email_extracted,
+        'github_url': github_url,
+        'thread_id': thread_id,
+        'status': status,
+        'homework_number': fields.pop('homework_number'),
+        'matched_rules': fields.pop('matched_rules'),
+        'extra_fields': fields
+    }
+    if zips:
+        submission[ZIP_ATTACHMENT_KEY] = zips[0]
+    return submission
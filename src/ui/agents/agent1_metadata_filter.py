@@ -0,0 +1,72 @@
+"""
+Agent 1 Metadata Pre-Filter
+
+Phase 1 of the two-phase fetch: downloads only the From/Subject/Date
+headers of each listed email and drops non-matching subjects (and, when
+requested, senders) before any message body is downloaded.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+from rich.console import Console
+
+from .gmail_batch import fetch_messages
+
+console = Console()
+
+# Headers requested in the metadata-only phase
+METADATA_HEADERS = ['From', 'Subject', 'Date']
+
+
+def get_header(headers: list, name: str) -> str:
+    """Return the value of the first header called name ('' if missing)"""
+    return next((h['value'] for h in headers if h['name'] == name), '')
+
+
+def filter_by_headers(service, message_ids, email_subject: str, sender_email: str,
+                      batch_size: int, errors: list, fetch_options: dict = None):
+    """
+    Yield ids of emails whose headers match the subject/sender filters
+
+    Uses format='metadata' so only headers are transferred. The subject match
+    is the same case-insensitive substring check as the full-message
+    post-filter; the sender match is a case-insensitive substring of From.
+
+    Args:
+        service: Gmail API service
+        message_ids: Iterable of Gmail message IDs
+        email_subject: Subject substring to match (None = any subject)
+        sender_email: Sender substring to match (None = any sender)
+        batch_size: messages.get calls per batch HTTP request
+        errors: List that receives (message_id, exception) for emails whose metadata failed
+        fetch_options: Extra fetch_messages options (workers, service_factory, limiter, ...)
+
+    Yields:
+        str: Message IDs that passed the filters
+    """
+    subject_needle = (email_subject or '').lower()
+    sender_needle = (sender_email or '').lower()
+    checked = 0
+    skipped = 0
+
+    fetched = fetch_messages(
+        service, message_ids, batch_size=batch_size,
+        msg_format='metadata', metadata_headers=METADATA_HEADERS, **(fetch_options or {})
+    )
+    for message_id, msg, error in fetched:
+        checked += 1
+        if error is not None:
+            console.print(f"  [-] Error fetching email metadata: {error}")
+            errors.append((message_id, error))
+            continue
+
+        headers = msg.get('payload', {}).get('headers', [])
+        if (subject_needle not in get_header(headers, 'Subject').lower()
+                or sender_needle not in get_header(headers, 'From').lower()):
+            skipped += 1
+            continue
+
+        yield message_id
+
+    console.print(f"[*] Header pre-filter: skipped {skipped}/{checked} emails before body download")
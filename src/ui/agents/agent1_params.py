@@ -7,10 +7,14 @@ Author: Hadar Wayn
 Date: December 2025
 """
 
+import re
+
 from rich.console import Console
 
 console = Console()
 
+NUMBER_RANGES_PATTERN = re.compile(r'\d+(\s*-\s*\d+)?(\s*,\s*\d+(\s*-\s*\d+)?)*')
+
 
 def prompt_agent1_parameters() -> dict:
     """
@@ -18,6 +22,7 @@ def prompt_agent1_parameters() -> dict:
 
     Returns:
         dict: Dictionary containing email_subject, sender_email, max_emails, query
+        (and queries when homework numbers were given)
 
     Example:
         >>> params = prompt_agent1_parameters()
@@ -38,6 +43,19 @@ def prompt_agent1_parameters() -> dict:
     else:
         console.print(f"   -> Will search for: [green]\"{email_subject}\"[/green]\n")
 
+    # Homework numbers (optional): one search per number, merged into one Excel1
+    homework_numbers = ""
+    if email_subject:
+        homework_numbers = console.input(
+            "[bold]Homework Numbers[/bold] (optional, e.g. 1-5,8 - one search each): "
+        ).strip()
+        if homework_numbers and not NUMBER_RANGES_PATTERN.fullmatch(homework_numbers):
+            console.print("   [yellow][!] Invalid number list, will run a single search[/yellow]\n")
+            homework_numbers = ""
+        elif homework_numbers:
+            console.print(f"   -> Will search for: [green]\"{email_subject}\"[/green] for n in {homework_numbers} "
+                          f"(n replaces {{n}}, else follows a space)\n")
+
     # Sender email (optional)
     sender_email = console.input("[bold]Sender Email[/bold] (optional, press Enter to skip): ").strip()
     if not sender_email:
@@ -51,9 +69,9 @@ def prompt_agent1_parameters() -> dict:
         else:
             console.print(f"   -> Will filter by sender: [green]{sender_email}[/green]\n")
 
-    # Max emails (required, default 10)
+    # Max emails (required, default 10, 0 = no limit)
     while True:
-        max_emails_input = console.input("[bold]Max Emails (1-100)[/bold] [dim][Default: 10][/dim]: ").strip()
+        max_emails_input = console.input("[bold]Max Emails (0 = no limit)[/bold] [dim][Default: 10][/dim]: ").strip()
         if not max_emails_input:
             max_emails = 10
             console.print("   -> Using default: [green]10 emails[/green]\n")
@@ -61,31 +79,38 @@ def prompt_agent1_parameters() -> dict:
         else:
             try:
                 max_emails = int(max_emails_input)
-                if 1 <= max_emails <= 100:
+                if max_emails == 0:
+                    console.print("   -> Will process [green]all matching emails[/green]\n")
+                    break
+                elif max_emails > 0:
                     console.print(f"   -> Will process up to [green]{max_emails} emails[/green]\n")
                     break
                 else:
-                    console.print("   [red][!] Please enter a number between 1 and 100[/red]")
+                    console.print("   [red][!] Please enter 0 or a positive number[/red]")
             except ValueError:
                 console.print("   [red][!] Please enter a valid number[/red]")
 
     # Build Gmail search query
-    query = _build_gmail_query(email_subject, sender_email)
+    query = build_gmail_query(email_subject, sender_email)
 
     console.print("[bold cyan]=====================================================================[/bold cyan]")
     console.print(f"[bold]Gmail Search Query:[/bold] [cyan]{query or '(all emails)'}[/cyan]")
-    console.print(f"[bold]Max Results:[/bold] [cyan]{max_emails}[/cyan]")
+    console.print(f"[bold]Max Results:[/bold] [cyan]{max_emails or 'no limit'}[/cyan]")
     console.print("[bold cyan]=====================================================================[/bold cyan]\n")
 
-    return {
+    params = {
         'email_subject': email_subject,
         'sender_email': sender_email,
         'max_emails': max_emails,
         'query': query
     }
+    if homework_numbers:
+        params['queries'] = [{'email_subject': email_subject, 'sender_email': sender_email,
+                              'homework_numbers': homework_numbers}]
+    return params
 
 
-def _build_gmail_query(email_subject: str = None, sender_email: str = None) -> str:
+def build_gmail_query(email_subject: str = None, sender_email: str = None) -> str:
     """
     Build Gmail API search query from parameters
 
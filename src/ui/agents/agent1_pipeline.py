@@ -0,0 +1,150 @@
+"""
+Agent 1 Extraction Pipeline
+
+Resolves Agent 1 run options from params and settings.yaml (batching,
+incremental sync, message cache, concurrency, quota and body size limits),
+runs the extraction and resolves resubmissions through the submission
+index, and labels processed emails when the label work queue is on.
+Several searches (see agent1_queries) run concurrently and are merged.
+Shared by the modular executor and the legacy runner.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+from rich.console import Console
+
+from .gmail_rate_limiter import get_gmail_limiter
+from .gmail_sharded_search import build_list_options
+from .gmail_labels import exclude_labels_query, mark_extracted
+from .agent1_sync import collect_submissions
+from .agent1_queries import resolve_query_specs, fan_out_queries
+from .agent1_message_cache import open_message_cache
+from .mail_source import is_live_source
+from .agent1_submission_index import SUPERSEDED_STATUS, open_submission_index
+from ...utils.config import get_settings
+
+console = Console()
+
+
+def run_extraction(service, params: dict, service_factory=None) -> tuple:
+    """
+    Run Agent 1 extraction with options from params and settings.yaml
+
+    Args:
+        service: Gmail API service (used by the calling thread)
+        params: Agent 1 parameters; batch_size, incremental, fetch_workers,
+            list_workers, max_body_bytes and max_attachment_bytes override the email_extraction settings, mail_source
+            selects the mailbox (see mail_source), queries lists several searches
+        service_factory: Callable returning a new Gmail service, required for
+            concurrent fetching (fetch_workers > 1) and searching (query_workers > 1)
+
+    Returns:
+        tuple: (submissions, checkpoints) - each search's (params, history_id, submissions)
+        for save_sync_checkpoints once Excel1.xlsx is written; none for offline sources
+        (no checkpoint or cache) or the label work queue (Gmail's labels replace it)
+    """
+    settings = get_settings().email_extraction
+    batch_size = params.get('batch_size') or settings.batch_size
+    incremental = params.get('incremental', settings.incremental_sync)
+    params = {'max_body_bytes': settings.max_body_bytes, 'max_attachment_bytes': settings.max_attachment_bytes,
+              **{key: value for key, value in params.items() if value is not None}}
+    # Offline mailboxes keep no Gmail checkpoint, message cache or quota limiter
+    live = is_live_source(params)
+    fetch_options = build_fetch_options(settings, service_factory, params.get('fetch_workers'))
+    list_options = build_list_options(settings, service_factory, params.get('list_workers'))
+    if not live:
+        fetch_options['limiter'] = None
+
+    # Label work queue: Gmail leaves out emails already labelled, so a
+    # full scan only lists new submissions and needs no checkpoint
+    queue = settings.label_work_queue and live
+    labels = [settings.extracted_label, settings.drafted_label] if queue else []
+    if queue:
+        incremental = False
+        console.print(f"[*] Label work queue: skipping emails labelled {', '.join(labels)}")
+
+    if fetch_options['workers'] > 1:
+        console.print(f"[*] Concurrent fetch: {fetch_options['workers']} workers, "
+                      f"{settings.quota_units_per_second if live else 'unlimited'} quota units/s")
+
+    def collect(query_service, query_params):
+        if labels:
+            query_params = {**query_params, 'query': exclude_labels_query(query_params.get('query', ''), labels)}
+        return collect_submissions(query_service, query_params, batch_size, incremental and live,
+                                   cache, fetch_options, list_options)
+
+    specs = resolve_query_specs(params, settings)
+    cache = open_message_cache(settings.message_cache_max_entries) if settings.message_cache and live else None
+    try:
+        if specs:
+            submissions, checkpoints = fan_out_queries(service, params, specs, collect, service_factory,
+                                                       settings.query_workers)
+        else:
+            submissions, history_id = collect(service, params)
+    finally:
+        if cache is not None:
+            print_cache_stats(cache)
+            cache.close()
+
+    if settings.dedupe_submissions:
+        submissions = resolve_submissions(submissions, persistent=live)
+    if not specs:
+        checkpoints = [(params, history_id, submissions)] if history_id is not None else []
+    return submissions, checkpoints if live and not queue else []
+
+
+def label_extracted(service, params: dict, submissions: list):
+    """Label the extracted emails once Excel1.xlsx is written (label work queue only)"""
+    settings = get_settings().email_extraction
+    if not (settings.label_work_queue and is_live_source(params)):
+        return
+    limiter = get_gmail_limiter(settings.quota_units_per_second)
+    labelled = mark_extracted(service, submissions, settings.extracted_label, limiter)
+    console.print(f"[+] Labelled {labelled} emails '{settings.extracted_label}'")
+
+
+def resolve_submissions(submissions: list, persistent: bool = True) -> list:
+    """Collapse duplicates and keep the latest Ready row per student per homework"""
+    index = open_submission_index(persistent)
+    try:
+        resolved = index.resolve(submissions)
+    finally:
+        index.close()
+
+    superseded = sum(1 for s in resolved if s['status'].startswith(SUPERSEDED_STATUS))
+    duplicates = len(submissions) - len(resolved)
+    if superseded or duplicates:
+        console.print(f"[*] Submission index: {duplicates} duplicate emails dropped, "
+                      f"{superseded} older resubmissions superseded")
+    return resolved
+
+
+def build_fetch_options(settings, service_factory=None, workers: int = None) -> dict:
+    """
+    Build fetch_messages options from email_extraction settings
+
+    Args:
+        settings: EmailExtractionConfig
+        service_factory: Callable returning a new Gmail service (one per thread)
+        workers: Optional override for settings.fetch_workers
+
+    Returns:
+        dict: workers, service_factory, limiter, max_retries
+    """
+    workers = workers or settings.fetch_workers
+    return {
+        'workers': workers if service_factory is not None else 1,
+        'service_factory': service_factory,
+        'limiter': get_gmail_limiter(settings.quota_units_per_second),
+        'max_retries': settings.max_retries,
+    }
+
+
+def print_cache_stats(cache):
+    """Print message cache hit/miss counters for this run"""
+    stats = cache.stats()
+    console.print(
+        f"[*] Message cache: {stats['hits']} hits, {stats['misses']} misses "
+        f"({stats['hit_rate']}% hit rate, {stats['entries']}/{stats['max_entries']} entries)"
+    )
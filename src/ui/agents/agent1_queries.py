@@ -0,0 +1,148 @@
+"""
+Agent 1 Query Fan-out
+
+Runs several searches (homework number ranges, settings.yaml queries or
+a YAML file) concurrently in one Agent 1 run and merges the results into
+one deduplicated submission list, each row tagged with the searches
+that found it.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import yaml
+from rich.console import Console
+
+from .agent1_params import build_gmail_query
+from ...utils.agent_config import QuerySpecConfig
+
+console = Console()
+
+QUERY_COLUMN = 'query'
+NUMBER_PLACEHOLDER = '{n}'
+
+
+def resolve_query_specs(params: dict, settings) -> list:
+    """
+    Expanded query specs for this run ([] means a single-query run)
+
+    params['queries'] wins over settings.queries, which wins over
+    settings.queries_file.
+    """
+    specs = params.get('queries')
+    if specs is None:
+        specs = settings.queries or (load_query_specs(settings.queries_file) if settings.queries_file else [])
+    return expand_query_specs(specs)
+
+
+def load_query_specs(path) -> list:
+    """Load query specs from a YAML list (or a mapping with a 'queries' list)"""
+    with open(Path(path), 'r', encoding='utf-8') as f:
+        data = yaml.safe_load(f) or []
+    return data.get('queries', []) if isinstance(data, dict) else data
+
+
+def expand_query_specs(specs) -> list:
+    """
+    Turn specs into one search per homework number
+
+    Args:
+        specs: QuerySpecConfig objects or dicts with the same keys
+
+    Returns:
+        list: dicts with name, email_subject, sender_email, query, homework_number
+    """
+    expanded = []
+    for spec in specs:
+        if isinstance(spec, dict):
+            spec = QuerySpecConfig(**spec)
+        for number in parse_number_ranges(spec.homework_numbers) or [None]:
+            subject = _with_number(spec.email_subject, number, append=True)
+            query = _with_number(spec.query, number) or build_gmail_query(subject, spec.sender_email)
+            name = _with_number(spec.name, number, append=True) or subject or spec.sender_email or query
+            expanded.append({'name': name, 'email_subject': subject, 'sender_email': spec.sender_email,
+                             'query': query, 'homework_number': number})
+    return expanded
+
+
+def parse_number_ranges(text: str) -> list:
+    """'1-3, 7' -> [1, 2, 3, 7]"""
+    numbers = []
+    for part in filter(None, (piece.strip() for piece in (text or '').split(','))):
+        low, _, high = part.partition('-')
+        numbers.extend(range(int(low), int(high or low) + 1))
+    return list(dict.fromkeys(numbers))
+
+
+def fan_out_queries(service, params: dict, specs: list, collect, service_factory=None, workers: int = 4) -> tuple:
+    """
+    Run every spec through collect concurrently and merge the results
+
+    Args:
+        service: Gmail API service (used when there is no service_factory)
+        params: Agent 1 parameters shared by all searches
+        specs: Output of expand_query_specs
+        collect: callable(service, query_params) -> (submissions, history_id)
+        service_factory: Callable returning a Gmail service for each worker thread
+        workers: Searches run in parallel (1 without a service_factory)
+
+    Returns:
+        tuple: (submissions newest first, one per email, tagged in QUERY_COLUMN;
+        (query params, history_id, rows) checkpoint of each search that has one,
+        to save once Excel1.xlsx is written)
+    """
+    workers = max(1, min(workers, len(specs))) if service_factory is not None else 1
+
+    def run(spec):
+        start = time.perf_counter()
+        query_params = {**params, **{key: spec[key] for key in ('email_subject', 'sender_email', 'query')}}
+        rows, history_id = collect(service_factory() if workers > 1 else service, query_params)
+        rows = [row for row in rows if _fits_number(row, spec)]
+        return query_params, rows, history_id, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(run, specs))
+    elapsed = time.perf_counter() - start
+
+    merged, checkpoints = {}, []
+    console.print(f"[*] Query fan-out ({workers} workers):")
+    for spec, (query_params, rows, history_id, seconds) in zip(specs, results):
+        if history_id is not None:
+            checkpoints.append((query_params, history_id, rows))
+        for row in rows:
+            key = row.get('message_id') or row['email_id']
+            if key not in merged:
+                row[QUERY_COLUMN] = spec['name']
+                merged[key] = row
+            elif spec['name'] not in merged[key][QUERY_COLUMN].split(', '):
+                merged[key][QUERY_COLUMN] += f", {spec['name']}"
+        console.print(f"   - {spec['name']}: {len(rows)} emails in {seconds:.2f}s ({spec['query'] or 'all emails'})")
+    console.print(f"[+] {len(specs)} queries -> {len(merged)} unique emails in {elapsed:.2f}s\n")
+    return sorted(merged.values(), key=lambda s: s['received_time'] or '', reverse=True), checkpoints
+
+
+def _fits_number(row: dict, spec: dict) -> bool:
+    """False for a row of another homework (the subject substring "Homework - L1" also matches L10-L19)"""
+    number, subject = spec['homework_number'], spec['email_subject']
+    if number is None or not row.get('email_subject'):  # Error rows have no subject
+        return True
+    if row.get('homework_number') not in (None, number):  # Numbered by subject_pattern
+        return False
+    if subject and subject.endswith(str(number)):
+        return re.search(re.escape(subject) + r'(?!\d)', row['email_subject'], re.IGNORECASE) is not None
+    return True
+
+
+def _with_number(text: str, number: int, append: bool = False) -> str:
+    """Fill the {n} placeholder (or append the number to a subject after a space: "HW" -> "HW 1")"""
+    if not text or number is None:
+        return text
+    if NUMBER_PLACEHOLDER in text:
+        return text.replace(NUMBER_PLACEHOLDER, str(number))
+    return f"{text.rstrip()} {number}" if append else text
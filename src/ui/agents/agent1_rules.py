@@ -0,0 +1,147 @@
+"""
+Agent 1 Extraction Rules
+
+Compiles the email_extraction patterns from settings.yaml once
+(subject/homework number, GitHub URL and optional extra fields) and
+evaluates them against an email's subject, sender and body, scanning
+each source text a single time.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import re
+import threading
+
+from ...utils.config import get_settings
+from ...utils.validators import SUBJECT_PATTERN, GITHUB_URL_PATTERN, extract_homework_number
+
+SOURCES = ('subject', 'from', 'body')
+
+_rules = None
+_rules_lock = threading.Lock()
+
+
+class FieldRule:
+    """A named pattern applied to one source (subject, from or body)"""
+
+    def __init__(self, name: str, source: str, pattern: re.Pattern, group: int = 0):
+        if source not in SOURCES:
+            raise ValueError(f"Unknown source '{source}' for rule '{name}' (expected one of {SOURCES})")
+        self.name = name
+        self.source = source
+        self.pattern = pattern
+        self.group = group
+
+
+class ExtractionRules:
+    """Precompiled extraction rules (defaults to the PRD patterns in validators)"""
+
+    def __init__(self, subject_pattern: re.Pattern = SUBJECT_PATTERN,
+                 github_url_pattern: re.Pattern = GITHUB_URL_PATTERN, extra_fields=()):
+        self.subject_pattern = subject_pattern
+        self.rules = [FieldRule('github_url', 'body', github_url_pattern)] + list(extra_fields)
+        self._scanners = {
+            source: _build_scanner([r for r in self.rules if r.source == source])
+            for source in SOURCES
+        }
+
+    @classmethod
+    def from_settings(cls, settings) -> "ExtractionRules":
+        """Build rules from an EmailExtractionConfig"""
+        extra_fields = [
+            FieldRule(field.name, field.source, _compile(field.pattern, field.ignore_case), field.group)
+            for field in settings.extra_fields
+        ]
+        return cls(
+            subject_pattern=_compile(settings.subject_pattern, True, SUBJECT_PATTERN),
+            github_url_pattern=_compile(settings.github_url_pattern, False, GITHUB_URL_PATTERN),
+            extra_fields=extra_fields
+        )
+
+    def evaluate(self, subject: str, sender: str, body: str) -> dict:
+        """
+        Evaluate every rule against one email
+
+        Args:
+            subject: Subject header
+            sender: From header
+            body: Decoded body text
+
+        Returns:
+            dict: homework_number (int or None), one value per rule name
+                ('' if unmatched) and matched_rules (names, in rule order)
+        """
+        fields = {rule.name: '' for rule in self.rules}
+        texts = {'subject': subject or '', 'from': sender or '', 'body': body or ''}
+        for source, scanner in self._scanners.items():
+            if scanner is not None:
+                fields.update(scanner(texts[source]))
+
+        fields['homework_number'] = extract_homework_number(subject, self.subject_pattern)
+        fields['matched_rules'] = [rule.name for rule in self.rules if fields[rule.name]]
+        return fields
+
+
+def get_extraction_rules() -> ExtractionRules:
+    """Return the process-wide rules compiled from settings.yaml"""
+    global _rules
+    with _rules_lock:
+        if _rules is None:
+            _rules = ExtractionRules.from_settings(get_settings().email_extraction)
+        return _rules
+
+
+def _compile(pattern: str, ignore_case: bool, default: re.Pattern = None) -> re.Pattern:
+    """Compile a configured pattern, reusing the validators' object when identical"""
+    if default is not None and pattern == default.pattern:
+        return default
+    return re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+
+
+def _build_scanner(rules: list):
+    """
+    Build a function returning {rule name: first match} for one source
+
+    All rules for the source are joined into one alternation so the text
+    is scanned once, stopping as soon as every rule has matched. At any
+    position rules are tried in order, so a later rule cannot match
+    inside text already claimed by an earlier one; rules the combined
+    scan missed are searched for separately.
+    """
+    if not rules:
+        return None
+
+    try:
+        combined = re.compile('|'.join(
+            f"(?P<_rule{i}>{_scoped(rule.pattern)})" for i, rule in enumerate(rules)
+        ))
+    except re.error:
+        # e.g. two rules reuse a group name - fall back to one search per rule
+        return lambda text: {rule.name: _value(rule, rule.pattern.search(text)) for rule in rules}
+
+    def scan(text: str) -> dict:
+        found = {}
+        for match in combined.finditer(text):
+            # The outer _ruleN group closes last, so it is always lastgroup
+            rule = rules[int(match.lastgroup[len('_rule'):])]
+            if rule.name not in found:
+                # Re-match the rule alone so its own group numbers apply
+                found[rule.name] = _value(rule, rule.pattern.match(text, match.start()))
+                if len(found) == len(rules):
+                    break
+        for rule in rules:
+            if rule.name not in found:  # Overlapped by an earlier rule, or absent
+                found[rule.name] = _value(rule, rule.pattern.search(text))
+        return found
+
+    return scan
+
+
+def _scoped(pattern: re.Pattern) -> str:
+    """Pattern source with its IGNORECASE flag scoped to the pattern itself"""
+    return f"(?i:{pattern.pattern})" if pattern.flags & re.IGNORECASE else f"(?:{pattern.pattern})"
+
+
+def _value(rule: FieldRule, match) -> str:
+    return (match.group(rule.group) or '') if match else ''
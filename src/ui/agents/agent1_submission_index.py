@@ -0,0 +1,110 @@
+"""
+Agent 1 Submission Index
+
+Persistent index of submissions keyed by Gmail message id and by
+(normalized sender, homework). Collapses duplicate emails and keeps only
+the latest Ready submission per student per homework, so Agents 2-4
+grade each submission once.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import re
+from datetime import datetime
+
+from ...utils.paths import get_cache_dir
+from ...utils.sqlite_cache import SQLiteCache
+
+INDEX_FILE = "agent1_submissions.sqlite"
+SUPERSEDED_STATUS = "Superseded"
+
+# Reply/forward prefixes ignored when a subject has no homework number
+SUBJECT_PREFIX_PATTERN = re.compile(r'^\s*((re|fw|fwd)\s*:\s*)+', re.IGNORECASE)
+
+
+class SubmissionIndex:
+    """Message-id and latest-per-student lookups backed by SQLite"""
+
+    def __init__(self, db_path=None):
+        """Open the index (db_path ':memory:' keeps it for this run only)"""
+        db_path = db_path or get_cache_dir() / INDEX_FILE
+        # max_entries=0: an index must never evict
+        self._messages = SQLiteCache(db_path, max_entries=0, table="messages")
+        self._latest = SQLiteCache(db_path, max_entries=0, table="latest")
+
+    def resolve(self, submissions: list) -> list:
+        """
+        Dedupe submissions and mark older Ready rows as superseded
+
+        Rows with the same message id collapse to one; a message seen in
+        an earlier run keeps its recorded email_id. Among Ready rows, only
+        the latest per student per homework (across runs) stays Ready.
+
+        Args:
+            submissions: Submission dictionaries from Agent 1
+
+        Returns:
+            list: Deduplicated submissions, in their original order
+        """
+        unique, seen = [], set()
+        for submission in submissions:
+            if _identity(submission) not in seen:
+                seen.add(_identity(submission))
+                unique.append(submission)
+
+        known = self._messages.get_many(s['message_id'] for s in unique if s.get('message_id'))
+        for submission in unique:
+            if submission.get('message_id') in known:
+                submission['email_id'] = known[submission['message_id']]['email_id']
+
+        ready = [(student_key(s), s) for s in unique if s['status'] == "Ready"]
+        stored = self._latest.get_many({key for key, _ in ready})
+        latest = dict(stored)
+        for key, submission in ready:
+            entry = {k: submission.get(k) for k in ('message_id', 'email_id', 'received_time')}
+            if key not in latest or _is_newer(entry, latest[key]):
+                latest[key] = entry
+
+        for key, submission in ready:
+            if latest[key]['email_id'] != submission['email_id']:
+                submission['status'] = f"{SUPERSEDED_STATUS}: {latest[key]['email_id'][:12]}"
+
+        self._latest.set_many({key: entry for key, entry in latest.items() if stored.get(key) != entry})
+        self._messages.set_many({
+            s['message_id']: {'email_id': s['email_id'], 'student_key': student_key(s)}
+            for s in unique if s.get('message_id') and s['message_id'] not in known
+            and not s['status'].startswith("Error")
+        })
+        return unique
+
+    def close(self):
+        self._messages.close()
+        self._latest.close()
+
+
+def open_submission_index(persistent: bool = True) -> SubmissionIndex:
+    """Open the on-disk index, or a throwaway in-memory one"""
+    return SubmissionIndex(None if persistent else ':memory:')
+
+
+def student_key(submission: dict) -> str:
+    """(normalized sender, homework) key; subject is used when there is no number"""
+    sender = (submission.get('sender_email') or '').strip().lower()
+    homework = submission.get('homework_number')
+    if homework is None:
+        subject = SUBJECT_PREFIX_PATTERN.sub('', submission.get('email_subject') or '')
+        homework = ' '.join(subject.lower().split())
+    return f"{sender}|{homework}"
+
+
+def _identity(submission: dict) -> str:
+    return submission.get('message_id') or submission['email_id']
+
+
+def _is_newer(entry: dict, current: dict) -> bool:
+    """Compare received times as datetimes (ISO strings may carry different offsets)"""
+    try:
+        return datetime.fromisoformat(entry['received_time']) > datetime.fromisoformat(current['received_time'])
+    except (TypeError, ValueError):
+        return str(entry['received_time']) > str(current['received_time'])
@@ -0,0 +1,134 @@
+"""
+Agent 1 Sync Orchestration
+
+Chooses between an incremental (historyId) sync and a full mailbox
+scan, and returns the submissions for Excel1.xlsx.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+from rich.console import Console
+
+from .gmail_sharded_search import list_messages
+from .gmail_mime import MAX_BODY_BYTES
+from .agent1_email_parser import extract_email_data
+from .agent1_history_sync import (
+    CheckpointExpiredError, make_sync_key, load_checkpoint, save_checkpoint,
+    get_current_history_id, list_history_changes
+)
+
+console = Console()
+
+
+def collect_submissions(service, params: dict, batch_size: int, incremental: bool = True,
+                        cache=None, fetch_options: dict = None, list_options: dict = None) -> tuple:
+    """
+    Collect Agent 1 submissions, incrementally when a checkpoint exists
+
+    Args:
+        service: Gmail API service
+        params: Agent 1 parameters (email_subject, sender_email, max_emails, query,
+            optional max_body_bytes and max_attachment_bytes)
+        batch_size: messages.get calls per batch HTTP request
+        incremental: Use the stored historyId checkpoint if available
+        cache: Optional open message cache (see agent1_message_cache)
+        fetch_options: Concurrency/quota options (see build_fetch_options)
+        list_options: Date-window sharding options for the full scan (see build_list_options)
+
+    Returns:
+        tuple: (submissions, history_id) - pass history_id to
+        save_sync_checkpoint once the run has succeeded (None when not incremental)
+    """
+    email_subject = params.get('email_subject')
+    max_emails = params.get('max_emails', 10)
+
+    limiter = (fetch_options or {}).get('limiter')
+
+    # Read the historyId before listing so emails arriving mid-run are picked up next time
+    # (only when a checkpoint will be saved: it costs a getProfile call)
+    history_id = get_current_history_id(service, limiter) if incremental else None
+
+    checkpoint = load_checkpoint(_sync_key(params)) if incremental else None
+    if checkpoint and not _covers(checkpoint, _max_emails(params)):
+        console.print("[*] Sync checkpoint was saved with a lower max_emails, running a full scan")
+        checkpoint = None
+    if checkpoint:
+        try:
+            submissions = _incremental_sync(service, checkpoint, params, batch_size, cache, fetch_options)
+            return submissions, history_id
+        except CheckpointExpiredError:
+            console.print("[!] Sync checkpoint expired, falling back to full scan")
+
+    console.print("[*] Searching emails (full scan)...")
+    messages = list_messages(service, params.get('query', ''), max_emails, limiter, **(list_options or {}))
+    submissions = extract_email_data(
+        service, messages, email_subject, batch_size, cache=cache, fetch_options=fetch_options,
+        max_body_bytes=_max_body_bytes(params), max_attachment_bytes=params.get('max_attachment_bytes') or 0
+    )
+    return submissions, history_id
+
+
+def save_sync_checkpoint(params: dict, history_id: str, submissions: list):
+    """Persist the historyId checkpoint after a successful run"""
+    save_checkpoint(_sync_key(params), history_id, submissions, _max_emails(params))
+
+
+def save_sync_checkpoints(checkpoints: list):
+    """Persist the (params, history_id, submissions) checkpoints run_extraction returned"""
+    for params, history_id, submissions in checkpoints:
+        save_sync_checkpoint(params, history_id, submissions)
+
+
+def _sync_key(params: dict) -> str:
+    return make_sync_key(params.get('query', ''), params.get('email_subject'), params.get('sender_email'))
+
+
+def _max_emails(params: dict) -> int:
+    """The run's email cap (0 = no limit)"""
+    max_emails = params.get('max_emails', 10)
+    return max_emails if max_emails and max_emails > 0 else 0
+
+
+def _covers(checkpoint: dict, max_emails: int) -> bool:
+    """True if the checkpoint's rows were listed under a cap at least max_emails (0 = no limit)"""
+    saved = checkpoint.get('max_emails')
+    return saved == 0 or (saved is not None and 0 < max_emails <= saved)
+
+
+def _max_body_bytes(params: dict) -> int:
+    max_body_bytes = params.get('max_body_bytes')
+    return MAX_BODY_BYTES if max_body_bytes is None else max_body_bytes
+
+
+def _incremental_sync(service, checkpoint: dict, params: dict, batch_size: int, cache,
+                      fetch_options: dict) -> list:
+    """
+    Fetch only emails added since the checkpoint and merge with stored rows
+
+    history.list is not filtered by the search query, so the subject and
+    sender filters are applied to the new emails' metadata instead.
+    """
+    limiter = (fetch_options or {}).get('limiter')
+    added_ids, deleted_ids = list_history_changes(service, checkpoint['history_id'], limiter)
+
+    stored = [s for s in checkpoint['submissions'] if s.get('message_id') not in deleted_ids]
+    known_ids = {s.get('message_id') for s in stored}
+    new_ids = [mid for mid in added_ids + checkpoint.get('retry_ids', []) if mid not in known_ids]
+    new_ids = list(dict.fromkeys(new_ids))
+
+    console.print(
+        f"[*] Incremental sync: {len(new_ids)} new emails since historyId "
+        f"{checkpoint['history_id']} ({len(stored)} carried forward)"
+    )
+    new_submissions = extract_email_data(
+        service, [{'id': mid} for mid in new_ids],
+        params.get('email_subject'), batch_size,
+        sender_email=params.get('sender_email'), cache=cache, fetch_options=fetch_options,
+        max_body_bytes=_max_body_bytes(params), max_attachment_bytes=params.get('max_attachment_bytes') or 0
+    )
+
+    # Newest first, like a full scan, and capped the same way
+    merged = sorted(new_submissions + stored, key=lambda s: s['received_time'], reverse=True)
+    max_emails = _max_emails(params)
+    return merged[:max_emails] if max_emails else merged
@@ -0,0 +1,150 @@
+"""
+Agent 2 Repository Budgets
+
+Hard per-repository limits, so one pathological submission cannot hold
+the batch hostage: every git subprocess started for a repository (also
+the long-lived cat-file --batch) shares one wall-clock deadline
+(repository_analysis.clone_timeout) and a cap on the bytes its mirror
+may grow by (max_repo_bytes). A git process that overruns is killed with
+its children (git clone runs helpers such as git-remote-https and
+index-pack). The analyzed .py files are capped in number
+(max_repo_files) and size (max_file_bytes).
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import os
+import signal
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# How often a running git process is checked against the budget
+POLL_SECONDS = 0.25
+
+_current = threading.local()
+
+
+class RepoTimeoutError(Exception):
+    """Raised when a repository's git work exceeds clone_timeout"""
+
+
+class RepoTooLargeError(Exception):
+    """Raised when a repository exceeds a byte, file count or file size budget"""
+
+
+@contextmanager
+def repo_budget(timeout: float = 0, max_bytes: int = 0):
+    """Apply a deadline (seconds, 0 = none) and download cap (0 = none) to git calls in this thread"""
+    _current.budget = {'deadline': time.monotonic() + timeout if timeout else None, 'timeout': timeout,
+                       'max_bytes': max_bytes, 'watch': None, 'baseline': 0}
+    try:
+        yield
+    finally:
+        _current.budget = None
+
+
+def watch_mirror(mirror: Path, baseline: int = 0):
+    """Count the mirror's growth beyond baseline bytes against the download cap"""
+    budget = getattr(_current, 'budget', None)
+    if budget is not None:
+        budget.update(watch=Path(mirror), baseline=baseline)
+
+
+def check_files(count: int, largest: int, max_files: int, max_file_bytes: int):
+    """Raise RepoTooLargeError for more than max_files files or one over max_file_bytes (0 = no limit)"""
+    if max_files and count > max_files:
+        raise RepoTooLargeError(f"{count} .py files (limit {max_files})")
+    if max_file_bytes and largest > max_file_bytes:
+        raise RepoTooLargeError(f"a {largest} byte file (limit {max_file_bytes})")
+
+
+def run_limited(command: list, cwd=None, env: dict = None, timeout: float = None, input: bytes = None):
+    """
+    subprocess.run(capture_output=True), killed when the thread's budget runs out
+
+    Raises:
+        RepoTimeoutError: The repository deadline passed
+        RepoTooLargeError: The watched mirror grew beyond the download cap
+        subprocess.TimeoutExpired: timeout passed (without an active budget)
+    """
+    budget = getattr(_current, 'budget', None)
+    if budget is None:
+        return subprocess.run(command, cwd=cwd, env=env, capture_output=True, timeout=timeout, input=input)
+
+    process = subprocess.Popen(command, cwd=cwd, env=env, stdin=subprocess.PIPE if input is not None else None,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, start_new_session=os.name == 'posix')
+    while True:
+        try:
+            stdout, stderr = process.communicate(input, timeout=POLL_SECONDS)
+        except subprocess.TimeoutExpired:
+            input = None  # Already sent
+            error = _overrun(budget, command)
+            if error is not None:
+                _kill(process)
+                raise error
+            continue
+        # A download faster than one poll is caught here
+        error = _overrun(budget, command, check_deadline=False)
+        if error is not None:
+            raise error
+        return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+
+def popen_limited(command: list, cwd=None, env: dict = None) -> tuple:
+    """Long-lived Popen (stdin/stdout pipes) killed at the budget; returns (process, list receiving the error)"""
+    process = subprocess.Popen(command, cwd=cwd, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, start_new_session=os.name == 'posix')
+    budget, errors = getattr(_current, 'budget', None), []
+    if budget is not None:
+        threading.Thread(target=_watch, args=(process, budget, command, errors), daemon=True).start()
+    return process, errors
+
+
+def _watch(process: subprocess.Popen, budget: dict, command: list, errors: list):
+    """Kill the process (its reader reaps it) once it overruns the budget"""
+    while process.poll() is None:
+        error = _overrun(budget, command)
+        if error is not None:
+            errors.append(error)
+            return _kill(process, reap=False)
+        time.sleep(POLL_SECONDS)
+
+
+def dir_size(path: Path) -> int:
+    """Bytes of all files under path (0 if it does not exist; files git removes meanwhile are skipped)"""
+    total = 0
+    for f in Path(path).rglob('*'):
+        try:
+            total += f.stat().st_size if f.is_file() else 0
+        except OSError:
+            continue
+    return total
+
+
+def _overrun(budget: dict, command: list, check_deadline: bool = True):
+    """The budget error a command has hit, if any"""
+    if check_deadline and budget['deadline'] is not None and time.monotonic() > budget['deadline']:
+        name = next((arg for arg in command[1:] if not arg.startswith('-') and '=' not in arg), 'command')
+        return RepoTimeoutError(f"git {name} exceeded {budget['timeout']}s")
+    if budget['max_bytes'] and budget['watch'] is not None:
+        grown = dir_size(budget['watch']) - budget['baseline']
+        if grown > budget['max_bytes']:
+            return RepoTooLargeError(f"downloaded {grown} bytes (limit {budget['max_bytes']})")
+    return None
+
+
+def _kill(process: subprocess.Popen, reap: bool = True):
+    """Kill a git process and its helpers, then reap it"""
+    try:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except OSError:
+        pass  # Already exited
+    if reap:
+        process.communicate()
@@ -0,0 +1,72 @@
+"""
+Agent 2 Blob Reader
+
+One long-lived git cat-file --batch process per repository streams blob
+contents for the object database reader (agent2_object_db). In a partial
+clone cat-file fetches any blob it lacks from the remote, so the process
+runs in its own process group under the repository budget
+(agent2_budget): at the deadline or the download cap it is killed with
+its helpers and the read fails with the budget error.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+from pathlib import Path
+
+import git
+
+from .agent2_budget import popen_limited
+from .agent2_git import git_env
+
+
+class CatFileBatch:
+    """One git cat-file --batch process serving blob reads for a repository"""
+
+    COMMAND = ['git', 'cat-file', '--batch']
+
+    def __init__(self, repo_dir: Path):
+        self._process, self._errors = popen_limited(self.COMMAND, cwd=repo_dir, env=git_env())
+
+    def read(self, oid: str):
+        """
+        Object contents as bytes (None if the object is missing)
+
+        Raises:
+            RepoTimeoutError: The repository deadline passed (the process was killed)
+            RepoTooLargeError: The mirror grew beyond the download cap (the process was killed)
+            git.GitCommandError: The process exited for another reason
+        """
+        try:
+            self._process.stdin.write(f"{oid}\n".encode('ascii'))
+            self._process.stdin.flush()
+            header = self._process.stdout.readline().split()
+        except OSError:  # Broken pipe: the process is gone
+            header = []
+        if not header:
+            raise self._failure()
+        if len(header) != 3:
+            return None  # "<oid> missing"
+        size = int(header[2])
+        data = self._process.stdout.read(size + 1)[:size]  # The contents and the newline after them
+        if len(data) < size:
+            raise self._failure()
+        return data
+
+    def _failure(self) -> Exception:
+        """Why the process stopped answering (the budget error if it was killed)"""
+        self._process.wait()
+        return self._errors[0] if self._errors else git.GitCommandError(self.COMMAND, self._process.returncode)
+
+    def close(self):
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass  # Already killed
+        self._process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
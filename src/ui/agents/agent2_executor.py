@@ -1,7 +1,8 @@
 """
 Agent 2 Executor - Repository Analysis
 
-Analyzes GitHub repositories and creates Excel2.xlsx with metrics.
+Analyzes GitHub repositories and creates Excel2.xlsx with metrics (and
+a sheet of near-duplicate submission pairs).
 
 Author: Hadar Wayn
 Date: December 2025
@@ -9,10 +10,13 @@ Date: December 2025
 
 import openpyxl
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from rich.console import Console
 
-from .agent2_repo_analyzer import analyze_repository
+from .agent2_pipeline import run_analysis
+from .agent2_submissions import cache_summary
+from .agent2_ignore import ignore_summary
+from .agent2_similarity import add_similarity_sheet, find_similar, similarity_summary
+from .agent2_stats import file_cache_summary, stage_summary, transfer_summary
 from .excel_utils import create_excel_workbook, auto_adjust_columns
 from ...utils.paths import get_excel_file, get_excel_dir
 
@@ -44,13 +48,14 @@ def execute_agent2() -> bool:
             console.print("[!] No repositories to analyze. Creating empty Excel2.xlsx...\n")
             results = []
         else:
-            results = _analyze_repositories_parallel(ready_rows)
+            results = run_analysis(ready_rows)
+        pairs = find_similar(results)
 
         # Create Excel2.xlsx
-        _create_excel2(results)
+        _create_excel2(results, pairs)
 
         # Print summary
-        _print_summary(results)
+        _print_summary(results, pairs)
 
         return True
 
@@ -67,7 +72,7 @@ def _load_ready_repositories(excel1_path: Path) -> list:
 
     ready_rows = []
     for row in ws.iter_rows(min_row=2, values_only=True):
-        email_id, received_time, subject, sender, github_url, thread_id, status = row
+        email_id, received_time, subject, sender, github_url, thread_id, status = row[:7]
         if status == "Ready":
             ready_rows.append({
                 'email_id': email_id,
@@ -76,24 +81,7 @@ def _load_ready_repositories(excel1_path: Path) -> list:
 
     return ready_rows
 
-def _analyze_repositories_parallel(ready_rows: list, max_workers: int = 5) -> list:
-    """Analyze repositories in parallel using thread pool"""
-    results = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all analysis tasks
-        futures = {
-            executor.submit(analyze_repository, row['email_id'], row['github_url']): row
-            for row in ready_rows
-        }
-
-        # Collect results as they complete
-        for future in as_completed(futures):
-            result = future.result()
-            results.append(result)
-
-    return results
-
-def _create_excel2(results: list):
+def _create_excel2(results: list, pairs: list):
     """Create Excel2.xlsx with analysis results"""
     console.print("\n[*] Creating Excel2.xlsx...")
 
@@ -127,13 +115,14 @@ def _create_excel2(results: list):
 
     # Auto-adjust columns
     auto_adjust_columns(ws)
+    add_similarity_sheet(wb, pairs)
 
     # Save file
     output_path = excel_dir / 'Excel2.xlsx'
     wb.save(output_path)
     console.print(f"[+] Excel2.xlsx created: {output_path}")
 
-def _print_summary(results: list):
+def _print_summary(results: list, pairs: list):
     """Print analysis summary statistics"""
     successful_count = sum(1 for r in results if r['status'] == 'Ready')
     failed_count = sum(1 for r in results if 'Failed' in r['status'])
@@ -146,4 +135,10 @@ def _print_summary(results: list):
     console.print(f"[+] Successful: {successful_count}")
     console.print(f"[+] Failed: {failed_count}")
     console.print(f"[+] Average grade: {avg_grade:.2f}%")
+    console.print(f"[+] {cache_summary(results)}")
+    console.print(f"[+] {ignore_summary(results)}")
+    console.print(f"[+] {transfer_summary(reset=True)}")
+    console.print(f"[+] {stage_summary(reset=True)}")
+    console.print(f"[+] {file_cache_summary(reset=True)}")
+    console.print(f"[+] {similarity_summary(results, pairs)}")
     console.print("="*70 + "\n")
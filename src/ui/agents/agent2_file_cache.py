@@ -0,0 +1,67 @@
+"""
+Agent 2 File Metrics Cache
+
+Students fork the same course template, so most files of a class are
+byte-identical across repositories and runs. Per-file metrics (the line
+count and, when similarity detection is on, the file's MinHash
+signature) are kept in a persistent SQLite cache keyed by the git blob
+SHA, i.e. by content: a file is looked up before its blob is downloaded
+or read, and only misses are counted. The cache is LRU-bounded
+(repository_analysis.file_cache_max_entries) and its hit rate is reported.
+
+Only analysis_mode: objects uses it. A checkout has already written every
+file, so a lookup would save just the local read; a zip entry has no
+content hash, and computing one costs as much as counting its lines.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+from .agent2_minhash import SIGNATURE_KEY
+from .agent2_stats import record_file_cache
+from ...utils.paths import get_cache_dir
+from ...utils.sqlite_cache import SQLiteCache
+
+CACHE_FILE = "agent2_files.sqlite"
+
+# Bump when the stored per-file metrics change (old entries are then ignored)
+FILE_METRICS_VERSION = 1
+
+# Metrics key holding (blob SHA, per-file metrics) of the files counted, not looked up
+FILE_METRICS_KEY = 'file_metrics'
+
+
+def open_file_cache(max_entries: int = 200000) -> SQLiteCache:
+    """Open the per-file metrics cache (close it with close_file_cache)"""
+    return SQLiteCache(get_cache_dir() / CACHE_FILE, max_entries=max_entries, table="files")
+
+
+def close_file_cache(cache: SQLiteCache):
+    """Record the cache's hit rate for the analysis summary and close it"""
+    if cache is not None:
+        record_file_cache(cache.stats())
+        cache.close()
+
+
+def blob_key(oid: str) -> str:
+    return f"v{FILE_METRICS_VERSION}:blob:{oid}"
+
+
+def lookup_files(cache: SQLiteCache, oids: list, signatures: bool = False) -> dict:
+    """
+    {blob SHA: {'lines', optional signature}} of the blobs already in the cache
+
+    Entries without a signature count as misses when signatures are
+    wanted, so the file is read again (empty without a cache).
+    """
+    if cache is None or not oids:
+        return {}
+    found = cache.get_many(blob_key(oid) for oid in dict.fromkeys(oids))
+    return {key.rsplit(':', 1)[-1]: value for key, value in found.items()
+            if not signatures or SIGNATURE_KEY in value}
+
+
+def store_file_metrics(cache: SQLiteCache, metrics: dict):
+    """Cache the per-file metrics a count stage produced"""
+    if cache is not None and metrics.get(FILE_METRICS_KEY):
+        cache.set_many({blob_key(oid): entry for oid, entry in metrics[FILE_METRICS_KEY]})
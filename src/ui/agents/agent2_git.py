@@ -0,0 +1,115 @@
+"""
+Agent 2 Git Commands
+
+Plain git subprocesses for the repository mirror cache: shallow bare
+clone and fetch (optionally a lean partial clone that downloads no file
+contents up front), and a checkout of one commit into a working
+directory that can be restricted to file globs (sparse checkout), in
+which case only the matching blobs are downloaded. LFS smudging is
+disabled, so large files stay pointers.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import os
+import re
+import subprocess
+from pathlib import Path
+
+import git
+
+from .agent2_budget import run_limited
+
+# Fetch only commits and trees up front; blobs come on demand at checkout
+LEAN_FILTER = "blob:none"
+SHALLOW_ARGS = ['--depth=1', '--single-branch', '--no-tags']
+
+_GITHUB_PATTERN = re.compile(
+    r'^(?:https?://|ssh://)?(?:git@)?(?:www\.)?github\.com[/:]([\w.-]+)/([\w.-]+?)(?:\.git)?(?:[/?#].*)?$',
+    re.IGNORECASE
+)
+
+
+def canonical_repo_url(url: str) -> str:
+    """https://github.com/<owner>/<repo> for any form of a GitHub URL (others unchanged)"""
+    match = _GITHUB_PATTERN.match(url.strip())
+    if not match:
+        return url.strip().rstrip('/')
+    return f"https://github.com/{match.group(1).lower()}/{match.group(2).lower()}"
+
+
+def git_env(env: dict = None) -> dict:
+    """Process environment for git: LFS smudging and credential prompts off"""
+    return {**os.environ, 'GIT_LFS_SKIP_SMUDGE': '1', 'GIT_TERMINAL_PROMPT': '0', **(env or {})}
+
+
+def run_git(args: list, cwd: Path = None, env: dict = None, timeout: float = None, stdin: str = None) -> str:
+    """
+    Run a git command and return its stripped stdout (within the repository budget, see agent2_budget)
+
+    Raises:
+        git.GitCommandError: Non-zero exit status (same error as GitPython)
+    """
+    command = ['git', *[str(arg) for arg in args]]
+    result = run_limited(command, cwd=cwd, env=git_env(env), timeout=timeout,
+                         input=stdin.encode('utf-8') if stdin is not None else None)
+    if result.returncode != 0:
+        raise git.GitCommandError(command, result.returncode, result.stderr, result.stdout)
+    return result.stdout.decode('utf-8', errors='replace').strip()
+
+
+def clone_mirror(url: str, mirror: Path, lean: bool = True) -> str:
+    """Shallow bare clone of the default branch; returns its commit SHA"""
+    filter_args = [f'--filter={LEAN_FILTER}'] if lean else []
+    run_git(['clone', '--quiet', '--bare', *SHALLOW_ARGS, *filter_args, url, mirror])
+    return run_git(['rev-parse', 'HEAD'], cwd=mirror)
+
+
+def fetch_mirror_head(mirror: Path) -> str:
+    """Shallow fetch of the remote default branch into an existing mirror; returns its SHA"""
+    run_git(['fetch', '--quiet', '--depth=1', '--no-tags', 'origin', 'HEAD'], cwd=mirror)
+    return run_git(['rev-parse', 'FETCH_HEAD'], cwd=mirror)
+
+
+def is_mirror(mirror: Path) -> bool:
+    """True for a bare clone with an origin remote (anything else is re-cloned)"""
+    try:
+        return bool(run_git(['config', 'remote.origin.url'], cwd=mirror))
+    except (git.GitCommandError, OSError):
+        return False
+
+
+def checkout_commit(mirror: Path, sha: str, work_tree: Path, globs: list = None):
+    """
+    Write a commit's files into work_tree using a private index
+
+    Args:
+        mirror: Bare repository holding the commit
+        sha: Commit to check out
+        work_tree: Empty target directory
+        globs: Optional gitignore-style patterns (e.g. ['*.py']); only
+            matching files are written and, in a lean mirror, downloaded
+    """
+    work_tree.mkdir(parents=True)
+    index = work_tree.parent / f"{work_tree.name}.index"
+    sparse = bool(globs)
+    if sparse:
+        info = mirror / 'info'
+        info.mkdir(exist_ok=True)
+        (info / 'sparse-checkout').write_text('\n'.join(globs) + '\n', encoding='utf-8')
+    try:
+        run_git([f'--git-dir={mirror}', f'--work-tree={work_tree}',
+                 '-c', f'core.sparseCheckout={str(sparse).lower()}', 'read-tree', '--reset', '-u', sha],
+                env={'GIT_INDEX_FILE': str(index)})
+    finally:
+        index.unlink(missing_ok=True)
+
+
+def ls_remote_head(url: str, timeout: float = None) -> str:
+    """Commit SHA of the remote HEAD (None if it cannot be resolved)"""
+    try:
+        output = run_git(['ls-remote', url, 'HEAD'], timeout=timeout)
+    except (git.GitCommandError, subprocess.TimeoutExpired):
+        return None
+    return output.split()[0] if output else None
@@ -0,0 +1,132 @@
+"""
+Agent 2 Ignore Rules
+
+Keeps committed third-party and generated code (venv/, site-packages/,
+node_modules/, build output...) out of the line counts. Patterns come
+from repository_analysis.ignore_globs plus the repository's root
+.gitignore, with gitignore semantics for the common cases: a trailing
+/ matches directories only, a pattern containing / is anchored to the
+repository root, anything else matches a name at any depth (negation
+and nested .gitignore files are not supported). Ignored directories are
+pruned before descending; the skipped directories, .py files and bytes
+are reported.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import fnmatch
+import os
+from pathlib import Path
+
+from ...utils.config import get_settings
+
+GITIGNORE = '.gitignore'
+SKIPPED_KEYS = ('skipped_dirs', 'skipped_files', 'skipped_bytes')
+
+
+class IgnoreRules:
+    """Compiled gitignore-style patterns (picklable, for worker processes)"""
+
+    def __init__(self, patterns: list = (), use_gitignore: bool = True):
+        self.patterns = list(patterns)
+        self.use_gitignore = use_gitignore
+        self._rules = []
+        for line in self.patterns:
+            line = line.strip()
+            if not line or line.startswith(('#', '!')):
+                continue
+            dir_only = line.endswith('/') or line.endswith('/**')
+            pattern = line.rstrip('/').removesuffix('/**').removeprefix('**/')
+            self._rules.append((pattern.lstrip('/'), '/' in pattern, dir_only))
+
+    def with_gitignore(self, text: str) -> 'IgnoreRules':
+        """These rules plus a .gitignore's (unchanged if use_gitignore is off)"""
+        if not self.use_gitignore or not text:
+            return self
+        return IgnoreRules(self.patterns + text.splitlines(), self.use_gitignore)
+
+    def ignores(self, path: str, is_dir: bool = False) -> bool:
+        """True if a repository-relative path (with / separators) is ignored"""
+        name = path.rsplit('/', 1)[-1]
+        return any(fnmatch.fnmatchcase(path if anchored else name, pattern)
+                   for pattern, anchored, dir_only in self._rules if is_dir or not dir_only)
+
+
+def settings_rules() -> IgnoreRules:
+    """Rules from settings.yaml (before any .gitignore)"""
+    settings = get_settings().repository_analysis
+    return IgnoreRules(settings.ignore_globs, settings.use_gitignore)
+
+
+def filter_paths(entries: list, rules: IgnoreRules) -> tuple:
+    """
+    Split a flat file listing (git tree, zip) like walk_files would
+
+    Args:
+        entries: (path, item) pairs for files
+        rules: Ignore rules
+
+    Returns:
+        tuple: (kept entries, ignored file entries, pruned directory paths)
+    """
+    decided = {}
+    kept, ignored, pruned = [], [], set()
+    for path, item in entries:
+        parts = path.split('/')
+        top = None
+        for depth in range(1, len(parts)):
+            parent = '/'.join(parts[:depth])
+            if parent not in decided:
+                decided[parent] = rules.ignores(parent, True)
+            if decided[parent]:
+                top = parent
+                break
+        if top is not None:
+            pruned.add(top)
+        elif rules.ignores(path):
+            ignored.append((path, item))
+        else:
+            kept.append((path, item))
+    return kept, ignored, pruned
+
+
+def walk_files(root: Path, rules: IgnoreRules, suffix: str = '.py') -> tuple:
+    """
+    os.scandir walk yielding files with suffix, pruning ignored directories
+
+    Symlinks are not followed (like git, which stores them as links).
+
+    Returns:
+        tuple: (kept file paths, {'skipped_dirs', 'skipped_files', 'skipped_bytes'})
+    """
+    files = []
+    skipped = dict.fromkeys(SKIPPED_KEYS, 0)
+    stack = [(str(root), '')]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    path = prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if rules.ignores(path, True):
+                            skipped['skipped_dirs'] += 1
+                        else:
+                            stack.append((entry.path, path + '/'))
+                    elif entry.is_file(follow_symlinks=False) and entry.name.endswith(suffix):
+                        if rules.ignores(path):
+                            skipped['skipped_files'] += 1
+                            skipped['skipped_bytes'] += entry.stat(follow_symlinks=False).st_size
+                        else:
+                            files.append(Path(entry.path))
+        except OSError:
+            continue  # Unreadable directory
+    return files, skipped
+
+
+def ignore_summary(results: list) -> str:
+    """'Ignored: ...' line for the analysis summary"""
+    totals = {key: sum(r.get(key) or 0 for r in results) for key in SKIPPED_KEYS}
+    return (f"Ignored: {totals['skipped_dirs']} directories, {totals['skipped_files']} .py files "
+            f"({totals['skipped_bytes'] / 1048576:.2f} MB)")
@@ -0,0 +1,70 @@
+"""
+Agent 2 Line Counter
+
+Counts lines on raw bytes, read in large buffers (or memory-mapped for
+big files), instead of decoding the file and building a list with
+readlines(). The count equals len(f.readlines()) in text mode: \n, \r\n
+and a lone \r each end a line, and a last line without a trailing
+newline still counts. Files that are not valid UTF-8 are counted too,
+so they can no longer drop out of the grade.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import mmap
+import os
+from pathlib import Path
+
+# Compliant files have <= 150 lines per PROJECT_GUIDELINES.md
+LINE_LIMIT = 150
+
+BUFFER_SIZE = 1024 * 1024
+# Files at least this large are memory-mapped instead of read
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+
+def count_chunks(chunks) -> int:
+    """Lines in a sequence of byte chunks (a \r\n split across two chunks is one break)"""
+    breaks = 0
+    last = b''
+    for chunk in chunks:
+        if not chunk:
+            continue
+        breaks += chunk.count(b'\n')
+        if b'\r' in chunk:
+            breaks += chunk.count(b'\r') - chunk.count(b'\r\n')
+        if last == b'\r' and chunk[:1] == b'\n':
+            breaks -= 1
+        last = chunk[-1:]
+    return breaks + (1 if last not in (b'', b'\n', b'\r') else 0)
+
+
+def count_bytes_lines(data: bytes) -> int:
+    """Lines in bytes already in memory (e.g. a blob from git cat-file)"""
+    return count_chunks((data,))
+
+
+def count_stream_lines(stream, buffer_size: int = BUFFER_SIZE) -> int:
+    """Lines in a binary stream, read buffer_size bytes at a time"""
+    return count_chunks(iter(lambda: stream.read(buffer_size), b''))
+
+
+def count_file_lines(path: Path, mmap_threshold: int = MMAP_THRESHOLD) -> int:
+    """
+    Lines in a file
+
+    Args:
+        path: File to count
+        mmap_threshold: Size from which the file is memory-mapped
+
+    Raises:
+        OSError: The file cannot be read
+    """
+    with open(path, 'rb', buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < mmap_threshold or size == 0:
+            # A typical source file fits one read
+            return count_bytes_lines(f.readall()) if size < BUFFER_SIZE else count_stream_lines(f)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return count_chunks(mapped[start:start + BUFFER_SIZE] for start in range(0, size, BUFFER_SIZE))
@@ -0,0 +1,91 @@
+"""
+Agent 2 MinHash Signatures
+
+Fixed-size fingerprints of a submission's Python code for near-duplicate
+detection (agent2_similarity). A file is tokenized on raw bytes
+(identifiers, numbers and single symbols; comments and whitespace are
+dropped), every run of SHINGLE_TOKENS consecutive tokens is hashed, and
+NUM_PERM random permutations (vectorized with numpy) keep their minimum
+hash. The fraction of positions where two signatures agree estimates
+the Jaccard similarity of their shingle sets. Signatures of files merge
+by position-wise minimum into the signature of the whole submission, so
+per-file signatures can be cached (agent2_file_cache) like line counts.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import random
+import re
+import zlib
+
+import numpy as np
+
+# Bump when tokenizing, shingling or the permutations change (stored signatures are then ignored)
+MINHASH_VERSION = 1
+# Metrics, result and file cache key of a signature
+SIGNATURE_KEY = f"minhash_v{MINHASH_VERSION}"
+NUM_PERM = 64
+# LSH banding: BANDS bands of ROWS values; pairs with Jaccard around
+# (1 / BANDS) ** (1 / ROWS) = 0.5 and above become candidates
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_TOKENS = 5
+
+# Mersenne prime for the universal hashes (a * x + b) mod PRIME
+PRIME = (1 << 31) - 1
+_rng = random.Random(MINHASH_VERSION)
+PERMUTATIONS = [(_rng.randrange(1, PRIME), _rng.randrange(PRIME)) for _ in range(NUM_PERM)]
+# a < 2**31 and x < 2**32, so a * x + b fits in uint64
+_A = np.array([[a] for a, _ in PERMUTATIONS], dtype=np.uint64)
+_B = np.array([[b] for _, b in PERMUTATIONS], dtype=np.uint64)
+# Shingles hashed per numpy pass (bounds the NUM_PERM x CHUNK temporary)
+CHUNK = 16384
+
+TOKEN = re.compile(rb"#[^\r\n]*|[A-Za-z_][A-Za-z0-9_]*|\d+|\S")
+
+
+def tokenize(data: bytes) -> list:
+    """Code tokens of a Python file's bytes (comments dropped)"""
+    return [token for token in TOKEN.findall(data) if not token.startswith(b'#')]
+
+
+def shingle_hashes(data: bytes) -> set:
+    """32-bit hashes of every SHINGLE_TOKENS-token window (one window for shorter files)"""
+    tokens = tokenize(data)
+    if not tokens:
+        return set()
+    windows = range(max(1, len(tokens) - SHINGLE_TOKENS + 1))
+    return {zlib.crc32(b' '.join(tokens[start:start + SHINGLE_TOKENS])) for start in windows}
+
+
+def file_signature(data: bytes) -> list:
+    """MinHash signature of a file (None when it has no code tokens)"""
+    hashes = shingle_hashes(data)
+    if not hashes:
+        return None
+    values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+    signature = np.full(NUM_PERM, PRIME, dtype=np.uint64)
+    for start in range(0, len(values), CHUNK):
+        chunk = (_A * values[start:start + CHUNK] + _B) % PRIME
+        np.minimum(signature, chunk.min(axis=1), out=signature)
+    return signature.tolist()
+
+
+def merge_signatures(signatures) -> list:
+    """Signature of the union of the files' shingles (None if every file was empty)"""
+    present = [signature for signature in signatures if signature]
+    if not present:
+        return None
+    return [min(values) for values in zip(*present)]
+
+
+def estimate_jaccard(first: list, second: list) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for a, b in zip(first, second) if a == b) / NUM_PERM
+
+
+def band_keys(signature: list) -> list:
+    """LSH bucket of each band; similar signatures share at least one with high probability"""
+    return [f"v{MINHASH_VERSION}:band:{band}:" + "-".join(map(str, signature[band * ROWS:(band + 1) * ROWS]))
+            for band in range(BANDS)]
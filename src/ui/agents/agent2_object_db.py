@@ -0,0 +1,140 @@
+"""
+Agent 2 Object Database Reader
+
+Analyzes a commit straight from a bare mirror without a working tree:
+.py paths come from git ls-tree -r and their contents stream through a
+single long-lived git cat-file --batch process per repository, so no
+file is written by a checkout and read back. In a lean (partial) mirror
+the missing .py blobs are fetched first in one request; blobs under
+ignored paths (agent2_ignore) and blobs whose metrics are in the file
+cache (agent2_file_cache) are never read or downloaded. The metrics are
+a pure function of the commit's tree.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+from pathlib import Path
+
+from .agent2_budget import check_files
+from .agent2_cat_file import CatFileBatch
+from .agent2_file_cache import FILE_METRICS_KEY, lookup_files
+from .agent2_git import run_git
+from .agent2_ignore import GITIGNORE, IgnoreRules, filter_paths, settings_rules
+from .agent2_line_counter import LINE_LIMIT, count_bytes_lines
+from .agent2_minhash import SIGNATURE_KEY, file_signature, merge_signatures
+from ...utils.config import get_settings
+from ...utils.sqlite_cache import SQLiteCache
+
+ANALYZED_SUFFIX = '.py'
+# Regular and executable files (symlinks and submodules are not code)
+BLOB_MODES = ('100644', '100755')
+
+
+def read_python_blobs(mirror: Path, sha: str, rules: IgnoreRules = None, file_cache: SQLiteCache = None) -> tuple:
+    """
+    Contents of the commit's .py files not in the file cache, read through one cat-file --batch
+
+    Args:
+        rules: Ignore rules (default settings.yaml), extended by the commit's .gitignore
+        file_cache: Per-file metrics cache, consulted before anything is downloaded or read
+
+    Returns:
+        tuple: ((blob SHA, bytes) pairs, skipped_* counts, cached per-file
+        metrics; ignored blobs a lean mirror never downloads add no bytes)
+
+    Raises:
+        RepoTooLargeError: Over max_repo_files .py files or one over max_file_bytes
+    """
+    entries = [(path, oid) for oid, path in list_blobs(mirror, sha)]
+    gitignore = next((oid for path, oid in entries if path == GITIGNORE), None)
+    rules = rules or settings_rules()
+    if gitignore and rules.use_gitignore:
+        rules = rules.with_gitignore(run_git(['cat-file', 'blob', gitignore], cwd=mirror))
+    kept, ignored, pruned = filter_paths(entries, rules)
+    python = [oid for path, oid in kept if path.endswith(ANALYZED_SUFFIX)]
+    ignored = [oid for path, oid in ignored if path.endswith(ANALYZED_SUFFIX)]
+
+    settings = get_settings().repository_analysis
+    check_files(len(python), 0, settings.max_repo_files, 0)  # Before downloading anything
+    known = lookup_files(file_cache, python, settings.similarity)
+    wanted = [oid for oid in python if oid not in known]
+    missing = missing_blobs(mirror, sha)
+    prefetch_blobs(mirror, sha, wanted, missing)
+    check_files(len(wanted), max(blob_sizes(mirror, wanted), default=0), 0, settings.max_file_bytes)
+    with CatFileBatch(mirror) as batch:
+        blobs = [(oid, batch.read(oid)) for oid in wanted]
+    skipped = {'skipped_dirs': len(pruned), 'skipped_files': len(ignored),
+               'skipped_bytes': sum(blob_sizes(mirror, [oid for oid in ignored if oid not in missing]))}
+    cached = [known[oid] for oid in python if oid in known]
+    return [(oid, data) for oid, data in blobs if data is not None], skipped, cached
+
+
+def blob_sizes(mirror: Path, oids: list) -> list:
+    """Sizes of blobs present in the mirror (git cat-file --batch-check; "<oid> missing" entries are left out)"""
+    if not oids:
+        return []
+    sizes = run_git(['cat-file', '--batch-check=%(objectsize)'], cwd=mirror, stdin=''.join(f"{oid}\n" for oid in oids))
+    return [int(size) for size in sizes.splitlines() if size.isdigit()]
+
+
+def count_blob_metrics(blobs: list, cached: list = (), signatures: bool = False) -> dict:
+    """
+    Metrics of (blob SHA, bytes) pairs plus already known per-file metrics
+
+    Pure, so it can run in a worker process; the new per-file metrics are
+    returned under FILE_METRICS_KEY for the file cache, and with
+    signatures the submission's MinHash signature under SIGNATURE_KEY.
+    """
+    counted = [(oid, _file_metrics(data, signatures)) for oid, data in blobs]
+    files = [*cached, *(entry for _, entry in counted)]
+    lines = [entry['lines'] for entry in files]
+    metrics = {'total_lines': sum(lines), 'compliant_lines': sum(n for n in lines if n <= LINE_LIMIT),
+               'file_count': len(files), FILE_METRICS_KEY: counted}
+    if signatures:
+        metrics[SIGNATURE_KEY] = merge_signatures(entry.get(SIGNATURE_KEY) for entry in files)
+    return metrics
+
+
+def _file_metrics(data: bytes, signatures: bool) -> dict:
+    entry = {'lines': count_bytes_lines(data)}
+    if signatures:
+        entry[SIGNATURE_KEY] = file_signature(data)
+    return entry
+
+
+def list_blobs(mirror: Path, sha: str) -> list:
+    """(blob oid, path) of every regular file in the commit's tree"""
+    blobs = []
+    for entry in run_git(['ls-tree', '-r', '-z', sha], cwd=mirror).split('\0'):
+        if not entry:
+            continue
+        meta, path = entry.split('\t', 1)
+        mode, kind, oid = meta.split()
+        if kind == 'blob' and mode in BLOB_MODES:
+            blobs.append((oid, path))
+    return blobs
+
+
+def missing_blobs(mirror: Path, sha: str) -> set:
+    """Objects of the commit a partial clone has not downloaded"""
+    listing = run_git(['rev-list', '--objects', '--missing=print', sha], cwd=mirror)
+    return {line[1:] for line in listing.splitlines() if line.startswith('?')}
+
+
+def prefetch_blobs(mirror: Path, sha: str, oids: list, missing: set = None) -> int:
+    """
+    Fetch the blobs a partial clone is missing in one request
+
+    Without this, cat-file would fetch each missing blob on its own.
+
+    Returns:
+        int: Number of blobs fetched (0 for a full mirror)
+    """
+    missing = missing_blobs(mirror, sha) if missing is None else missing
+    wanted = [oid for oid in dict.fromkeys(oids) if oid in missing]
+    if wanted:
+        run_git(['-c', 'fetch.negotiationAlgorithm=noop', 'fetch', '--quiet', '--no-tags',
+                 '--no-write-fetch-head', '--recurse-submodules=no', '--filter=blob:none', '--stdin', 'origin'],
+                cwd=mirror, stdin='\n'.join(wanted) + '\n')
+    return len(wanted)
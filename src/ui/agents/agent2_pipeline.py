@@ -0,0 +1,147 @@
+"""
+Agent 2 Analysis Pipeline
+
+Analyzes the Ready rows of Excel1 in two stages joined by a bounded
+queue: a thread pool sized for network concurrency clones/fetches and
+reads each submission (agent2_stages.prepare_submission), and a process
+pool counts lines (count_submission), so slow clones never hold up the
+CPU work and large repositories are not serialized behind the GIL. A
+full queue blocks the clone stage (backpressure). Cached results for
+unchanged HEADs skip both stages, files with cached metrics are not
+read (agent2_file_cache), and a repository submitted by several
+emails is analyzed once (agent2_submissions). If counting fails, e.g.
+a worker process dies, the affected rows fail instead of the run, and
+clone threads blocked on the queue are released. Shared by the modular
+executor and the legacy runner.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from .agent2_file_cache import close_file_cache, open_file_cache, store_file_metrics
+from .agent2_repo_analyzer import build_result, failed_result
+from .agent2_result_cache import lookup_result, open_result_cache, store_result
+from .agent2_stages import count_submission, prepare_submission
+from .agent2_stats import record_pipeline, record_stage
+from .agent2_submissions import share_result, submission_key
+from ...utils.config import get_settings
+
+# How often a clone thread blocked on a full queue checks for an aborted run
+PUT_POLL_SECONDS = 0.5
+
+
+def run_analysis(ready_rows: list, max_workers: int = None, count_workers: int = None) -> list:
+    """
+    Analyze repositories through the clone and count stages
+
+    Args:
+        ready_rows: dicts with email_id and github_url
+        max_workers: Clone threads (default repository_analysis.max_workers)
+        count_workers: Counting processes (default count_workers, 0 = CPU count)
+
+    Returns:
+        list: Analysis results in completion order
+    """
+    groups = {}  # Rows submitting the same repository are analyzed once
+    for row in ready_rows:
+        groups.setdefault(submission_key(row), []).append(row)
+    leaders = [rows[0] for rows in groups.values()]
+    settings = get_settings().repository_analysis
+    clone_workers = max_workers or settings.max_workers
+    count_workers = count_workers or settings.count_workers or os.cpu_count() or 1
+    cache = open_result_cache(settings.result_cache_max_entries) if settings.result_cache else None
+    files = open_file_cache(settings.file_cache_max_entries) if settings.file_cache else None
+    jobs = queue.Queue(maxsize=max(1, settings.pipeline_queue_size))
+    slots = threading.Semaphore(count_workers)  # Submissions counting at once
+    abort = threading.Event()
+    results, counting = [], {}
+    start = time.perf_counter()
+    try:
+        # spawn: forking while clone threads run can copy held locks
+        with ThreadPoolExecutor(clone_workers) as clones, ProcessPoolExecutor(
+                count_workers, mp_context=multiprocessing.get_context('spawn')) as counters:
+            try:
+                for row in leaders:
+                    clones.submit(_clone_stage, row, cache, files, jobs, abort)
+                for _ in leaders:
+                    row, prepared = jobs.get()
+                    if isinstance(prepared, dict):
+                        results.append(prepared)  # Cache hit or clone failure
+                        continue
+                    try:
+                        future = _submit_count(counters, slots, prepared, settings.similarity)
+                    except Exception as e:  # BrokenProcessPool once a worker has died
+                        results.append(failed_result(row['email_id'], row['github_url'], e))
+                        continue
+                    counting[future] = (row, prepared[2])
+                for future in as_completed(counting):
+                    results.append(_finish(future, *counting[future], cache, files))
+            finally:
+                # Unblock clone threads waiting on a full queue, so the pools can shut down
+                abort.set()
+                clones.shutdown(wait=False, cancel_futures=True)
+    finally:
+        record_pipeline(time.perf_counter() - start, clone_workers, count_workers)
+        close_file_cache(files)
+        if cache is not None:
+            cache.close()
+    return [shared for result in results for shared in share_result(result, groups[submission_key(result)])]
+
+
+def _submit_count(counters: ProcessPoolExecutor, slots: threading.Semaphore, prepared: tuple, signatures: bool):
+    """Start counting a prepared submission once a counting slot is free"""
+    kind, payload, _ = prepared
+    slots.acquire()
+    try:
+        future = counters.submit(_count_stage, kind, payload, signatures)
+    except Exception:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    return future
+
+
+def _clone_stage(row: dict, cache, files, jobs: queue.Queue, abort: threading.Event):
+    """Thread: cached result, or fetch the submission for counting; always queues one item"""
+    start = time.perf_counter()
+    try:
+        prepared = lookup_result(row['email_id'], row['github_url'], cache)
+        if prepared is None:
+            prepared = prepare_submission(row['email_id'], row['github_url'], files)
+    except Exception as e:
+        prepared = failed_result(row['email_id'], row['github_url'], e)
+    waited = time.perf_counter()
+    record_stage('clone_busy', waited - start)
+    while not abort.is_set():
+        try:
+            jobs.put((row, prepared), timeout=PUT_POLL_SECONDS)
+            break
+        except queue.Full:
+            continue
+    record_stage('queue_wait', time.perf_counter() - waited)
+
+
+def _count_stage(kind: str, payload, signatures: bool) -> tuple:
+    """Worker process: (metrics, busy seconds)"""
+    start = time.perf_counter()
+    metrics = count_submission(kind, payload, signatures)
+    return metrics, time.perf_counter() - start
+
+
+def _finish(future, row: dict, sha: str, cache, files) -> dict:
+    try:
+        metrics, seconds = future.result()
+    except Exception as e:
+        return failed_result(row['email_id'], row['github_url'], e)
+    record_stage('count_busy', seconds)
+    store_file_metrics(files, metrics)
+    result = build_result(row['email_id'], row['github_url'], metrics, sha)
+    store_result(cache, row['github_url'], result)
+    return result
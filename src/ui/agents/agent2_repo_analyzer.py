@@ -1,108 +1,85 @@
 """
 Agent 2 Repository Analyzer
 
-Clones and analyzes GitHub repositories for code quality metrics.
+Clones and analyzes GitHub repositories for code quality metrics. The
+work itself is done by the I/O and CPU stages in agent2_stages; this
+module grades the metrics and turns failures into Excel2 statuses.
 
 Author: Hadar Wayn
 Date: December 2025
 """
 
 import git
-import shutil
-from pathlib import Path
+import zipfile
 from rich.console import Console
 
+from .agent2_budget import RepoTimeoutError, RepoTooLargeError
+from .agent2_ignore import SKIPPED_KEYS
+from .agent2_minhash import SIGNATURE_KEY
+from .agent2_stages import count_submission, prepare_submission
+from .agent2_zip_analyzer import ZipTooLargeError
+
 console = Console()
 
 
 def analyze_repository(email_id: str, github_url: str) -> dict:
     """
-    Clone and analyze a single GitHub repository
+    Clone and analyze a single GitHub repository (or zipped submission)
 
     Args:
         email_id: Unique email identifier
-        github_url: GitHub repository URL
+        github_url: GitHub repository URL, or "attachment:<filename>"
 
     Returns:
-        dict: Analysis results with metrics
+        dict: Analysis results with metrics (and the analyzed commit_sha)
     """
     try:
-        # Create unique temporary directory for this repo
-        repo_dir = Path(f"temp/repos/{email_id[:8]}")
-
-        # Remove directory if it already exists
-        if repo_dir.exists():
-            shutil.rmtree(repo_dir)
-
-        # Clone repository (depth=1 for speed - only latest commit)
-        console.print(f"[*] Cloning {github_url[:60]}...")
-        git.Repo.clone_from(github_url, repo_dir, depth=1)
-
-        # Analyze Python files
-        metrics = _analyze_python_files(repo_dir)
+        kind, payload, sha = prepare_submission(email_id, github_url)
+        return build_result(email_id, github_url, count_submission(kind, payload), sha)
+    except Exception as e:
+        return failed_result(email_id, github_url, e)
 
-        # Calculate grade based on 150-line compliance
-        grade = _calculate_grade(metrics['total_lines'], metrics['compliant_lines'])
 
-        console.print(f"  [+] {email_id[:8]} - Files: {metrics['file_count']}, Grade: {grade}%")
+def build_result(email_id: str, github_url: str, metrics: dict, sha: str = None) -> dict:
+    """Excel2 row for analyzed metrics, graded on 150-line compliance"""
+    grade = _calculate_grade(metrics['total_lines'], metrics['compliant_lines'])
+    skipped = {key: metrics.get(key, 0) for key in SKIPPED_KEYS}
+    ignored = (f", Ignored: {skipped['skipped_dirs']} dirs, {skipped['skipped_files']} files "
+               f"({skipped['skipped_bytes'] / 1024:.1f} KB)") if any(skipped.values()) else ""
+    console.print(f"  [+] {email_id[:8]} - Files: {metrics['file_count']}, Grade: {grade}%{ignored}")
+    return {
+        'email_id': email_id,
+        'github_url': github_url,
+        'total_files': metrics['file_count'],
+        'total_lines': metrics['total_lines'],
+        'compliant_lines': metrics['compliant_lines'],
+        'grade': grade,
+        'status': 'Ready',
+        'commit_sha': sha,
+        **skipped,
+        **({SIGNATURE_KEY: metrics[SIGNATURE_KEY]} if SIGNATURE_KEY in metrics else {})
+    }
 
-        return {
-            'email_id': email_id,
-            'github_url': github_url,
-            'total_files': metrics['file_count'],
-            'total_lines': metrics['total_lines'],
-            'compliant_lines': metrics['compliant_lines'],
-            'grade': grade,
-            'status': 'Ready'
-        }
 
-    except git.GitCommandError as e:
+def failed_result(email_id: str, github_url: str, error: Exception) -> dict:
+    """Excel2 row for a submission whose analysis raised error"""
+    if isinstance(error, ZipTooLargeError):
+        console.print(f"  [!] {email_id[:8]} - Zip too large: {error}")
+        return _create_error_result(email_id, github_url, 'Failed: zip too large')
+    if isinstance(error, zipfile.BadZipFile):
+        console.print(f"  [!] {email_id[:8]} - Invalid zip file")
+        return _create_error_result(email_id, github_url, 'Failed: bad zip')
+    if isinstance(error, RepoTimeoutError):
+        console.print(f"  [!] {email_id[:8]} - Timed out: {error}")
+        return _create_error_result(email_id, github_url, 'Failed: timeout')
+    if isinstance(error, RepoTooLargeError):
+        console.print(f"  [!] {email_id[:8]} - Too large: {error}")
+        return _create_error_result(email_id, github_url, 'Failed: too_large')
+    if isinstance(error, git.GitCommandError):
         console.print(f"  [!] {email_id[:8]} - Clone failed")
         return _create_error_result(email_id, github_url, 'Failed: clone')
-
-    except Exception as e:
-        console.print(f"  [!] {email_id[:8]} - Error: {str(e)[:50]}")
-        return _create_error_result(email_id, github_url, f'Failed: {str(e)[:50]}')
-
-
-def _analyze_python_files(repo_dir: Path) -> dict:
-    """
-    Analyze all Python files in repository
-
-    Args:
-        repo_dir: Repository directory path
-
-    Returns:
-        dict: Metrics with total_lines, compliant_lines, file_count
-    """
-    # Find all Python files recursively
-    python_files = list(repo_dir.rglob("*.py"))
-
-    total_lines = 0
-    compliant_lines = 0
-    file_count = 0
-
-    for py_file in python_files:
-        try:
-            with open(py_file, 'r', encoding='utf-8') as f:
-                lines = len(f.readlines())
-                total_lines += lines
-
-                # Compliant files have <= 150 lines per PROJECT_GUIDELINES.md
-                if lines <= 150:
-                    compliant_lines += lines
-
-                file_count += 1
-
-        except Exception:
-            # Skip files that can't be read (binary files, encoding issues, etc.)
-            continue
-
-    return {
-        'total_lines': total_lines,
-        'compliant_lines': compliant_lines,
-        'file_count': file_count
-    }
+    console.print(f"  [!] {email_id[:8]} - Error: {str(error)[:50]}")
+    return _create_error_result(email_id, github_url, f'Failed: {str(error)[:50]}')
 
 
 def _calculate_grade(total_lines: int, compliant_lines: int) -> float:
@@ -0,0 +1,149 @@
+"""
+Agent 2 Repository Mirror Cache
+
+One bare mirror per canonical GitHub URL under temp/repos/mirrors. A
+re-run shallow-fetches the default branch into the existing object store
+and checks it out into the submission's working directory, so regrading
+a class does not download every repository again. LRU mirrors are evicted
+beyond a disk budget; bytes and time per clone go to agent2_stats (lean mode: agent2_git).
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import os
+import re
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from rich.console import Console
+
+from .agent2_budget import RepoTimeoutError, RepoTooLargeError, dir_size, watch_mirror
+from .agent2_stats import record_transfer
+from .agent2_git import canonical_repo_url, checkout_commit, clone_mirror, fetch_mirror_head, is_mirror, run_git
+from ...utils.config import get_settings
+from ...utils.hash_utils import hash_string
+from ...utils.paths import get_repos_dir
+
+console = Console()
+
+MIRRORS_DIR = "mirrors"
+MIRROR_REF = "refs/grader/head"  # Keeps the last fetched commit alive
+SIZE_FILE = "grader-size"  # Mirror bytes, measured after each fetch
+
+_guard = threading.Lock()
+_mirror_locks = {}
+_in_use = {}
+
+
+def mirror_dir(url: str) -> Path:
+    """Bare mirror directory of a repository"""
+    canonical = canonical_repo_url(url)
+    slug = re.sub(r'[^\w.-]+', '_', canonical.split('://')[-1])[-60:]
+    return get_repos_dir() / MIRRORS_DIR / f"{slug}-{hash_string(canonical)[:8]}.git"
+
+
+def open_repository(email_id: str, github_url: str, use) -> tuple:
+    """
+    Fetch the latest default-branch commit and run use(mirror, sha) on it
+
+    The mirror stays locked while use runs (a lean mirror downloads the
+    blobs use reads, which counts toward the transfer). Without
+    repository_analysis.repo_cache the mirror is a throwaway bare clone.
+
+    Returns:
+        tuple: (use's result, commit SHA)
+    """
+    settings = get_settings().repository_analysis
+    lean = settings.clone_mode == 'lean'
+    mirror = mirror_dir(github_url) if settings.repo_cache else get_repos_dir() / f"{email_id[:8]}.git"
+    if not settings.repo_cache:
+        shutil.rmtree(mirror, ignore_errors=True)
+
+    with _using_mirror(mirror):
+        start = time.perf_counter()
+        before = _mirror_size(mirror) if settings.repo_cache and mirror.exists() else 0
+        watch_mirror(mirror, before)
+        try:
+            sha = fetch_mirror(mirror, canonical_repo_url(github_url), lean)
+            result = use(mirror, sha)
+        except (RepoTimeoutError, RepoTooLargeError):
+            shutil.rmtree(mirror, ignore_errors=True)  # Partial download of an over-budget repository
+            raise
+        size = dir_size(mirror)
+        record_transfer(email_id, size - before, time.perf_counter() - start, lean)
+        if settings.repo_cache:
+            (mirror / SIZE_FILE).write_text(str(size), encoding='utf-8')
+            os.utime(mirror)  # Directory mtime is the LRU timestamp
+        else:
+            shutil.rmtree(mirror, ignore_errors=True)
+    evict_mirrors(settings.repo_cache_bytes if settings.repo_cache else 0)
+    return result, sha
+
+
+def checkout_repository(email_id: str, github_url: str) -> tuple:
+    """Check out the latest commit into temp/repos/<id8> (only clone_globs files in lean
+    clone_mode); returns (working directory, commit SHA)"""
+    settings = get_settings().repository_analysis
+    globs = None
+    if settings.clone_mode == 'lean':
+        globs = settings.clone_globs + (['/.gitignore'] if settings.use_gitignore else [])
+    repo_dir = get_repos_dir() / email_id[:8]
+    shutil.rmtree(repo_dir, ignore_errors=True)
+    return open_repository(email_id, github_url,
+                           lambda mirror, sha: checkout_commit(mirror, sha, repo_dir, globs) or repo_dir)
+
+
+def fetch_mirror(mirror: Path, url: str, lean: bool = True) -> str:
+    """Shallow-fetch the remote default branch into the mirror (cloning it if needed); returns its SHA"""
+    if is_mirror(mirror):
+        console.print(f"[*] Updating {url[:60]}...")
+        sha = fetch_mirror_head(mirror)
+    else:
+        shutil.rmtree(mirror, ignore_errors=True)  # Leftover of an interrupted clone
+        console.print(f"[*] Cloning {url[:60]}{' (lean)' if lean else ''}...")
+        sha = clone_mirror(url, mirror, lean)
+    run_git(['update-ref', MIRROR_REF, sha], cwd=mirror)
+    return sha
+
+
+def evict_mirrors(budget_bytes: int) -> int:
+    """Delete least recently used mirrors not in use until the cache fits; returns the count"""
+    root = get_repos_dir() / MIRRORS_DIR
+    if not budget_bytes or budget_bytes <= 0 or not root.exists():
+        return 0
+    evicted = total = 0
+    with _guard:
+        mirrors = sorted((p for p in root.iterdir() if p.is_dir()), key=lambda p: p.stat().st_mtime, reverse=True)
+        for mirror in mirrors:
+            total += _mirror_size(mirror)
+            if total > budget_bytes and not _in_use.get(mirror):
+                shutil.rmtree(mirror, ignore_errors=True)
+                evicted += 1
+    if evicted:
+        console.print(f"[*] Repository cache: evicted {evicted} least recently used mirrors")
+    return evicted
+
+
+@contextmanager
+def _using_mirror(mirror: Path):
+    """Serialize work on one mirror and protect it from eviction meanwhile"""
+    with _guard:
+        lock = _mirror_locks.setdefault(mirror, threading.Lock())
+        _in_use[mirror] = _in_use.get(mirror, 0) + 1
+    try:
+        with lock:
+            yield
+    finally:
+        with _guard:
+            _in_use[mirror] -= 1
+
+
+def _mirror_size(mirror: Path) -> int:
+    try:
+        return int((mirror / SIZE_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return dir_size(mirror)
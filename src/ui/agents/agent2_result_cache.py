@@ -0,0 +1,93 @@
+"""
+Agent 2 Result Cache
+
+A repository's metrics only change when its HEAD commit or the grading
+configuration changes. This module resolves the remote HEAD with a cheap
+git ls-remote and keeps analysis results in a SQLite cache keyed by
+(canonical URL, commit SHA, grading config hash), so an unchanged
+repository is graded without fetching or checking anything out.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import json
+
+from rich.console import Console
+
+from .agent1_attachments import is_attachment_url
+from .agent2_git import canonical_repo_url, ls_remote_head
+from .agent2_line_counter import LINE_LIMIT
+from .agent2_minhash import SIGNATURE_KEY
+from ...utils.config import get_settings
+from ...utils.hash_utils import hash_string
+from ...utils.paths import get_cache_dir
+from ...utils.sqlite_cache import SQLiteCache
+
+console = Console()
+
+CACHE_FILE = "agent2_results.sqlite"
+
+# Bump when Agent 2 changes how metrics are computed
+ANALYZER_VERSION = 2  # 2: files that are not valid UTF-8 are counted
+
+# Result keys that belong to the submission, not to the repository state
+SUBMISSION_KEYS = ('email_id', 'github_url')
+
+
+def open_result_cache(max_entries: int = 20000) -> SQLiteCache:
+    """Open the analysis result cache (caller should close() it)"""
+    return SQLiteCache(get_cache_dir() / CACHE_FILE, max_entries=max_entries, table="results")
+
+
+def grading_config_hash() -> str:
+    """
+    Hash of every input that changes Agent 2 metrics
+
+    The counters use the fixed LINE_LIMIT, not the line_limit settings. A
+    lean checkout only writes the clone_globs files, so those count too;
+    analysis_mode: objects reads every .py blob whatever the clone settings.
+    """
+    settings = get_settings().repository_analysis
+    sparse = settings.analysis_mode == 'checkout' and settings.clone_mode == 'lean'
+    config = {
+        'analyzer_version': ANALYZER_VERSION,
+        'line_limit': LINE_LIMIT,
+        'checkout_globs': settings.clone_globs if sparse else None,
+        'ignore_globs': settings.ignore_globs,
+        'use_gitignore': settings.use_gitignore,
+    }
+    return hash_string(json.dumps(config, sort_keys=True))[:16]
+
+
+def remote_head_sha(github_url: str, timeout: int = None) -> str:
+    """Commit SHA of the remote HEAD via git ls-remote (None if it cannot be resolved)"""
+    return ls_remote_head(canonical_repo_url(github_url), timeout)
+
+
+def result_cache_key(github_url: str, sha: str) -> str:
+    return f"{canonical_repo_url(github_url)}|{sha}|{grading_config_hash()}"
+
+
+def lookup_result(email_id: str, github_url: str, cache: SQLiteCache = None) -> dict:
+    """
+    Cached result for the repository's current HEAD (None on a miss, for zips
+    or without a cache; with similarity on, also when it has no MinHash signature)
+    """
+    if cache is None or is_attachment_url(github_url):
+        return None
+    settings = get_settings().repository_analysis
+    sha = remote_head_sha(github_url, settings.clone_timeout)
+    cached = cache.get(result_cache_key(github_url, sha)) if sha else None
+    if cached is None or (settings.similarity and SIGNATURE_KEY not in cached):
+        return None
+    console.print(f"  [+] {email_id[:8]} - Unchanged at {sha[:7]}, cached grade: {cached['grade']}%")
+    return {**cached, 'email_id': email_id, 'github_url': github_url, 'cached': True}
+
+
+def store_result(cache: SQLiteCache, github_url: str, result: dict):
+    """Cache a Ready result under the commit actually analyzed (HEAD may have moved since ls-remote)"""
+    if cache is None or result['status'] != 'Ready' or not result.get('commit_sha'):
+        return
+    entry = {key: value for key, value in result.items() if key not in SUBMISSION_KEYS}
+    cache.set(result_cache_key(github_url, result['commit_sha']), entry)
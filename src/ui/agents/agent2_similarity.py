@@ -0,0 +1,111 @@
+"""
+Agent 2 Near-Duplicate Detection
+
+Flags submissions whose Python code is nearly identical, without
+comparing every pair: each submission's MinHash signature
+(agent2_minhash, computed by the count stage) is split into LSH bands,
+and only submissions sharing a band bucket are compared. The index is a
+persistent SQLite cache, so a submission is also compared with earlier
+runs and other homeworks. Pairs at or above
+repository_analysis.similarity_threshold (estimated Jaccard similarity
+of the code shingles) are written to a second sheet of Excel2.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import openpyxl
+
+from .agent2_minhash import SIGNATURE_KEY, band_keys, estimate_jaccard
+from .agent2_submissions import submission_key
+from .excel_utils import auto_adjust_columns
+from ...utils.config import get_settings
+from ...utils.paths import get_cache_dir
+from ...utils.sqlite_cache import SQLiteCache
+
+CACHE_FILE = "agent2_similarity.sqlite"
+SHEET_TITLE = "Similar Submissions"
+SHEET_HEADERS = ["email_id", "github_url", "similar_email_id", "similar_github_url", "jaccard"]
+
+# Most recent submissions kept per LSH bucket, so a bucket every fork of
+# the course template falls into cannot make the comparisons quadratic
+MAX_BUCKET = 500
+
+
+def open_similarity_index(max_entries: int = 100000) -> SQLiteCache:
+    """Open the persistent LSH index (caller should close() it)"""
+    return SQLiteCache(get_cache_dir() / CACHE_FILE, max_entries=max_entries, table="lsh")
+
+
+def find_similar(results: list, index: SQLiteCache = None) -> list:
+    """
+    Index the results' signatures and report near-duplicate pairs
+
+    Args:
+        results: Analysis results (rows without a signature are skipped)
+        index: Open LSH index (default: the persistent one in the cache directory)
+
+    Returns:
+        list: Pair dicts (SHEET_HEADERS keys), most similar first (empty when similarity is off)
+    """
+    settings = get_settings().repository_analysis
+    if not settings.similarity:
+        return []
+    owned = index is None
+    index = open_similarity_index(settings.similarity_index_max_entries) if owned else index
+    pairs, indexed = [], set()
+    try:
+        for result in results:
+            key = submission_key(result)
+            if result.get(SIGNATURE_KEY) and key not in indexed:  # Rows sharing a repository are indexed once
+                indexed.add(key)
+                pairs.extend(_match_and_add(index, key, result, settings.similarity_threshold))
+    finally:
+        if owned:
+            index.close()
+    return sorted(pairs, key=lambda pair: -pair['jaccard'])
+
+
+def _match_and_add(index: SQLiteCache, key: str, result: dict, threshold: float) -> list:
+    """Pairs of one submission with the indexed ones sharing a bucket, then add it to the index"""
+    signature = result[SIGNATURE_KEY]
+    bands = band_keys(signature)
+    buckets = index.get_many(bands)
+    candidates = {member for members in buckets.values() for member in members if member != key}
+    entries = index.get_many(_entry_key(member) for member in candidates)
+
+    pairs = []
+    for entry in entries.values():
+        jaccard = estimate_jaccard(signature, entry['signature'])
+        if jaccard >= threshold:
+            pairs.append({'email_id': result['email_id'], 'github_url': result['github_url'],
+                          'similar_email_id': entry['email_id'], 'similar_github_url': entry['github_url'],
+                          'jaccard': round(jaccard, 3)})
+
+    index.set(_entry_key(key), {'email_id': result['email_id'], 'github_url': result['github_url'],
+                                'signature': signature})
+    recent = {band: [member for member in buckets.get(band, []) if member != key] for band in bands}
+    index.set_many({band: members[-(MAX_BUCKET - 1):] + [key] for band, members in recent.items()})
+    return pairs
+
+
+def _entry_key(key: str) -> str:
+    return f"{SIGNATURE_KEY}:submission:{key}"
+
+
+def add_similarity_sheet(wb, pairs: list):
+    """Append the near-duplicate pairs as a sheet of an Excel2 workbook"""
+    ws = wb.create_sheet(SHEET_TITLE)
+    ws.append(SHEET_HEADERS)
+    for cell in ws[1]:
+        cell.font = openpyxl.styles.Font(bold=True)
+    for pair in pairs:
+        ws.append([pair[header] for header in SHEET_HEADERS])
+    auto_adjust_columns(ws)
+
+
+def similarity_summary(results: list, pairs: list) -> str:
+    """'Near-duplicates: ...' line for the analysis summary"""
+    signed = len({submission_key(r) for r in results if r.get(SIGNATURE_KEY)})
+    threshold = get_settings().repository_analysis.similarity_threshold
+    return f"Near-duplicates: {len(pairs)} pairs at >= {threshold:.0%} estimated Jaccard among {signed} submissions"
@@ -0,0 +1,123 @@
+"""
+Agent 2 Analysis Stages
+
+Analysis of one submission in two halves, so the pipeline can run them
+on different executors: prepare_submission does the I/O (clone or fetch
+through the mirror cache, reading .py blobs from the object database or
+checking files out, reading a stored zip) and count_submission does the
+CPU work (line counting, MinHash signatures) on a picklable payload in
+a worker process.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+from functools import partial
+from pathlib import Path
+
+from rich.console import Console
+
+from .agent1_attachments import is_attachment_url
+from .agent2_budget import check_files, repo_budget
+from .agent2_ignore import GITIGNORE, IgnoreRules, settings_rules, walk_files
+from .agent2_line_counter import LINE_LIMIT, count_file_lines
+from .agent2_minhash import SIGNATURE_KEY, file_signature, merge_signatures
+from .agent2_object_db import count_blob_metrics, read_python_blobs
+from .agent2_repo_cache import checkout_repository, open_repository
+from .agent2_zip_analyzer import analyze_zip_bytes, read_zip_submission
+from ...utils.config import get_settings
+from ...utils.sqlite_cache import SQLiteCache
+
+console = Console()
+
+
+def prepare_submission(email_id: str, github_url: str, file_cache: SQLiteCache = None) -> tuple:
+    """
+    I/O stage: fetch what count_submission needs (network, git, disk), with
+    every git process inside the repository's time and download budget;
+    files found in file_cache (agent2_file_cache) are not fetched
+
+    Returns:
+        tuple: (kind, picklable payload, commit SHA or None)
+    """
+    settings = get_settings().repository_analysis
+    rules = settings_rules()
+    if is_attachment_url(github_url):
+        console.print(f"[*] Reading {github_url[:60]}...")
+        data = read_zip_submission(email_id)
+        return 'zip', (data, settings.max_zip_bytes, settings.max_zip_entries, rules), None
+    with repo_budget(settings.clone_timeout, settings.max_repo_bytes):
+        if settings.analysis_mode == 'objects':
+            read = partial(read_python_blobs, rules=rules, file_cache=file_cache)
+            blobs, sha = open_repository(email_id, github_url, read)
+            return 'blobs', blobs, sha
+        repo_dir, sha = checkout_repository(email_id, github_url)
+    return 'files', (str(repo_dir), rules, (settings.max_repo_files, settings.max_file_bytes)), sha
+
+
+def count_submission(kind: str, payload, signatures: bool = False) -> dict:
+    """CPU stage: metrics (plus the MinHash signature) from prepare_submission's payload, in a worker process"""
+    if kind == 'zip':
+        return analyze_zip_bytes(*payload, signatures=signatures)
+    if kind == 'blobs':
+        blobs, skipped, cached = payload
+        return {**count_blob_metrics(blobs, cached, signatures), **skipped}
+    repo_dir, rules, limits = payload
+    return analyze_python_files(Path(repo_dir), rules, limits, signatures)
+
+
+def analyze_python_files(repo_dir: Path, rules: IgnoreRules = None, limits: tuple = (0, 0),
+                         signatures: bool = False) -> dict:
+    """
+    Analyze all Python files in repository
+
+    Args:
+        repo_dir: Repository directory path
+        rules: Ignore rules (default settings.yaml), extended by the root .gitignore
+        limits: (max_repo_files, max_file_bytes), 0 = no limit
+        signatures: Also return the files' merged MinHash signature under SIGNATURE_KEY
+
+    Returns:
+        dict: Metrics with total_lines, compliant_lines, file_count and skipped_*
+
+    Raises:
+        RepoTooLargeError: The files exceed limits
+    """
+    rules = rules or settings_rules()
+    gitignore = repo_dir / GITIGNORE
+    if rules.use_gitignore and gitignore.is_file():
+        rules = rules.with_gitignore(gitignore.read_text(encoding='utf-8', errors='replace'))
+    # Find all Python files, pruning ignored directories
+    python_files, skipped = walk_files(repo_dir, rules)
+    check_files(len(python_files), max((p.stat().st_size for p in python_files), default=0), *limits)
+
+    total_lines = 0
+    compliant_lines = 0
+    file_count = 0
+    found = []
+
+    for py_file in python_files:
+        try:
+            lines = count_file_lines(py_file)
+            if signatures:
+                found.append(file_signature(py_file.read_bytes()))
+        except OSError:
+            # Skip files that can't be read (broken symlinks, permissions)
+            continue
+        total_lines += lines
+
+        # Compliant files have <= 150 lines per PROJECT_GUIDELINES.md
+        if lines <= LINE_LIMIT:
+            compliant_lines += lines
+
+        file_count += 1
+
+    metrics = {
+        'total_lines': total_lines,
+        'compliant_lines': compliant_lines,
+        'file_count': file_count,
+        **skipped
+    }
+    if signatures:
+        metrics[SIGNATURE_KEY] = merge_signatures(found)
+    return metrics
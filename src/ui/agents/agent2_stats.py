@@ -0,0 +1,92 @@
+"""
+Agent 2 Run Statistics
+
+Process-wide clone transfer totals (bytes added to the mirrors and wall
+time per clone or fetch), so lean and full clone modes can be compared
+in the analysis summary, and the busy time of each analysis pipeline
+stage (agent2_pipeline), reported as utilisation of its workers, and the
+per-file metrics cache hit rate (agent2_file_cache).
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import threading
+
+from rich.console import Console
+
+console = Console()
+
+_lock = threading.Lock()
+_transfers = {'clones': 0, 'bytes': 0, 'seconds': 0.0}
+_STAGES_RESET = {'wall': 0.0, 'clone_workers': 0, 'clone_busy': 0.0, 'count_workers': 0, 'count_busy': 0.0,
+                 'queue_wait': 0.0}
+_stages = dict(_STAGES_RESET)
+_file_cache = {'hits': 0, 'misses': 0, 'entries': 0, 'max_entries': 0}
+
+
+def record_transfer(email_id: str, size: int, seconds: float, lean: bool):
+    """Report and count one clone or fetch"""
+    mode = 'Lean' if lean else 'Full'
+    console.print(f"  [*] {email_id[:8]} - {mode} clone: {size / 1048576:.2f} MB in {seconds:.2f}s")
+    with _lock:
+        _transfers['clones'] += 1
+        _transfers['bytes'] += size
+        _transfers['seconds'] += seconds
+
+
+def transfer_summary(reset: bool = False) -> str:
+    """'Clone transfer: ...' line for the analysis summary (reset starts the next run at zero)"""
+    with _lock:
+        stats = dict(_transfers)
+        if reset:
+            _transfers.update(clones=0, bytes=0, seconds=0.0)
+    return f"Clone transfer: {stats['clones']} repos, {stats['bytes'] / 1048576:.2f} MB in {stats['seconds']:.2f}s"
+
+
+def record_stage(key: str, seconds: float):
+    """Add busy (clone_busy, count_busy) or blocked (queue_wait) seconds to a pipeline stage"""
+    with _lock:
+        _stages[key] += seconds
+
+
+def record_pipeline(wall: float, clone_workers: int, count_workers: int):
+    """Record one pipeline run's wall time and stage sizes"""
+    with _lock:
+        _stages.update(wall=_stages['wall'] + wall, clone_workers=clone_workers, count_workers=count_workers)
+
+
+def stage_summary(reset: bool = False) -> str:
+    """'Pipeline: ...' line with each stage's utilisation (busy time / wall time x workers)"""
+    with _lock:
+        stats = dict(_stages)
+        if reset:
+            _stages.update(_STAGES_RESET)
+
+    def busy(stage: str) -> float:
+        capacity = stats['wall'] * stats[f'{stage}_workers']
+        return round(100 * stats[f'{stage}_busy'] / capacity, 1) if capacity else 0.0
+
+    return (f"Pipeline: clone stage {stats['clone_workers']} threads {busy('clone')}% busy, "
+            f"count stage {stats['count_workers']} processes {busy('count')}% busy, "
+            f"{stats['queue_wait']:.2f}s blocked on a full queue")
+
+
+def record_file_cache(stats: dict):
+    """Add one run's file cache lookups (SQLiteCache.stats())"""
+    with _lock:
+        _file_cache['hits'] += stats['hits']
+        _file_cache['misses'] += stats['misses']
+        _file_cache.update(entries=stats['entries'], max_entries=stats['max_entries'])
+
+
+def file_cache_summary(reset: bool = False) -> str:
+    """'File metrics cache: ...' line for the analysis summary"""
+    with _lock:
+        stats = dict(_file_cache)
+        if reset:
+            _file_cache.update(hits=0, misses=0, entries=0, max_entries=0)
+    lookups = stats['hits'] + stats['misses']
+    rate = round(100 * stats['hits'] / lookups, 1) if lookups else 0.0
+    return (f"File metrics cache hits: {stats['hits']}/{lookups} ({rate}%), "
+            f"{stats['entries']}/{stats['max_entries']} entries")
@@ -0,0 +1,50 @@
+"""
+Agent 2 Submission Identity
+
+Several emails can submit the same repository (resubmissions, partners,
+copies); the pipeline analyzes each repository once and hands its
+result to every row. Zipped submissions are always distinct.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+from rich.console import Console
+
+from .agent1_attachments import is_attachment_url
+from .agent2_git import canonical_repo_url
+
+console = Console()
+
+
+def submission_key(row: dict) -> str:
+    """A submission's identity: the canonical repository URL, or the email of a zip"""
+    url = row['github_url']
+    return row['email_id'] if is_attachment_url(url) else canonical_repo_url(url)
+
+
+def share_result(result: dict, rows: list) -> list:
+    """
+    The group leader's result, copied to the other rows of its repository
+
+    Copies are flagged 'shared', not 'cached': the result cache was not
+    consulted for them.
+    """
+    shared = [result]
+    for row in rows[1:]:
+        copy = {**result, 'email_id': row['email_id'], 'github_url': row['github_url']}
+        copy.pop('cached', None)
+        if result['status'] == 'Ready':
+            copy['shared'] = True
+            console.print(f"  [+] {row['email_id'][:8]} - Same repository as {result['email_id'][:8]}, "
+                          f"grade: {result['grade']}%")
+        shared.append(copy)
+    return shared
+
+
+def cache_summary(results: list) -> str:
+    """'Result cache hits: n/total' line for the analysis summary (plus rows sharing a repository)"""
+    hits = sum(1 for r in results if r.get('cached'))
+    shared = sum(1 for r in results if r.get('shared'))
+    rate = round(100 * hits / len(results), 1) if results else 0.0
+    return f"Result cache hits: {hits}/{len(results)} ({rate}%)" + (f", {shared} shared" if shared else "")
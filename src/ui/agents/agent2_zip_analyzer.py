@@ -0,0 +1,105 @@
+"""
+Agent 2 Zip Analyzer
+
+Analyzes a zipped submission (downloaded by agent1_attachments) without
+extracting it: .py files are streamed from the archive in memory and
+their lines counted (and MinHash-signed) like the cloned-repository
+analysis, with the same ignore rules. The declared uncompressed size and entry count are
+checked before anything is decompressed, so a zip bomb is rejected
+instead of read.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import io
+import zipfile
+
+from .agent1_attachments import attachment_path
+from .agent2_ignore import GITIGNORE, IgnoreRules, filter_paths, settings_rules
+from .agent2_line_counter import LINE_LIMIT, count_bytes_lines, count_stream_lines
+from .agent2_minhash import SIGNATURE_KEY, file_signature, merge_signatures
+
+# macOS archive metadata, not submitted code
+IGNORED_PREFIXES = ('__MACOSX/',)
+
+
+class ZipTooLargeError(Exception):
+    """Raised when a zip exceeds the uncompressed byte or entry budget"""
+
+
+def read_zip_submission(email_id: str) -> bytes:
+    """Raw bytes of a submission's stored zip (FileNotFoundError if never downloaded)"""
+    path = attachment_path(email_id)
+    if not path.exists():
+        raise FileNotFoundError("zip attachment missing")
+    return path.read_bytes()
+
+
+def analyze_zip_bytes(data: bytes, max_bytes: int, max_entries: int, rules: IgnoreRules = None,
+                      signatures: bool = False) -> dict:
+    """analyze_zip_archive on an in-memory zip (usable in a worker process)"""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return analyze_zip_archive(archive, max_bytes, max_entries, rules, signatures)
+
+
+def analyze_zip_archive(archive: zipfile.ZipFile, max_bytes: int, max_entries: int,
+                        rules: IgnoreRules = None, signatures: bool = False) -> dict:
+    """
+    Count lines of every .py file in an open archive (outside ignored paths)
+
+    Returns:
+        dict: Metrics with total_lines, compliant_lines, file_count and
+        skipped_* (and the MinHash signature under SIGNATURE_KEY with signatures)
+
+    Raises:
+        ZipTooLargeError: The archive has too many entries or its .py files
+            declare more than max_bytes uncompressed
+    """
+    entries = archive.infolist()
+    if len(entries) > max_entries:
+        raise ZipTooLargeError(f"{len(entries)} entries (limit {max_entries})")
+
+    rules = rules or settings_rules()
+    gitignore = next((info for info in entries if info.filename == GITIGNORE), None)
+    if gitignore is not None and rules.use_gitignore and gitignore.file_size <= max_bytes:
+        rules = rules.with_gitignore(archive.read(gitignore).decode('utf-8', errors='replace'))
+    files = [(info.filename, info) for info in entries
+             if not info.is_dir() and not info.filename.startswith(IGNORED_PREFIXES)]
+    kept, ignored, pruned = filter_paths(files, rules)
+    python_files = [info for name, info in kept if name.endswith('.py')]
+    ignored = [info for name, info in ignored if name.endswith('.py')]
+    # zipfile never yields more than an entry's declared file_size, so the
+    # declared sizes bound the bytes decompressed
+    declared = sum(info.file_size for info in python_files)
+    if declared > max_bytes:
+        raise ZipTooLargeError(f"{declared} uncompressed bytes (limit {max_bytes})")
+
+    total_lines = 0
+    compliant_lines = 0
+    file_count = 0
+    found = []
+    for info in python_files:
+        try:
+            with archive.open(info) as stream:
+                if signatures:
+                    data = stream.read()  # Bounded by max_bytes above
+                    lines = count_bytes_lines(data)
+                    found.append(file_signature(data))
+                else:
+                    lines = count_stream_lines(stream)
+        except (zipfile.BadZipFile, NotImplementedError, RuntimeError):
+            # Skip corrupt, unsupported or encrypted entries
+            continue
+        total_lines += lines
+        if lines <= LINE_LIMIT:
+            compliant_lines += lines
+        file_count += 1
+
+    metrics = {'total_lines': total_lines, 'compliant_lines': compliant_lines, 'file_count': file_count,
+               'skipped_dirs': len(pruned), 'skipped_files': len(ignored),
+               'skipped_bytes': sum(info.file_size for info in ignored)}
+    if signatures:
+        metrics[SIGNATURE_KEY] = merge_signatures(found)
+    return metrics
+
@@ -14,6 +14,7 @@ import base64
 from rich.console import Console
 
 from .gmail_auth import get_gmail_service
+from .gmail_labels import label_drafted
 from ...utils.paths import get_excel_file
 
 console = Console()
@@ -41,10 +42,11 @@ def execute_agent4() -> bool:
         email_metadata = _load_email_metadata(excel1_path)
         student_names = _load_student_mappings()
         service = get_gmail_service(console)
-        drafts_created, drafts_failed = _create_gmail_drafts(
+        drafted_ids, drafts_failed = _create_gmail_drafts(
             service, feedback_data, email_metadata, student_names
         )
-        _print_summary(drafts_created, drafts_failed)
+        label_drafted(service, drafted_ids)
+        _print_summary(len(drafted_ids), drafts_failed)
         return True
 
     except Exception as e:
@@ -70,7 +72,7 @@ def _load_email_metadata(excel1_path: Path) -> dict:
     ws = wb.active
     email_metadata = {}
     for row in ws.iter_rows(min_row=2, values_only=True):
-        email_id, received_time, subject, sender, github_url, thread_id, status = row
+        email_id, received_time, subject, sender, github_url, thread_id, status = row[:7]
         email_metadata[email_id] = {
             'sender': sender,
             'subject': subject,
@@ -97,9 +99,9 @@ def _load_student_mappings() -> dict:
     return student_names
 
 def _create_gmail_drafts(service, feedback_data: dict, email_metadata: dict, student_names: dict) -> tuple:
-    """Create Gmail drafts for all submissions"""
+    """Create Gmail drafts for all submissions; returns (drafted email_ids, failed count)"""
     console.print("[*] Creating Gmail drafts...\n")
-    drafts_created = 0
+    drafted_ids = []
     drafts_failed = 0
 
     for email_id, feedback in feedback_data.items():
@@ -126,12 +128,12 @@ def _create_gmail_drafts(service, feedback_data: dict, email_metadata: dict, stu
             draft = {'message': {'raw': raw_message, 'threadId': thread_id}}
             service.users().drafts().create(userId='me', body=draft).execute()
             console.print(f"  [+] Draft created for {student_name} ({sender_email})")
-            drafts_created += 1
+            drafted_ids.append(email_id)
         except Exception as e:
             console.print(f"  [!] Failed to create draft for {sender_email}: {str(e)[:50]}")
             drafts_failed += 1
 
-    return drafts_created, drafts_failed
+    return drafted_ids, drafts_failed
 
 def _print_summary(drafts_created: int, drafts_failed: int):
     """Print draft creation summary"""
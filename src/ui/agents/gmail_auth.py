@@ -1,44 +1,92 @@
 """
 Gmail Authentication Helper
 
-Provides shared Gmail API authentication for agents.
+Provides shared Gmail API authentication for agents. Credentials are
+loaded once per process and refreshed before they expire; services are
+built from a cached discovery document, one per thread (googleapiclient
+services are not thread-safe).
 
 Author: Hadar Wayn
 Date: December 2025
 """
 
+import json
+import threading
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build_from_document
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 
+from .gmail_discovery import get_discovery_document
+from ...utils.config import get_settings
+
 
 # Gmail API scopes
 GMAIL_SCOPES = [
     'https://www.googleapis.com/auth/gmail.readonly',
     'https://www.googleapis.com/auth/gmail.compose'
 ]
+# Only requested when processed submissions are labelled (label_work_queue),
+# so tokens granted before labelling existed keep working without re-consent
+MODIFY_SCOPE = 'https://www.googleapis.com/auth/gmail.modify'
+
+# Refresh the access token when it has less than this left
+REFRESH_MARGIN = timedelta(minutes=5)
+
+_credentials = None
+_lock = threading.Lock()
+_thread_local = threading.local()
 
 
 def get_gmail_service(console=None):
     """
-    Authenticate and return Gmail API service
+    Return this thread's authenticated Gmail API service
 
-    Args:
-        console: Optional Rich console for logging
-
-    Returns:
-        Gmail API service object
+    The first call in a process authenticates; later calls reuse the
+    in-memory credentials and this thread's service object.
 
     Raises:
         FileNotFoundError: If credentials.json not found
         Exception: If authentication fails
     """
-    if console:
-        console.print("[*] Authenticating with Gmail API...")
-
-    # Paths
+    creds = get_gmail_credentials(console)
+    service = getattr(_thread_local, 'service', None)
+    if service is None or _thread_local.credentials is not creds:
+        service = build_from_document(get_discovery_document(), credentials=creds)
+        _thread_local.service = service
+        _thread_local.credentials = creds
+    return service
+
+
+def get_gmail_credentials(console=None) -> Credentials:
+    """Return valid process-wide Gmail credentials, refreshing them proactively"""
+    global _credentials
+    with _lock:
+        if _credentials is None:
+            if console:
+                console.print("[*] Authenticating with Gmail API...")
+            _credentials = _load_credentials()
+            if console:
+                console.print("[+] Authentication successful\n")
+        elif _needs_refresh(_credentials):
+            _credentials.refresh(Request())
+            _save_token(_credentials)
+        return _credentials
+
+
+def reset_gmail_auth():
+    """Forget cached credentials and services (e.g. after changing scopes)"""
+    global _credentials
+    with _lock:
+        _credentials = None
+    _thread_local.__dict__.clear()
+
+
+def _load_credentials() -> Credentials:
+    """Load Secrets/token.json, refreshing or running the OAuth flow if needed"""
     token_path = Path('Secrets/token.json')
     credentials_path = Path('Secrets/credentials.json')
 
@@ -48,29 +96,52 @@ def get_gmail_service(console=None):
             "Please download credentials.json from Google Cloud Console"
         )
 
-    # Load existing credentials
+    # Load existing credentials (a token missing a scope means re-consent)
+    scopes = gmail_scopes()
     creds = None
-    if token_path.exists():
-        creds = Credentials.from_authorized_user_file(str(token_path), GMAIL_SCOPES)
+    if token_path.exists() and _has_scopes(token_path, scopes):
+        creds = Credentials.from_authorized_user_file(str(token_path), scopes)
 
     # Refresh or create new credentials
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
+    if not creds or _needs_refresh(creds):
+        if creds and creds.refresh_token:
             creds.refresh(Request())
         else:
-            flow = InstalledAppFlow.from_client_secrets_file(
-                str(credentials_path),
-                GMAIL_SCOPES
-            )
+            flow = InstalledAppFlow.from_client_secrets_file(str(credentials_path), scopes)
             creds = flow.run_local_server(port=0)
+        _save_token(creds)
+
+    return creds
 
-        # Save credentials
-        token_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(token_path, 'w') as token:
-            token.write(creds.to_json())
 
-    if console:
-        console.print("[+] Authentication successful\n")
+def _needs_refresh(creds: Credentials) -> bool:
+    """True if the token is invalid or expires within REFRESH_MARGIN"""
+    if not creds.valid:
+        return True
+    # google-auth stores expiry as a naive UTC datetime
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return creds.expiry is not None and creds.expiry - now < REFRESH_MARGIN
 
-    # Build and return service
-    return build('gmail', 'v1', credentials=creds)
+
+def gmail_scopes() -> list:
+    """Scopes the current settings need (gmail.modify only with label_work_queue)"""
+    if get_settings().email_extraction.label_work_queue:
+        return GMAIL_SCOPES + [MODIFY_SCOPE]
+    return list(GMAIL_SCOPES)
+
+
+def _has_scopes(token_path: Path, scopes: list) -> bool:
+    """False if the stored token is unreadable, corrupt or was granted fewer scopes"""
+    try:
+        data = json.loads(token_path.read_text(encoding='utf-8'))
+        granted = data.get('scopes') or scopes
+    except (OSError, ValueError, AttributeError):
+        return False  # Authorize again; the new token replaces the file
+    return set(scopes) <= set(granted)
+
+
+def _save_token(creds: Credentials):
+    token_path = Path('Secrets/token.json')
+    token_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(token_path, 'w') as token:
+        token.write(creds.to_json())
@@ -0,0 +1,130 @@
+"""
+Gmail Batch Fetch Helper
+
+Groups Gmail messages.get calls into batch HTTP requests so that
+many messages are retrieved in a single round-trip, or fans them out
+over a bounded thread pool (see gmail_concurrent.py).
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+from itertools import islice
+
+from .gmail_rate_limiter import QUOTA_UNITS, execute_with_backoff, is_rate_limit_error, wait_after_rate_limit
+from .gmail_concurrent import fetch_messages_concurrent
+
+# Gmail API accepts at most 100 calls per batch request
+GMAIL_BATCH_LIMIT = 100
+
+
+def fetch_messages(service, message_ids, batch_size: int = 50, msg_format: str = 'full',
+                   metadata_headers: list = None, workers: int = 1, service_factory=None,
+                   limiter=None, max_retries: int = 5):
+    """
+    Fetch Gmail messages, batching up to batch_size calls per HTTP request
+
+    message_ids may be a lazy iterator (e.g. a paginated search); it is
+    consumed one chunk at a time.
+
+    Args:
+        service: Gmail API service
+        message_ids: Iterable of Gmail message IDs
+        batch_size: Calls per batch request (1 disables batching)
+        msg_format: Gmail message format ('full', 'metadata', ...)
+        metadata_headers: Headers to return when msg_format is 'metadata'
+        workers: Concurrent fetch threads (> 1 switches to the thread pool mode)
+        service_factory: Callable returning a new Gmail service (one per thread)
+        limiter: Optional quota TokenBucket shared by all requests
+        max_retries: Retries after 429 / rateLimitExceeded responses
+
+    Yields:
+        tuple: (message_id, message, error) in input order; exactly one of
+        message or error is None
+    """
+    get_kwargs = {'format': msg_format}
+    if msg_format == 'metadata' and metadata_headers:
+        get_kwargs['metadataHeaders'] = metadata_headers
+
+    if workers and workers > 1 and service_factory is not None:
+        yield from fetch_messages_concurrent(
+            service_factory, message_ids, workers, get_kwargs, limiter, max_retries
+        )
+        return
+
+    batch_size = max(1, min(int(batch_size or 1), GMAIL_BATCH_LIMIT))
+    id_iterator = iter(message_ids)
+
+    while True:
+        chunk = list(islice(id_iterator, batch_size))
+        if not chunk:
+            break
+
+        if batch_size == 1:
+            yield _fetch_single(service, chunk[0], get_kwargs, limiter, max_retries)
+            continue
+
+        yield from _fetch_batch(service, chunk, get_kwargs, limiter, max_retries)
+
+
+def build_get_request(service, message_id: str, get_kwargs: dict):
+    """Build (but do not execute) a messages.get request"""
+    return service.users().messages().get(userId='me', id=message_id, **get_kwargs)
+
+
+def _fetch_single(service, message_id: str, get_kwargs: dict, limiter, max_retries: int) -> tuple:
+    """Fetch one message with its own HTTP round-trip"""
+    try:
+        request = build_get_request(service, message_id, get_kwargs)
+        return message_id, execute_with_backoff(request, limiter, QUOTA_UNITS['messages.get'], max_retries), None
+    except Exception as e:
+        return message_id, None, e
+
+
+def _fetch_batch(service, chunk: list, get_kwargs: dict, limiter, max_retries: int) -> list:
+    """
+    Fetch a chunk of messages in one batch HTTP request
+
+    Per-item failures are reported individually; items that were rate
+    limited are retried in a smaller batch after backing off. A failure
+    of the whole batch request is reported against every message in the chunk.
+    """
+    responses = {}
+    pending = list(chunk)
+
+    for attempt in range(max_retries + 1):
+        batch_responses = {}
+
+        def _callback(request_id, response, exception):
+            batch_responses[request_id] = (response, exception)
+
+        batch = service.new_batch_http_request(callback=_callback)
+        for message_id in pending:
+            batch.add(build_get_request(service, message_id, get_kwargs), request_id=message_id)
+
+        if limiter is not None:
+            limiter.acquire(QUOTA_UNITS['messages.get'] * len(pending))
+        try:
+            batch.execute()
+        except Exception as e:
+            if attempt < max_retries and is_rate_limit_error(e):
+                wait_after_rate_limit(attempt, limiter)
+                continue
+            batch_responses = {message_id: (None, e) for message_id in pending}
+
+        responses.update(batch_responses)
+        pending = [
+            message_id for message_id, (_, exception) in batch_responses.items()
+            if exception is not None and is_rate_limit_error(exception)
+        ]
+        if not pending or attempt >= max_retries:
+            break
+        wait_after_rate_limit(attempt, limiter)
+
+    results = []
+    for message_id in chunk:
+        response, exception = responses.get(
+            message_id, (None, RuntimeError("No response in batch"))
+        )
+        results.append((message_id, None if exception else response, exception))
+    return results
@@ -0,0 +1,56 @@
+"""
+Gmail Concurrent Fetch
+
+Fetches messages over a bounded thread pool. googleapiclient service
+objects are not thread-safe, so every worker thread builds and keeps
+its own service from a factory. All threads share one quota limiter.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from .gmail_rate_limiter import QUOTA_UNITS, execute_with_backoff
+
+# Ids submitted to the pool per worker at a time (keeps the input stream lazy)
+IDS_PER_WORKER = 4
+
+
+def fetch_messages_concurrent(service_factory, message_ids, workers: int, get_kwargs: dict,
+                              limiter=None, max_retries: int = 5):
+    """
+    Fetch messages.get results concurrently
+
+    Args:
+        service_factory: Callable returning a new Gmail service
+        message_ids: Iterable of Gmail message IDs (may be lazy)
+        workers: Maximum number of concurrent requests
+        get_kwargs: Extra messages.get arguments (format, metadataHeaders)
+        limiter: Optional quota TokenBucket shared by all threads
+        max_retries: Retries after 429 / rateLimitExceeded responses
+
+    Yields:
+        tuple: (message_id, message, error) in input order
+    """
+    local = threading.local()
+
+    def _fetch(message_id):
+        try:
+            if not hasattr(local, 'service'):
+                local.service = service_factory()
+            request = local.service.users().messages().get(userId='me', id=message_id, **get_kwargs)
+            response = execute_with_backoff(request, limiter, QUOTA_UNITS['messages.get'], max_retries)
+            return message_id, response, None
+        except Exception as e:
+            return message_id, None, e
+
+    id_iterator = iter(message_ids)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            chunk = list(islice(id_iterator, workers * IDS_PER_WORKER))
+            if not chunk:
+                break
+            yield from pool.map(_fetch, chunk)
@@ -0,0 +1,84 @@
+"""
+Gmail Discovery Document Cache
+
+Holds the Gmail v1 discovery document for the whole process so services
+are built with build_from_document instead of a discovery lookup.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import httplib2
+from googleapiclient import discovery_cache
+
+from ...utils.paths import get_cache_dir
+
+DISCOVERY_URL = "https://gmail.googleapis.com/$discovery/rest?version=v1"
+DISCOVERY_CACHE_FILE = "gmail_v1_discovery.json"
+
+_discovery_document = None
+_lock = threading.Lock()
+
+
+def get_discovery_document() -> str:
+    """
+    Return the Gmail v1 discovery document (JSON text)
+
+    Uses the copy bundled with google-api-python-client; if it is
+    missing, the document is downloaded once and kept in temp/cache.
+    The text is cached rather than the parsed dict because
+    build_from_document adds parameters to the dict it is given.
+
+    Raises:
+        RuntimeError: The document had to be downloaded and the download failed
+    """
+    global _discovery_document
+    with _lock:
+        if _discovery_document is None:
+            document = discovery_cache.get_static_doc('gmail', 'v1')
+            if document is None:
+                document = _read_cached(get_cache_dir() / DISCOVERY_CACHE_FILE)
+            if document is None:
+                document = _download(get_cache_dir() / DISCOVERY_CACHE_FILE)
+            _discovery_document = document
+        return _discovery_document
+
+
+def _read_cached(cache_path: Path) -> str:
+    """The cached document (None if missing or not valid JSON)"""
+    try:
+        document = cache_path.read_text(encoding='utf-8')
+        json.loads(document)
+    except (OSError, ValueError):
+        return None
+    return document
+
+
+def _download(cache_path: Path) -> str:
+    """Download the document and cache it, only if Gmail answered 200 with JSON"""
+    response, content = httplib2.Http(timeout=30).request(DISCOVERY_URL)
+    if response.status != 200:
+        raise RuntimeError(f"Gmail discovery document download failed: HTTP {response.status}")
+    try:
+        document = content.decode('utf-8')
+        json.loads(document)
+    except ValueError as e:
+        raise RuntimeError("Gmail discovery document download is not valid JSON") from e
+
+    # Write a temporary file and rename it, so a crash never leaves a partial cache
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(document)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+    return document
@@ -0,0 +1,115 @@
+"""
+Gmail Label Work Queue
+
+Marks processed submissions with Gmail labels (grader/extracted after
+Agent 1, grader/drafted after Agent 4) using users.messages.batchModify,
+and excludes those labels from the Agent 1 search so Gmail only returns
+emails that still need work.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+from rich.console import Console
+
+from .gmail_rate_limiter import QUOTA_UNITS, execute_with_backoff
+from ...utils.config import get_settings
+from ...utils.paths import get_cache_dir
+from ...utils.sqlite_cache import SQLiteCache
+
+QUEUE_FILE = "gmail_work_queue.sqlite"
+
+# batchModify accepts at most 1000 message ids per call
+BATCH_MODIFY_LIMIT = 1000
+
+console = Console()
+
+
+def exclude_labels_query(query: str, label_names) -> str:
+    """Append -label: terms for label_names to a Gmail query"""
+    terms = [f"-label:{label_query_name(name)}" for name in label_names]
+    return ' '.join([query] + terms if query else terms)
+
+
+def label_query_name(name: str) -> str:
+    """Label name as written in a search (grader/extracted -> grader-extracted)"""
+    return name.lower().replace('/', '-').replace(' ', '-')
+
+
+def get_label_ids(service, label_names, limiter=None) -> dict:
+    """
+    Return {name: label_id}, creating any user label that does not exist
+
+    Args:
+        service: Gmail API service
+        label_names: Label names (nested labels use '/', e.g. grader/drafted)
+        limiter: Optional TokenBucket for Gmail quota units
+
+    Returns:
+        dict: Label id per requested name
+    """
+    request = service.users().labels().list(userId='me')
+    labels = execute_with_backoff(request, limiter, QUOTA_UNITS['labels.list']).get('labels', [])
+    ids = {label['name']: label['id'] for label in labels}
+    for name in label_names:
+        if name not in ids:
+            body = {'name': name, 'labelListVisibility': 'labelShow', 'messageListVisibility': 'show'}
+            request = service.users().labels().create(userId='me', body=body)
+            ids[name] = execute_with_backoff(request, limiter, QUOTA_UNITS['labels.create'])['id']
+    return {name: ids[name] for name in label_names}
+
+
+def add_label(service, message_ids, label_name: str, limiter=None) -> int:
+    """
+    Add a label to messages with as few batchModify calls as possible
+
+    Returns:
+        int: Number of messages labelled
+    """
+    message_ids = list(dict.fromkeys(mid for mid in message_ids if mid))
+    if not message_ids:
+        return 0
+    label_id = get_label_ids(service, [label_name], limiter)[label_name]
+    for start in range(0, len(message_ids), BATCH_MODIFY_LIMIT):
+        body = {'ids': message_ids[start:start + BATCH_MODIFY_LIMIT], 'addLabelIds': [label_id]}
+        request = service.users().messages().batchModify(userId='me', body=body)
+        execute_with_backoff(request, limiter, QUOTA_UNITS['messages.batchModify'])
+    return len(message_ids)
+
+
+def mark_extracted(service, submissions: list, label_name: str, limiter=None, db_path=None) -> int:
+    """
+    Label the emails Agent 1 wrote to Excel1.xlsx
+
+    Failed rows are left unlabelled so the next search retries them. The
+    email_id -> message_id mapping is kept so Agent 4 (which only sees
+    Excel rows) can label the same messages later.
+    """
+    processed = {
+        s['email_id']: s['message_id'] for s in submissions
+        if s.get('message_id') and not s['status'].startswith("Error")
+    }
+    queue = SQLiteCache(db_path or get_cache_dir() / QUEUE_FILE, max_entries=0, table="messages")
+    try:
+        queue.set_many(processed)
+    finally:
+        queue.close()
+    return add_label(service, processed.values(), label_name, limiter)
+
+
+def mark_drafted(service, email_ids, label_name: str, limiter=None, db_path=None) -> int:
+    """Label the emails whose feedback drafts Agent 4 created"""
+    queue = SQLiteCache(db_path or get_cache_dir() / QUEUE_FILE, max_entries=0, table="messages")
+    try:
+        message_ids = queue.get_many(email_ids)
+    finally:
+        queue.close()
+    return add_label(service, message_ids.values(), label_name, limiter)
+
+
+def label_drafted(service, email_ids):
+    """Agent 4: label the drafted emails when the label work queue is on"""
+    settings = get_settings().email_extraction
+    if settings.label_work_queue and email_ids:
+        labelled = mark_drafted(service, email_ids, settings.drafted_label)
+        console.print(f"[+] Labelled {labelled} emails '{settings.drafted_label}'")
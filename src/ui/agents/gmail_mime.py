@@ -0,0 +1,146 @@
+"""
+Gmail MIME Body Decoder
+
+Walks a Gmail message payload once and decodes a single body part:
+text/plain if present, otherwise text/html with tags stripped.
+Attachments are never decoded and decoding stops at a byte budget.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import re
+import base64
+from html import unescape
+
+# Default decode budget per message (GitHub URLs sit near the top of a reply)
+MAX_BODY_BYTES = 64 * 1024
+
+_CHARSET_PATTERN = re.compile(r'charset\s*=\s*"?([\w.:-]+)', re.IGNORECASE)
+_SCRIPT_STYLE_PATTERN = re.compile(r'<(script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_HREF_PATTERN = re.compile(r'<a\b[^>]*?\bhref\s*=\s*["\']?([^"\'\s>]+)[^>]*>', re.IGNORECASE)
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+ZIP_MIME_TYPES = ('application/zip', 'application/x-zip-compressed')
+
+
+def extract_body_text(payload: dict, max_bytes: int = MAX_BODY_BYTES) -> str:
+    """
+    Extract the readable body of a Gmail message payload
+
+    Args:
+        payload: Gmail message payload (format='full')
+        max_bytes: Decode at most this many bytes of the chosen part (0 = no limit)
+
+    Returns:
+        str: Body text (HTML converted to text), or '' if there is none
+    """
+    plain, html = _find_body_parts(payload)
+    part = plain or html
+    if part is None:
+        return ''
+
+    try:
+        raw = decode_part_data(part['body']['data'], max_bytes)
+    except (ValueError, TypeError):
+        return ''
+
+    text = raw.decode(_get_charset(part), errors='ignore')
+    return text if part is plain else html_to_text(text)
+
+
+def decode_part_data(data: str, max_bytes: int = 0) -> bytes:
+    """
+    Decode base64url part data, stopping after max_bytes
+
+    Only the prefix of the encoded string that covers max_bytes is decoded,
+    so a large part costs no more than a small one.
+    """
+    if max_bytes and max_bytes > 0:
+        # 4 base64 characters encode 3 bytes
+        data = data[:-(-max_bytes // 3) * 4]
+    data += '=' * (-len(data) % 4)
+    raw = base64.urlsafe_b64decode(data)
+    return raw[:max_bytes] if max_bytes and max_bytes > 0 else raw
+
+
+def html_to_text(html: str) -> str:
+    """Strip tags from HTML, keeping link targets (href) in the text"""
+    text = _SCRIPT_STYLE_PATTERN.sub(' ', html)
+    text = _HREF_PATTERN.sub(lambda m: f" {m.group(1)} ", text)
+    text = _TAG_PATTERN.sub(' ', text)
+    return unescape(text)
+
+
+def _find_body_parts(payload: dict) -> tuple:
+    """
+    Walk the MIME tree in document order without decoding anything
+
+    Returns:
+        tuple: (first text/plain part, first text/html part) - either may be None
+    """
+    html = None
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        if _is_attachment(part):
+            continue
+
+        mime_type = (part.get('mimeType') or 'text/plain').lower()
+        if part.get('parts'):
+            # Push children reversed so they are visited in order
+            stack.extend(reversed(part['parts']))
+        elif not part.get('body', {}).get('data'):
+            continue
+        elif mime_type == 'text/plain':
+            return part, html
+        elif mime_type == 'text/html' and html is None:
+            html = part
+
+    return None, html
+
+
+def find_zip_attachments(payload: dict) -> list:
+    """
+    Zip attachment parts of a Gmail message payload, in document order
+
+    Returns:
+        list: dicts with filename, attachment_id, data (inline parts only) and size
+    """
+    zips = []
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        stack.extend(reversed(part.get('parts') or []))
+        filename = part.get('filename') or ''
+        is_zip = filename.lower().endswith('.zip') or (part.get('mimeType') or '').lower() in ZIP_MIME_TYPES
+        if is_zip and _is_attachment(part):
+            body = part.get('body', {})
+            zips.append({'filename': filename or 'submission.zip', 'attachment_id': body.get('attachmentId'),
+                         'data': body.get('data'), 'size': body.get('size', 0)})
+    return zips
+
+
+def _is_attachment(part: dict) -> bool:
+    """Parts with a filename, an attachmentId or Content-Disposition: attachment"""
+    if part.get('filename') or part.get('body', {}).get('attachmentId'):
+        return True
+    disposition = _get_header(part, 'Content-Disposition')
+    return disposition.lower().startswith('attachment')
+
+
+def _get_charset(part: dict) -> str:
+    """Charset from the part's Content-Type header (default utf-8)"""
+    match = _CHARSET_PATTERN.search(_get_header(part, 'Content-Type'))
+    charset = match.group(1) if match else 'utf-8'
+    try:
+        ''.encode(charset)
+    except LookupError:
+        return 'utf-8'
+    return charset
+
+
+def _get_header(part: dict, name: str) -> str:
+    for header in part.get('headers', []):
+        if header['name'].lower() == name.lower():
+            return header['value']
+    return ''
@@ -0,0 +1,132 @@
+"""
+Gmail Quota Rate Limiter
+
+Token bucket measured in Gmail quota units (per-user limit) plus a
+retry helper that backs off on 429 / 403 rateLimitExceeded responses.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import random
+import threading
+import time
+
+from googleapiclient.errors import HttpError
+
+# Gmail API quota units per method
+QUOTA_UNITS = {
+    'messages.get': 5,
+    'messages.list': 5,
+    'messages.attachments.get': 5,
+    'messages.batchModify': 50,
+    'labels.list': 1,
+    'labels.create': 5,
+    'history.list': 2,
+    'getProfile': 1,
+}
+
+RATE_LIMIT_REASONS = ('rateLimitExceeded', 'userRateLimitExceeded')
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+class TokenBucket:
+    """Thread-safe token bucket; one token = one Gmail quota unit"""
+
+    def __init__(self, rate: float, capacity: float = None):
+        """Refill at rate units/second, holding at most capacity units"""
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, units: float):
+        """Block until units are available, then consume them"""
+        # Requests larger than the bucket run on credit instead of waiting forever
+        needed = min(units, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= needed:
+                    self._tokens -= units
+                    return
+                else:
+                    wait = (needed - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def penalize(self, seconds: float):
+        """Pause every caller for seconds and drain the bucket (after a 429)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+def get_gmail_limiter(units_per_second: float = 250) -> TokenBucket:
+    """Return the process-wide limiter (Gmail quota is per user, not per thread)"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None or _limiter.rate != float(units_per_second):
+            _limiter = TokenBucket(units_per_second)
+        return _limiter
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True for 429 and 403 rateLimitExceeded / userRateLimitExceeded"""
+    if not isinstance(error, HttpError):
+        return False
+    if error.resp.status == 429:
+        return True
+    if error.resp.status == 403:
+        content = error.content.decode('utf-8', errors='ignore') \
+            if isinstance(error.content, bytes) else str(error.content)
+        return any(reason in content for reason in RATE_LIMIT_REASONS)
+    return False
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter (1s, 2s, 4s ... capped at 32s)"""
+    return min(32, 2 ** attempt) + random.uniform(0, 1)
+
+
+def wait_after_rate_limit(attempt: int, limiter: TokenBucket = None):
+    """Back off after a rate-limit error, pausing all threads that share the limiter"""
+    delay = backoff_delay(attempt)
+    if limiter is not None:
+        limiter.penalize(delay)
+    else:
+        time.sleep(delay)
+
+
+def execute_with_backoff(request, limiter: TokenBucket = None, units: int = 5, max_retries: int = 5):
+    """
+    Execute a Gmail API request under the quota limiter
+
+    Args:
+        request: googleapiclient HttpRequest (not yet executed)
+        limiter: Optional token bucket shared by all callers
+        units: Quota units charged for this request
+        max_retries: Retries after rate-limit errors before giving up
+
+    Returns:
+        dict: API response
+
+    Raises:
+        Exception: The last error if it isn't a rate limit or retries run out
+    """
+    for attempt in range(max_retries + 1):
+        if limiter is not None:
+            limiter.acquire(units)
+        try:
+            return request.execute()
+        except Exception as e:
+            if attempt >= max_retries or not is_rate_limit_error(e):
+                raise
+            wait_after_rate_limit(attempt, limiter)
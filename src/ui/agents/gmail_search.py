@@ -0,0 +1,56 @@
+"""
+Gmail Paginated Search
+
+Streams Gmail search results page by page by following nextPageToken,
+so callers can start processing before the listing finishes.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+from .gmail_rate_limiter import QUOTA_UNITS, execute_with_backoff
+
+# Gmail API returns at most 500 message ids per messages.list page
+GMAIL_PAGE_LIMIT = 500
+
+
+def iter_messages(service, query: str = '', max_emails: int = None, page_size: int = GMAIL_PAGE_LIMIT,
+                  limiter=None):
+    """
+    Yield Gmail message stubs ({'id', 'threadId'}) matching a query
+
+    Only one page of results is held in memory at a time.
+
+    Args:
+        service: Gmail API service
+        query: Gmail search query (empty string matches all emails)
+        max_emails: Maximum number of messages to yield (None or 0 = no limit)
+        page_size: Results requested per messages.list page (max 500)
+        limiter: Optional quota TokenBucket charged for every page request
+
+    Yields:
+        dict: Message stub as returned by messages.list
+    """
+    page_size = max(1, min(int(page_size or GMAIL_PAGE_LIMIT), GMAIL_PAGE_LIMIT))
+    remaining = max_emails if max_emails and max_emails > 0 else None
+    page_token = None
+
+    while remaining is None or remaining > 0:
+        request_size = page_size if remaining is None else min(page_size, remaining)
+        list_kwargs = {'userId': 'me', 'q': query, 'maxResults': request_size}
+        if page_token:
+            list_kwargs['pageToken'] = page_token
+
+        request = service.users().messages().list(**list_kwargs)
+        response = execute_with_backoff(request, limiter, QUOTA_UNITS['messages.list'])
+        page = response.get('messages', [])
+
+        for message in page[:request_size]:
+            yield message
+        if remaining is not None:
+            remaining -= min(len(page), request_size)
+
+        page_token = response.get('nextPageToken')
+        if not page_token or not page:
+            break
+
@@ -0,0 +1,150 @@
+"""
+Gmail Date-Window Sharded Search
+
+Splits one search into after:/before: date windows and lists the windows
+in parallel, newest first. A window holding more than a page of results
+is split by its resultSizeEstimate, and the window length is rescaled
+after every round toward about one messages.list page per window.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .gmail_search import GMAIL_PAGE_LIMIT, iter_messages
+from .gmail_rate_limiter import QUOTA_UNITS, execute_with_backoff
+from .mail_query import parse_query_date
+
+DAY_SECONDS = 86400
+# Windows stay between an hour and about four years; a dense one is split into at most MAX_SPLIT
+MIN_WINDOW_SECONDS = 3600
+MAX_WINDOW_SECONDS = 4 * 365 * DAY_SECONDS
+MAX_SPLIT = 16
+# Windows are sized for this share of a page; a window estimated at up to
+# KEEP_PAGING_PAGES pages is paged through instead of split
+TARGET_FILL = 0.9
+KEEP_PAGING_PAGES = 3
+
+
+def list_messages(service, query: str = '', max_emails: int = None, limiter=None, workers: int = 1,
+                  service_factory=None, window_days: float = 30, since: float = None,
+                  page_size: int = GMAIL_PAGE_LIMIT):
+    """
+    Yield message stubs ({'id', 'threadId'}), newest window first
+
+    Args:
+        service: Gmail API service (used by the calling thread)
+        query: Gmail search query
+        max_emails: Maximum number of messages (None or 0 = no limit)
+        limiter: Optional quota TokenBucket
+        workers: Date windows listed in parallel (1 = plain paginated listing)
+        service_factory: Callable returning this thread's Gmail service (needed for workers > 1)
+        window_days: Initial window length in days
+        since: Optional epoch seconds; nothing older is listed
+        page_size: Results per messages.list page
+    """
+    if workers <= 1 or service_factory is None:
+        yield from iter_messages(service, query, max_emails, page_size, limiter)
+        return
+
+    page_size = max(1, min(int(page_size or GMAIL_PAGE_LIMIT), GMAIL_PAGE_LIMIT))
+    window = max(MIN_WINDOW_SECONDS, window_days * DAY_SECONDS)
+    end = time.time() + DAY_SECONDS  # Internal dates can be slightly ahead of the local clock
+    remaining = max_emails if max_emails and max_emails > 0 else None
+    seen = set()
+
+    def list_window(bounds, can_split):
+        return _list_window(service_factory(), query, bounds, page_size, limiter, can_split)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while since is None or end > since:
+            windows = []
+            for _ in range(workers):
+                start = end - window if since is None else max(since, end - window)
+                windows.append((start, end))
+                end = start
+                if since is not None and end <= since:
+                    break
+
+            pages = _list_windows(pool, list_window, windows, page_size)
+            for stub in (stub for page in pages for stub in page):
+                if stub['id'] not in seen:
+                    seen.add(stub['id'])
+                    yield stub
+                    if remaining is not None and len(seen) >= remaining:
+                        return
+
+            # Rescale toward TARGET_FILL of a page per window (at most 4x per round)
+            density = sum(len(page) for page in pages) / len(windows)
+            scale = min(4.0, max(0.25, page_size * TARGET_FILL / max(density, 1)))
+            window = min(MAX_WINDOW_SECONDS, max(MIN_WINDOW_SECONDS, window * scale))
+            # Without a since bound, stop once nothing older is left (checked
+            # only after an empty oldest window, the usual sign of the end)
+            if since is None and not pages[-1] and not _has_older(service, query, end, limiter):
+                return
+
+
+def build_list_options(settings, service_factory=None, workers: int = None) -> dict:
+    """list_messages options from email_extraction settings"""
+    since = parse_query_date(settings.list_since) if settings.list_since else None
+    return {'workers': workers or settings.list_workers, 'service_factory': service_factory,
+            'window_days': settings.list_window_days, 'since': since}
+
+
+def window_query(query: str, start: float, end: float) -> str:
+    """Restrict a query to [start, end) in epoch seconds (start None = no lower bound)"""
+    bounds = f"after:{int(start)} before:{int(end)}" if start is not None else f"before:{int(end)}"
+    return f"{query} {bounds}" if query else bounds
+
+
+def _list_windows(pool, list_window, windows: list, page_size: int) -> list:
+    """
+    List windows in parallel, splitting dense ones by their size estimate
+
+    Returns:
+        list: One page of stubs per (sub-)window, newest window first
+    """
+    futures = [pool.submit(list_window, bounds, bounds[1] - bounds[0] >= 2 * MIN_WINDOW_SECONDS)
+               for bounds in windows]
+    pages = []
+    for (start, end), future in zip(windows, futures):
+        page, estimate = future.result()
+        if page is None:
+            parts = min(MAX_SPLIT, max(2, math.ceil(estimate / (page_size * TARGET_FILL))),
+                        int((end - start) // MIN_WINDOW_SECONDS))
+            step = (end - start) / parts
+            sub_windows = [(end - (i + 1) * step, end - i * step) for i in range(parts)]
+            pages.extend(_list_windows(pool, list_window, sub_windows, page_size))
+        else:
+            pages.append(page)
+    return pages
+
+
+def _list_window(service, query: str, bounds: tuple, page_size: int, limiter, can_split: bool) -> tuple:
+    """(stubs, resultSizeEstimate); stubs is None if the window is too dense and can be split"""
+    q = window_query(query, *bounds)
+    response = _list_page(service, q, page_size, limiter)
+    stubs = response.get('messages', [])
+    if can_split and response.get('resultSizeEstimate', 0) > KEEP_PAGING_PAGES * page_size:
+        return None, response['resultSizeEstimate']
+    # A slightly overfull window is cheaper to page through than to split
+    while response.get('nextPageToken'):
+        response = _list_page(service, q, page_size, limiter, response['nextPageToken'])
+        stubs.extend(response.get('messages', []))
+    return stubs, len(stubs)
+
+
+def _has_older(service, query: str, end: float, limiter) -> bool:
+    """True if any message matching query is older than end"""
+    return bool(_list_page(service, window_query(query, None, end), 1, limiter).get('messages'))
+
+
+def _list_page(service, q: str, page_size: int, limiter, page_token: str = None) -> dict:
+    list_kwargs = {'userId': 'me', 'q': q, 'maxResults': page_size}
+    if page_token:
+        list_kwargs['pageToken'] = page_token
+    request = service.users().messages().list(**list_kwargs)
+    return execute_with_backoff(request, limiter, QUOTA_UNITS['messages.list'])
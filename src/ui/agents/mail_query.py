@@ -0,0 +1,126 @@
+"""
+Gmail Search Query Matcher
+
+Evaluates the subset of Gmail search syntax that Agent 1 builds
+(subject:, from:, after:, before:, label:/in:, has:attachment, bare
+words, "phrases", {any of} groups and -negation) against local
+messages, for the offline mail sources.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from .agent1_metadata_filter import get_header
+from .gmail_labels import label_query_name
+
+TERM_PATTERN = re.compile(r'(-)?(?:([a-zA-Z_]+):)?("[^"]*"|\{[^}]*\}|\S+)')
+
+# Operators that never exclude a message offline
+IGNORED_OPERATORS = {'category', 'is', 'size', 'larger', 'smaller', 'to', 'cc', 'bcc', 'list'}
+
+
+def build_index_entry(subject: str, sender: str, snippet: str, timestamp: float,
+                      labels=(), has_attachment: bool = False) -> dict:
+    """Precompute the lowercase fields a query is matched against"""
+    subject, sender = (subject or '').lower(), (sender or '').lower()
+    return {
+        'subject': subject,
+        'from': sender,
+        'text': f"{subject}\n{sender}\n{(snippet or '').lower()}",
+        'timestamp': timestamp,
+        'labels': {label_query_name(label) for label in labels},
+        'has_attachment': has_attachment,
+    }
+
+
+def index_message(message: dict) -> dict:
+    """Build the query index entry for a message resource"""
+    headers = message['payload'].get('headers', [])
+    if message.get('internalDate'):
+        timestamp = int(message['internalDate']) / 1000
+    else:
+        try:
+            timestamp = parsedate_to_datetime(get_header(headers, 'Date')).timestamp()
+        except (TypeError, ValueError):
+            timestamp = 0.0
+    return build_index_entry(
+        get_header(headers, 'Subject'), get_header(headers, 'From'), message.get('snippet', ''),
+        timestamp, message.get('labelIds', ['INBOX']), _has_attachment(message['payload'])
+    )
+
+
+def compile_query(query: str):
+    """
+    Compile a Gmail query into a predicate over index entries
+
+    Terms are ANDed; words match case-insensitively on word boundaries,
+    and dates are interpreted as UTC midnight.
+
+    Returns:
+        callable: entry -> bool
+    """
+    predicates = []
+    for negate, operator, value in TERM_PATTERN.findall(query or ''):
+        operator = operator.lower()
+        if operator in IGNORED_OPERATORS or value.upper() == 'OR':
+            continue
+        predicate = _term_predicate(operator, value)
+        predicates.append(_negate(predicate) if negate else predicate)
+    return lambda entry: all(predicate(entry) for predicate in predicates)
+
+
+def parse_query_date(value: str) -> float:
+    """Parse an after:/before: value (YYYY/MM/DD, YYYY-MM-DD or epoch seconds)"""
+    if value.isdigit():
+        return float(value)
+    year, month, day = (int(part) for part in re.split(r'[/-]', value))
+    return datetime(year, month, day, tzinfo=timezone.utc).timestamp()
+
+
+def _term_predicate(operator: str, value: str):
+    if operator in ('after', 'before'):
+        timestamp = parse_query_date(value)
+        if operator == 'after':
+            return lambda e: e['timestamp'] >= timestamp
+        return lambda e: e['timestamp'] < timestamp
+
+    if operator in ('label', 'in'):
+        label = label_query_name(value)
+        return lambda e: label in ('anywhere', 'all') or label in e['labels']
+    if operator == 'has':
+        return lambda e: value.lower() != 'attachment' or e['has_attachment']
+
+    field = operator if operator in ('subject', 'from') else 'text'
+    patterns = [_word_pattern(word) for word in _value_words(value)]
+    if value.startswith('{'):
+        return lambda e: any(p.search(e[field]) for p in patterns)
+    return lambda e: all(p.search(e[field]) for p in patterns)
+
+
+def _negate(predicate):
+    return lambda entry: not predicate(entry)
+
+
+def _word_pattern(word: str) -> re.Pattern:
+    """Match word (or phrase) as whole words, like Gmail's tokenized search"""
+    return re.compile(r'(?<!\w)' + r'\s+'.join(map(re.escape, word.split())) + r'(?!\w)')
+
+
+def _value_words(value: str) -> list:
+    """Split a term value: "a phrase" -> ['a phrase'], {a b} -> ['a', 'b']"""
+    value = value.lower()
+    if value.startswith('"'):
+        return [value.strip('"')]
+    if value.startswith('{'):
+        return value.strip('{}').split()
+    return [value]
+
+
+def _has_attachment(part: dict) -> bool:
+    if part.get('filename') or part.get('body', {}).get('attachmentId'):
+        return True
+    return any(_has_attachment(child) for child in part.get('parts', []))
@@ -0,0 +1,63 @@
+"""
+Agent 1 Mail Sources
+
+Selects where Agent 1 reads email from. Every source exposes the Gmail
+API surface (users().messages(), history, batch requests), so the
+extraction pipeline is the same for all of them:
+
+- gmail: the live Gmail API
+- local: an mbox file, Maildir or .eml directory (offline)
+- a service object: e.g. an InMemoryGmailService for tests/benchmarks
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+from .gmail_auth import get_gmail_service
+from .mail_source_local import open_local_mailbox
+from ...utils.config import get_settings
+
+MAIL_SOURCES = ('gmail', 'local')
+
+
+def open_mail_source(params: dict, console=None) -> tuple:
+    """
+    Open the mail source selected by params or settings.yaml
+
+    Args:
+        params: Agent 1 parameters; mail_source ('gmail', 'local' or a
+            Gmail-compatible service object) and mail_path override the
+            email_extraction settings
+        console: Optional Rich console for logging
+
+    Returns:
+        tuple: (service, service_factory) - service_factory returns a service
+        for a worker thread
+
+    Raises:
+        ValueError: If the source name is unknown or local has no path
+    """
+    settings = get_settings().email_extraction
+    source = params.get('mail_source') or settings.mail_source
+
+    if not isinstance(source, str):
+        return source, lambda: source
+
+    if source == 'gmail':
+        return get_gmail_service(console), get_gmail_service
+
+    if source == 'local':
+        path = params.get('mail_path') or settings.mail_path
+        if not path:
+            raise ValueError("mail_source 'local' needs mail_path (mbox file, Maildir or .eml directory)")
+        if console:
+            console.print(f"[*] Loading local mailbox: {path}")
+        service = open_local_mailbox(path)
+        return service, lambda: service
+
+    raise ValueError(f"Unknown mail_source '{source}' (expected one of {MAIL_SOURCES} or a service object)")
+
+
+def is_live_source(params: dict) -> bool:
+    """True when Agent 1 reads the live Gmail mailbox"""
+    return (params.get('mail_source') or get_settings().email_extraction.mail_source) == 'gmail'
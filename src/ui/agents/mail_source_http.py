@@ -0,0 +1,47 @@
+"""
+In-Memory HTTP Request Stand-ins
+
+HttpRequest / BatchHttpRequest look-alikes for the offline Gmail
+service, so code written against googleapiclient runs unchanged.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+
+class InMemoryRequest:
+    """Deferred call with an HttpRequest-like execute()"""
+
+    def __init__(self, func, **kwargs):
+        self.func = func
+        self.kwargs = kwargs
+
+    def execute(self):
+        return self.func(**self.kwargs)
+
+
+class InMemoryBatch:
+    """BatchHttpRequest stand-in: runs each request and reports to the callback"""
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id=None):
+        self.requests.append((request_id or str(len(self.requests)), request))
+
+    def execute(self):
+        for request_id, request in self.requests:
+            try:
+                response, error = request.execute(), None
+            except Exception as e:
+                response, error = None, e
+            self.callback(request_id, response, error)
+
+
+def http_error(status: int, message: str) -> HttpError:
+    """Build an HttpError like the ones googleapiclient raises"""
+    return HttpError(httplib2.Response({'status': status}), message.encode())
@@ -0,0 +1,60 @@
+"""
+In-Memory Gmail Labels
+
+users.labels.list/create and users.messages.batchModify for the
+in-memory Gmail service, so the label work queue runs offline and in
+tests.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+from .gmail_labels import label_query_name
+from .mail_source_http import http_error
+
+SYSTEM_LABELS = ('INBOX', 'SENT', 'DRAFT', 'SPAM', 'TRASH', 'UNREAD', 'STARRED', 'IMPORTANT')
+
+
+class InMemoryLabels:
+    """Label store sharing the message and index dicts of an in-memory service"""
+
+    def __init__(self, messages: dict, index: dict, lock, calls):
+        self._messages = messages
+        self._index = index
+        self._lock = lock
+        self._calls = calls
+        self._names = {label: label for label in SYSTEM_LABELS}
+
+    def list(self, userId='me', **_):
+        self._calls['labels.list'] += 1
+        return {'labels': [
+            {'id': label_id, 'name': name, 'type': 'system' if label_id in SYSTEM_LABELS else 'user'}
+            for label_id, name in self._names.items()
+        ]}
+
+    def create(self, userId='me', body=None, **_):
+        self._calls['labels.create'] += 1
+        with self._lock:
+            if body['name'] in self._names.values():
+                raise http_error(409, f"Label name exists or conflicts: {body['name']}")
+            label_id = f"Label_{len(self._names) - len(SYSTEM_LABELS) + 1}"
+            self._names[label_id] = body['name']
+        return {'id': label_id, 'name': body['name'], 'type': 'user'}
+
+    def batch_modify(self, userId='me', body=None, **_):
+        self._calls['messages.batchModify'] += 1
+        add, remove = body.get('addLabelIds', []), set(body.get('removeLabelIds', []))
+        unknown = [label_id for label_id in add if label_id not in self._names]
+        if unknown or len(body.get('ids', [])) > 1000:
+            raise http_error(400, f"Invalid batchModify request (unknown labels: {unknown})")
+        with self._lock:
+            for message_id in body.get('ids', []):
+                message = self._messages.get(message_id)
+                if message is None:
+                    continue
+                labels = [label for label in message.get('labelIds', []) if label not in remove]
+                message['labelIds'] = labels + [label for label in add if label not in labels]
+                self._index[message_id]['labels'] = {
+                    label_query_name(self._names.get(label, label)) for label in message['labelIds']
+                }
+        return ''
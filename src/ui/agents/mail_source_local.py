@@ -0,0 +1,130 @@
+"""
+Local Mailbox Source
+
+Reads an mbox file, a Maildir or a directory of .eml files and converts
+every email into a Gmail API message resource (format='full'), so
+Agent 1 can run offline against an InMemoryGmailService.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import base64
+import mailbox
+from email import message_from_bytes, policy
+from email.header import decode_header, make_header
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+from .gmail_mime import extract_body_text
+from .mail_source_memory import InMemoryGmailService
+from ...utils.hash_utils import hash_string
+
+SNIPPET_LENGTH = 200
+
+
+def open_local_mailbox(path) -> InMemoryGmailService:
+    """Load a local mailbox into an in-memory Gmail service"""
+    messages = []
+    attachments = {}
+    for message, message_attachments in load_local_messages(path):
+        messages.append(message)
+        attachments.update(message_attachments)
+    return InMemoryGmailService(messages, attachments)
+
+
+def load_local_messages(path):
+    """
+    Yield Gmail resources from an mbox file, Maildir or .eml directory
+
+    Args:
+        path: mbox file, single .eml file, Maildir (has cur/new/tmp) or a
+            directory searched recursively for *.eml
+
+    Yields:
+        tuple: (message resource, {attachment_id: {'data', 'size'}})
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Local mailbox not found: {path}")
+
+    if path.is_dir() and (path / 'cur').is_dir():
+        source = (message.as_bytes() for message in mailbox.Maildir(str(path), create=False))
+    elif path.is_dir():
+        source = (eml.read_bytes() for eml in sorted(path.rglob('*.eml')))
+    elif path.suffix.lower() == '.eml':
+        source = [path.read_bytes()]
+    else:
+        source = (message.as_bytes() for message in mailbox.mbox(str(path), create=False))
+
+    for raw in source:
+        yield message_to_resource(message_from_bytes(raw, policy=policy.compat32))
+
+
+def message_to_resource(message) -> tuple:
+    """
+    Convert an email.message.Message to a Gmail message resource
+
+    Attachment parts get an attachmentId instead of inline data, as in
+    the Gmail API; their content is returned separately.
+
+    Returns:
+        tuple: (message resource, {attachment_id: {'data', 'size'}})
+    """
+    message_key = message.get('Message-ID') or message.as_string()[:4096]
+    message_id = hash_string(message_key)[:16]
+    attachments = {}
+    payload = _convert_part(message, message_id, '', attachments)
+
+    thread_key = (message.get('References') or '').split()[:1] or [message.get('In-Reply-To') or message_key]
+    try:
+        internal_date = int(parsedate_to_datetime(message.get('Date')).timestamp() * 1000)
+    except (TypeError, ValueError):
+        internal_date = 0
+
+    resource = {
+        'id': message_id,
+        'threadId': hash_string(thread_key[0])[:16],
+        'labelIds': ['INBOX'],
+        'snippet': ' '.join(extract_body_text(payload, SNIPPET_LENGTH * 4).split())[:SNIPPET_LENGTH],
+        'internalDate': str(internal_date),
+        'payload': payload,
+    }
+    return resource, attachments
+
+
+def _convert_part(part, message_id: str, part_id: str, attachments: dict) -> dict:
+    """Convert one MIME part (recursively) to a Gmail MessagePart"""
+    node = {
+        'partId': part_id,
+        'mimeType': part.get_content_type(),
+        'filename': _decode_header(part.get_filename() or ''),
+        'headers': [{'name': name, 'value': _decode_header(value)} for name, value in part.items()],
+        'body': {'size': 0},
+    }
+    if part.is_multipart():
+        node['parts'] = [
+            _convert_part(child, message_id, f"{part_id}.{i}" if part_id else str(i), attachments)
+            for i, child in enumerate(part.get_payload())
+        ]
+        return node
+
+    data = part.get_payload(decode=True) or b''
+    encoded = base64.urlsafe_b64encode(data).decode()
+    node['body'] = {'size': len(data)}
+    disposition = (part.get('Content-Disposition') or '').lower()
+    if node['filename'] or disposition.startswith('attachment'):
+        attachment_id = f"{message_id}-{part_id or '0'}"
+        node['body']['attachmentId'] = attachment_id
+        attachments[attachment_id] = {'size': len(data), 'data': encoded}
+    else:
+        node['body']['data'] = encoded
+    return node
+
+
+def _decode_header(value) -> str:
+    """Decode RFC 2047 encoded words (=?utf-8?...?=)"""
+    try:
+        return str(make_header(decode_header(str(value))))
+    except (UnicodeDecodeError, LookupError, ValueError):
+        return str(value)
@@ -0,0 +1,145 @@
+"""
+In-Memory Gmail Service
+
+Serves Gmail message resources from memory through the same surface
+Agent 1 uses on the real API: users().messages().list/get/attachments(),
+users().history().list, users().getProfile, labels and batchModify, and
+batch HTTP requests.
+Backs the offline (local mailbox) source, tests and replay benchmarks.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import threading
+from collections import Counter
+from types import SimpleNamespace
+
+from .mail_query import compile_query, index_message
+from .mail_source_http import InMemoryRequest, InMemoryBatch, http_error
+from .mail_source_labels import InMemoryLabels
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+class InMemoryGmailService:
+    """Gmail API service backed by a list of message resources"""
+
+    def __init__(self, messages=(), attachments=None):
+        """
+        Args:
+            messages: Gmail message resources (format='full')
+            attachments: Optional {attachment_id: {'data', 'size'}}
+        """
+        self._lock = threading.Lock()
+        self._messages = {}
+        self._index = {}
+        self._attachments = dict(attachments or {})
+        self._history = []
+        self._base_history_id = self._history_id = 1000
+        self._sorted_ids = None
+        self.calls = Counter()
+        self.labels = InMemoryLabels(self._messages, self._index, self._lock, self.calls)
+        for message in messages:
+            self.add_message(message)
+        # History before the service was loaded is unknown (like an expired historyId)
+        self._base_history_id = self._history_id
+
+    def add_message(self, message: dict, attachments: dict = None):
+        """Deliver a message (recorded in history like a new arrival)"""
+        with self._lock:
+            self._history_id += 1
+            message['historyId'] = str(self._history_id)
+            self._messages[message['id']] = message
+            self._index[message['id']] = index_message(message)
+            self._attachments.update(attachments or {})
+            self._history.append((self._history_id, 'messagesAdded', message['id']))
+            self._sorted_ids = None
+
+    def delete_message(self, message_id: str):
+        """Remove a message (recorded in history as a deletion)"""
+        with self._lock:
+            self._history_id += 1
+            self._messages.pop(message_id, None)
+            self._index.pop(message_id, None)
+            self._history.append((self._history_id, 'messagesDeleted', message_id))
+            self._sorted_ids = None
+
+    def users(self):
+        return SimpleNamespace(
+            messages=lambda: SimpleNamespace(
+                list=lambda **kw: InMemoryRequest(self._list, **kw),
+                get=lambda **kw: InMemoryRequest(self._get, **kw),
+                attachments=lambda: SimpleNamespace(get=lambda **kw: InMemoryRequest(self._get_attachment, **kw)),
+                batchModify=lambda **kw: InMemoryRequest(self.labels.batch_modify, **kw),
+            ),
+            labels=lambda: SimpleNamespace(
+                list=lambda **kw: InMemoryRequest(self.labels.list, **kw),
+                create=lambda **kw: InMemoryRequest(self.labels.create, **kw),
+            ),
+            history=lambda: SimpleNamespace(list=lambda **kw: InMemoryRequest(self._list_history, **kw)),
+            getProfile=lambda **kw: InMemoryRequest(self._get_profile, **kw),
+        )
+
+    def new_batch_http_request(self, callback=None):
+        self.calls['batch'] += 1
+        return InMemoryBatch(callback)
+
+    def _list(self, userId='me', q='', maxResults=DEFAULT_PAGE_SIZE, pageToken=None, **_):
+        self.calls['messages.list'] += 1
+        matches = compile_query(q)
+        with self._lock:
+            if self._sorted_ids is None:
+                self._sorted_ids = sorted(self._index, key=lambda mid: -self._index[mid]['timestamp'])
+            ids = [mid for mid in self._sorted_ids if matches(self._index[mid])]
+
+        start = int(pageToken or 0)
+        end = start + max(1, min(int(maxResults or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+        response = {
+            'messages': [{'id': mid, 'threadId': self._messages[mid]['threadId']} for mid in ids[start:end]],
+            'resultSizeEstimate': len(ids),
+        }
+        if end < len(ids):
+            response['nextPageToken'] = str(end)
+        return response
+
+    def _get(self, userId='me', id=None, format='full', metadataHeaders=None, **_):
+        self.calls['messages.get'] += 1
+        message = self._messages.get(id)
+        if message is None:
+            raise http_error(404, f"Requested entity was not found: {id}")
+        if format == 'full':
+            return message
+        payload = message['payload']
+        result = {key: message.get(key) for key in ('id', 'threadId', 'labelIds', 'snippet', 'historyId', 'internalDate')}
+        if format == 'metadata':
+            wanted = {name.lower() for name in metadataHeaders or []}
+            headers = [h for h in payload['headers'] if not wanted or h['name'].lower() in wanted]
+            result['payload'] = {'mimeType': payload.get('mimeType'), 'headers': headers}
+        return result
+
+    def _get_attachment(self, userId='me', messageId=None, id=None, **_):
+        self.calls['attachments.get'] += 1
+        if id not in self._attachments:
+            raise http_error(404, f"Attachment not found: {id}")
+        return self._attachments[id]
+
+    def _list_history(self, userId='me', startHistoryId=None, pageToken=None, **_):
+        self.calls['history.list'] += 1
+        start = int(startHistoryId)
+        if start < self._base_history_id:
+            raise http_error(404, f"historyId {start} is too old")
+        records = [
+            {'id': str(hid), kind: [{'message': {'id': mid, 'labelIds': self._labels(mid)}}]}
+            for hid, kind, mid in self._history if hid > start
+        ]
+        return {'history': records, 'historyId': str(self._history_id)}
+
+    def _labels(self, message_id: str) -> list:
+        return self._messages.get(message_id, {}).get('labelIds', [])
+
+    def _get_profile(self, userId='me', **_):
+        self.calls['getProfile'] += 1
+        return {'emailAddress': 'me@localhost', 'messagesTotal': len(self._messages),
+                'historyId': str(self._history_id)}
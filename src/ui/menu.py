@@ -70,7 +70,7 @@ def show_agent1_info() -> None:
     console.print("     - Press Enter to search all senders")
     console.print("")
     console.print("  [bold]Max Emails[/bold] (required)")
-    console.print("     - Range: 1-100")
+    console.print("     - 0 = no limit (results are fetched page by page)")
     console.print("     - Default: 10 (press Enter)")
     console.print("")
     console.print("[bold cyan]=====================================================================[/bold cyan]\n")
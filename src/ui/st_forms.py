@@ -26,19 +26,19 @@ def render_agent1_form() -> Optional[Dict[str, Any]]:
                 help="Filter by sender email address (leave empty for all senders)"
             )
         with col2:
-            max_emails = st.slider(
+            max_emails = st.number_input(
                 "Maximum Emails",
-                min_value=1,
-                max_value=100,
+                min_value=0,
                 value=20,
-                help="Maximum number of emails to process (1-100)"
+                step=10,
+                help="Maximum number of emails to process (0 = no limit, results are fetched page by page)"
             )
             st.markdown(f"""
             <div style='padding: 1rem; background-color: #f0f2f6; border-radius: 8px; margin-top: 1rem;'>
                 <strong>📊 Search Preview:</strong><br>
                 • Subject: <code>{email_subject if email_subject else '(all)'}</code><br>
                 • Sender: <code>{sender_email if sender_email else '(all)'}</code><br>
-                • Max: <code>{max_emails}</code> emails
+                • Max: <code>{max_emails or 'no limit'}</code> emails
             </div>
             """, unsafe_allow_html=True)
         submitted = st.form_submit_button("🔍 Search & Extract Emails", use_container_width=True)
@@ -57,7 +57,7 @@ def render_agent1_form() -> Optional[Dict[str, Any]]:
             return {
                 'email_subject': email_subject if email_subject else None,
                 'sender_email': sender_email if sender_email else None,
-                'max_emails': max_emails,
+                'max_emails': int(max_emails),
                 'query': query
             }
     return None
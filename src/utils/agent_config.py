@@ -0,0 +1,104 @@
+"""
+Agent Configuration Models
+
+Pydantic models of the agents: sections of config/settings.yaml. Choice
+settings are Literal types, so a typo fails validation instead of
+silently selecting another mode. Re-exported by config.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class AgentConfig(BaseModel):
+    """Configuration for individual agents"""
+    enabled: bool = True
+
+
+class ExtractionFieldConfig(BaseModel):
+    """Extra field extracted from each email by a regex"""
+    name: str
+    source: str = "body"  # subject, from or body
+    pattern: str
+    group: int = 0
+    ignore_case: bool = False
+
+
+class QuerySpecConfig(BaseModel):
+    """One search of a multi-query Agent 1 run"""
+    name: str = ""
+    email_subject: Optional[str] = None
+    sender_email: Optional[str] = None
+    query: str = ""  # built from subject/sender when empty
+    homework_numbers: str = ""  # e.g. "1-5,8": one search per number ({n} in subject/name/query, else " n" appended)
+
+
+class EmailExtractionConfig(AgentConfig):
+    """Email extraction agent configuration"""
+    batch_size: int = 50
+    incremental_sync: bool = True
+    message_cache: bool = True
+    message_cache_max_entries: int = 20000
+    fetch_workers: int = 1
+    quota_units_per_second: int = 250
+    max_retries: int = 5
+    max_body_bytes: int = 65536
+    max_attachment_bytes: int = 20971520  # Zipped submissions without a GitHub URL (0 = ignored)
+    mail_source: str = "gmail"
+    mail_path: str = ""
+    dedupe_submissions: bool = True
+    label_work_queue: bool = False
+    extracted_label: str = "grader/extracted"
+    drafted_label: str = "grader/drafted"
+    queries: List[QuerySpecConfig] = []
+    queries_file: str = ""
+    query_workers: int = 4
+    list_workers: int = 1
+    list_window_days: int = 30
+    list_since: str = ""
+    subject_pattern: str
+    github_url_pattern: str
+    extra_fields: List[ExtractionFieldConfig] = []
+
+
+class RepositoryAnalysisConfig(AgentConfig):
+    """Repository analysis agent configuration"""
+    max_workers: int = 5  # Clone stage threads (network-bound)
+    count_workers: int = 0  # Counting stage processes (0 = CPU count)
+    pipeline_queue_size: int = 16  # Fetched submissions waiting for a counting process
+    clone_timeout: int = 60  # Seconds for all git work on one repository (Failed: timeout, 0 = no limit)
+    max_repo_bytes: int = 524288000  # Bytes one repository may download (Failed: too_large, 0 = no limit)
+    max_repo_files: int = 20000  # .py files analyzed per repository
+    max_file_bytes: int = 10485760  # Largest single .py file
+    line_limit: int = 150
+    max_zip_bytes: int = 104857600  # Uncompressed .py bytes read from a zipped submission
+    max_zip_entries: int = 10000
+    repo_cache: bool = True  # Bare mirrors in temp/repos/mirrors, updated by shallow fetch
+    repo_cache_bytes: int = 2147483648  # LRU disk budget for the mirrors (0 = unlimited)
+    clone_mode: Literal["lean", "full"] = "lean"  # lean: partial clone + sparse checkout of clone_globs; full: every file
+    clone_globs: List[str] = ["*.py"]
+    analysis_mode: Literal["objects", "checkout"] = "objects"  # objects: read blobs via git cat-file --batch; checkout: working tree
+    # Directories/files kept out of the line counts (gitignore-style), plus the repository's root .gitignore
+    ignore_globs: List[str] = ["venv/", ".venv/", "/env/", "site-packages/", "node_modules/", ".git/", "/build/",
+                               "/dist/", "__pycache__/", ".tox/", ".eggs/", "*.egg-info/"]
+    use_gitignore: bool = True
+    result_cache: bool = True  # Skip repositories whose HEAD commit was already analyzed
+    result_cache_max_entries: int = 20000
+    file_cache: bool = True  # Per-file line counts keyed by git blob SHA (objects mode)
+    file_cache_max_entries: int = 200000
+    similarity: bool = True  # MinHash/LSH near-duplicate detection across runs and homeworks
+    similarity_threshold: float = 0.8  # Estimated Jaccard from which a pair is reported
+    similarity_index_max_entries: int = 100000
+
+
+class LLMFeedbackConfig(AgentConfig):
+    """LLM feedback generation agent configuration"""
+    model: str = "gemini-1.5-flash"
+    max_tokens: int = 500
+    temperature: float = 0.7
+    request_delay: int = 2
+    max_retries: int = 3
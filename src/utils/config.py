@@ -5,7 +5,7 @@ Loads and validates configuration from:
 - .env file (environment variables)
 - config/settings.yaml (application settings)
 
-Uses Pydantic for validation.
+Uses Pydantic for validation. The per-agent models live in agent_config.
 
 Author: Hadar Wayn
 Date: December 2025
@@ -19,37 +19,11 @@ import yaml
 from pydantic import BaseModel, Field, validator
 from dotenv import load_dotenv
 
+from .agent_config import (AgentConfig, EmailExtractionConfig, ExtractionFieldConfig,  # noqa: F401 (re-exported)
+                           LLMFeedbackConfig, QuerySpecConfig, RepositoryAnalysisConfig)
 from .paths import get_project_root, get_config_file, get_secrets_dir
 
 
-class AgentConfig(BaseModel):
-    """Configuration for individual agents"""
-    enabled: bool = True
-
-
-class EmailExtractionConfig(AgentConfig):
-    """Email extraction agent configuration"""
-    batch_size: int = 50
-    subject_pattern: str
-    github_url_pattern: str
-
-
-class RepositoryAnalysisConfig(AgentConfig):
-    """Repository analysis agent configuration"""
-    max_workers: int = 5
-    clone_timeout: int = 60
-    line_limit: int = 150
-
-
-class LLMFeedbackConfig(AgentConfig):
-    """LLM feedback generation agent configuration"""
-    model: str = "gemini-1.5-flash"
-    max_tokens: int = 500
-    temperature: float = 0.7
-    request_delay: int = 2
-    max_retries: int = 3
-
-
 class GradingConfig(BaseModel):
     """Grading configuration"""
     line_limit: int = 150
@@ -62,6 +62,16 @@ def get_repos_dir() -> Path:
     return get_temp_dir() / "repos"
 
 
+def get_cache_dir() -> Path:
+    """Get temp/cache/ directory for persistent agent caches and checkpoints"""
+    return get_temp_dir() / "cache"
+
+
+def get_attachments_dir() -> Path:
+    """Get temp/attachments/ directory for downloaded zip submissions"""
+    return get_temp_dir() / "attachments"
+
+
 def get_secrets_dir() -> Path:
     """Get Secrets/ directory"""
     return get_project_root() / "Secrets"
@@ -93,6 +103,8 @@ def ensure_directories() -> None:
         get_log_config_dir(),
         get_temp_dir(),
         get_repos_dir(),
+        get_cache_dir(),
+        get_attachments_dir(),
         get_secrets_dir(),
         get_data_dir(),
         get_config_dir(),
@@ -76,12 +76,14 @@ def extract_github_url(text: str) -> Optional[str]:
     return None
 
 
-def extract_homework_number(subject: str) -> Optional[int]:
+def extract_homework_number(subject: str, pattern: Optional[re.Pattern] = None) -> Optional[int]:
     """
     Extract homework number from email subject
 
     Args:
         subject: Email subject line
+        pattern: Optional compiled subject pattern whose group 1 is the
+            homework number (defaults to SUBJECT_PATTERN)
 
     Returns:
         Optional[int]: Homework number if found, None otherwise
@@ -89,7 +91,7 @@ def extract_homework_number(subject: str) -> Optional[int]:
     if not subject:
         return None
 
-    match = SUBJECT_PATTERN.search(subject)
+    match = (pattern or SUBJECT_PATTERN).search(subject)
     if match:
         try:
             return int(match.group(1))
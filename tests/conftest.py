@@ -0,0 +1,149 @@
+"""
+Shared test fixtures and helpers
+
+A fake Gmail service (no network) for the Agent 1 tests, and git
+repositories, the mirror directory and zip archives for the Agent 2 tests.
+
+- make_message, FakeGmailService, build_service: the Agent 1 extraction,
+  sync and query tests and the Gmail batch, pagination, label, rate
+  limiter and sharded search tests
+- repos_dir, AUTHOR, commit_files: the repository cache, budget, ignore,
+  object database, file/result cache, pipeline and similarity tests
+- make_zip: the zip attachment tests and the Agent 2 tests that grade
+  zip submissions
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import base64
+import io
+import sys
+import zipfile
+from pathlib import Path
+
+import git
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.ui.agents.agent2_repo_cache as repo_cache
+
+AUTHOR = git.Actor("Student", "student@example.com")
+
+
+def make_message(message_id: str, subject: str, body: str) -> dict:
+    """Build a minimal full-format Gmail message"""
+    return {
+        'id': message_id,
+        'threadId': f"thread_{message_id}",
+        'payload': {
+            'headers': [
+                {'name': 'From', 'value': f"Student <{message_id}@example.com>"},
+                {'name': 'Subject', 'value': subject},
+                {'name': 'Date', 'value': 'Mon, 01 Dec 2025 10:00:00 +0000'},
+            ],
+            'body': {'data': base64.urlsafe_b64encode(body.encode()).decode()}
+        }
+    }
+
+
+class FakeRequest:
+    def __init__(self, service, message_id, msg_format='full', metadata_headers=None):
+        self.service = service
+        self.message_id = message_id
+        self.msg_format = msg_format
+        self.metadata_headers = metadata_headers
+
+    def execute(self):
+        self.service.http_calls += 1
+        return self.resolve()
+
+    def resolve(self):
+        self.service.fetched[self.msg_format] += 1
+        msg = self.service.resolve(self.message_id)
+        if self.msg_format != 'metadata':
+            return msg
+        headers = [h for h in msg['payload']['headers'] if h['name'] in (self.metadata_headers or [])]
+        return {'id': msg['id'], 'threadId': msg['threadId'], 'payload': {'headers': headers}}
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.service.http_calls += 1
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, request.resolve(), None)
+            except Exception as e:
+                self.callback(request_id, None, e)
+
+
+class FakeGmailService:
+    def __init__(self, messages: dict, broken_ids=()):
+        self.messages_by_id = messages
+        self.broken_ids = set(broken_ids)
+        self.http_calls = 0
+        self.fetched = {'full': 0, 'metadata': 0}
+
+    def resolve(self, message_id):
+        if message_id in self.broken_ids:
+            raise RuntimeError(f"404 {message_id}")
+        return self.messages_by_id[message_id]
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def get(self, userId, id, format, metadataHeaders=None):
+        return FakeRequest(self, id, format, metadataHeaders)
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+
+def build_service(count: int, broken_ids=()) -> FakeGmailService:
+    """Fake service holding emails m0..m<count-1> ("Homework <i>", one GitHub URL each)"""
+    messages = {
+        f"m{i}": make_message(f"m{i}", f"Homework {i}", f"repo https://github.com/s{i}/hw{i}")
+        for i in range(count)
+    }
+    return FakeGmailService(messages, broken_ids)
+
+
+@pytest.fixture
+def repos_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(repo_cache, 'get_repos_dir', lambda: tmp_path / "repos")
+    return tmp_path / "repos"
+
+
+def commit_files(repo: git.Repo, files: dict, removed: tuple = ()):
+    """Write files into the repository's working tree (removing others) and commit them"""
+    for name, content in files.items():
+        path = Path(repo.working_tree_dir) / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+    repo.index.add(list(files))
+    if removed:
+        repo.index.remove(list(removed), working_tree=True)
+    repo.index.commit("update", author=AUTHOR, committer=AUTHOR)
+
+
+def make_zip(files: dict) -> bytes:
+    """In-memory zip archive of {name: str or bytes content}"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
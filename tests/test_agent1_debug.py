@@ -44,7 +44,7 @@ if success:
 
         print("\nFirst 10 email subjects:")
         for i, row in enumerate(ws.iter_rows(min_row=2, max_row=11, values_only=True), 1):
-            email_id, received_time, subject, sender, github_url, thread_id, status = row
+            email_id, received_time, subject, sender, github_url, thread_id, status = row[:7]
             print(f"{i}. Subject: {subject}")
     else:
         print("\n[!] Excel1.xlsx not found!")
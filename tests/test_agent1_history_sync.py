@@ -0,0 +1,143 @@
+"""
+Test Agent 1 incremental sync with historyId checkpoints
+
+Uses a fake Gmail service (no network) with a mutable mailbox to verify
+that a second run only fetches emails added since the checkpoint and
+falls back to a full scan when the checkpoint has expired.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from googleapiclient.errors import HttpError
+from httplib2 import Response
+
+import src.ui.agents.agent1_history_sync as history_sync
+from src.ui.agents.agent1_sync import collect_submissions, save_sync_checkpoint
+from tests.conftest import FakeGmailService, make_message
+
+PARAMS = {'email_subject': 'Homework', 'sender_email': None, 'max_emails': 0, 'query': 'subject:Homework'}
+
+
+class FakeExecute:
+    def __init__(self, func):
+        self.func = func
+
+    def execute(self):
+        return self.func()
+
+
+class FakeHistory:
+    def __init__(self, mailbox):
+        self.mailbox = mailbox
+
+    def list(self, userId, startHistoryId, historyTypes, pageToken=None):
+        def run():
+            if int(startHistoryId) < self.mailbox.oldest_history_id:
+                raise HttpError(Response({'status': 404}), b'{"error": "not found"}')
+            added = [
+                {'messagesAdded': [{'message': {'id': mid, 'labelIds': ['INBOX']}}]}
+                for mid, history_id in self.mailbox.added_at.items() if history_id > int(startHistoryId)
+            ]
+            return {'history': added}
+        return FakeExecute(run)
+
+
+class FakeMailbox(FakeGmailService):
+    def __init__(self):
+        super().__init__({})
+        self.history_id = 100
+        self.oldest_history_id = 0
+        self.added_at = {}
+        self.list_calls = 0
+        self.profile_calls = 0
+
+    def add(self, message_id: str, subject: str):
+        self.history_id += 1
+        self.messages_by_id[message_id] = make_message(message_id, subject, f"https://github.com/{message_id}/hw")
+        self.added_at[message_id] = self.history_id
+
+    def getProfile(self, userId):
+        self.profile_calls += 1
+        return FakeExecute(lambda: {'historyId': str(self.history_id)})
+
+    def history(self):
+        return FakeHistory(self)
+
+    def list(self, userId, q, maxResults, pageToken=None):
+        self.list_calls += 1
+        ids = sorted(self.messages_by_id, key=self.added_at.get, reverse=True)
+        return FakeExecute(lambda: {'messages': [{'id': mid} for mid in ids[:maxResults]]})
+
+
+def _run(mailbox, params: dict = PARAMS):
+    submissions, history_id = collect_submissions(mailbox, params, batch_size=50)
+    save_sync_checkpoint(params, history_id, submissions)
+    return submissions
+
+
+def test_second_run_fetches_only_new_emails(tmp_path, monkeypatch):
+    monkeypatch.setattr(history_sync, 'get_cache_dir', lambda: tmp_path)
+    mailbox = FakeMailbox()
+    for i in range(5):
+        mailbox.add(f"m{i}", f"Homework {i}")
+
+    assert len(_run(mailbox)) == 5
+    assert mailbox.list_calls == 1
+
+    mailbox.add("m5", "Homework 5")
+    mailbox.add("m6", "Unrelated newsletter")
+    mailbox.fetched = {'full': 0, 'metadata': 0}
+    submissions = _run(mailbox)
+
+    assert mailbox.list_calls == 1
+    assert mailbox.fetched == {'metadata': 2, 'full': 1}
+    assert len(submissions) == 6
+    assert submissions[0]['message_id'] == "m5"
+
+
+def test_expired_checkpoint_falls_back_to_full_scan(tmp_path, monkeypatch):
+    monkeypatch.setattr(history_sync, 'get_cache_dir', lambda: tmp_path)
+    mailbox = FakeMailbox()
+    mailbox.add("m0", "Homework 0")
+    _run(mailbox)
+
+    mailbox.add("m1", "Homework 1")
+    mailbox.oldest_history_id = mailbox.history_id
+    submissions = _run(mailbox)
+
+    assert mailbox.list_calls == 2
+    assert {s['message_id'] for s in submissions} == {"m0", "m1"}
+
+
+def test_incremental_disabled_always_scans(tmp_path, monkeypatch):
+    monkeypatch.setattr(history_sync, 'get_cache_dir', lambda: tmp_path)
+    mailbox = FakeMailbox()
+    mailbox.add("m0", "Homework 0")
+    _run(mailbox)
+
+    _, history_id = collect_submissions(mailbox, PARAMS, batch_size=50, incremental=False)
+    assert mailbox.list_calls == 2
+    assert (history_id, mailbox.profile_calls) == (None, 1)  # No getProfile call without a checkpoint to save
+
+
+def test_higher_email_cap_rescans(tmp_path, monkeypatch):
+    """Rows saved under a lower max_emails do not stand in for older mail"""
+    monkeypatch.setattr(history_sync, 'get_cache_dir', lambda: tmp_path)
+    mailbox = FakeMailbox()
+    for i in range(8):
+        mailbox.add(f"m{i}", f"Homework {i}")
+
+    assert len(_run(mailbox, {**PARAMS, 'max_emails': 3})) == 3
+    assert len(_run(mailbox, {**PARAMS, 'max_emails': 2})) == 2  # Within the saved cap: incremental
+    assert mailbox.list_calls == 1
+    assert len(_run(mailbox, {**PARAMS, 'max_emails': 0})) == 8
+    assert len(_run(mailbox, {**PARAMS, 'max_emails': 5})) == 5
+    assert mailbox.list_calls == 2
@@ -0,0 +1,74 @@
+"""
+Test the persistent parsed-message cache used by Agent 1
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.sqlite_cache import SQLiteCache
+from src.ui.agents.agent1_email_parser import extract_email_data
+from tests.conftest import build_service
+
+
+def test_lru_eviction_and_counters(tmp_path):
+    """Entries beyond max_entries are evicted least recently used first"""
+    cache = SQLiteCache(tmp_path / "cache.sqlite", max_entries=3)
+    cache.set_many({'a': 1, 'b': 2, 'c': 3})
+    cache.get('a')
+    cache.set('d', 4)
+
+    assert cache.get('b') is None
+    assert cache.get_many(['a', 'c', 'd']) == {'a': 1, 'c': 3, 'd': 4}
+    stats = cache.stats()
+    assert stats['hits'] == 4
+    assert stats['misses'] == 1
+    assert stats['entries'] == 3
+    cache.close()
+
+
+def test_cached_emails_skip_the_api(tmp_path):
+    """A second extraction of the same emails makes no Gmail calls"""
+    cache = SQLiteCache(tmp_path / "messages.sqlite", table="messages")
+    messages = [{'id': f"m{i}"} for i in range(6)]
+
+    first = extract_email_data(build_service(6), messages, "Homework", batch_size=50, cache=cache)
+    service = build_service(6)
+    second = extract_email_data(service, messages, "Homework", batch_size=50, cache=cache)
+
+    assert service.http_calls == 0
+    assert sorted(s['email_id'] for s in second) == sorted(s['email_id'] for s in first)
+    assert cache.hits == 6
+    cache.close()
+
+
+def test_cache_hits_still_respect_subject_filter(tmp_path):
+    """Cached records that don't match the current filter are left out"""
+    cache = SQLiteCache(tmp_path / "messages.sqlite", table="messages")
+    messages = [{'id': f"m{i}"} for i in range(3)]
+    extract_email_data(build_service(3), messages, None, batch_size=50, cache=cache)
+
+    service = build_service(3)
+    submissions = extract_email_data(service, messages, "Homework 1", batch_size=50, cache=cache)
+
+    assert [s['email_subject'] for s in submissions] == ["Homework 1"]
+    assert service.http_calls == 0
+    cache.close()
+
+
+def test_cached_and_fetched_rows_keep_listing_order(tmp_path):
+    """Cache hits are not appended after the newly fetched emails"""
+    cache = SQLiteCache(tmp_path / "messages.sqlite", table="messages")
+    messages = [{'id': f"m{i}"} for i in range(6)]
+    extract_email_data(build_service(6), messages[1::2], None, batch_size=50, cache=cache)
+
+    submissions = extract_email_data(build_service(6), messages, None, batch_size=50, cache=cache)
+    assert [s['message_id'] for s in submissions] == [m['id'] for m in messages]
+    assert cache.hits == 3
+    cache.close()
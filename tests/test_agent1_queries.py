@@ -0,0 +1,94 @@
+"""
+Test the Agent 1 multi-query fan-out
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.ui.agents.agent1_sync as sync
+from src.ui.agents.agent1_queries import expand_query_specs, fan_out_queries, load_query_specs, parse_number_ranges
+from src.ui.agents.agent1_pipeline import run_extraction
+from src.ui.agents.mail_source_memory import InMemoryGmailService
+from tests.conftest import make_message
+
+
+def test_number_ranges_and_spec_expansion():
+    """Ranges expand into one search each; {n} is filled or the number appended after a space"""
+    assert parse_number_ranges("1-3, 7,3") == [1, 2, 3, 7]
+    specs = expand_query_specs([
+        {'name': "L{n}", 'email_subject': "Homework - L{n}", 'homework_numbers': "4-5"},
+        {'sender_email': "ta@uni.ac.il"},
+        {'email_subject': "HW", 'homework_numbers': "1"},
+    ])
+
+    assert [s['name'] for s in specs] == ["L4", "L5", "ta@uni.ac.il", "HW 1"]
+    assert [s['email_subject'] for s in specs] == ["Homework - L4", "Homework - L5", None, "HW 1"]
+    assert specs[2]['query'] == "from:ta@uni.ac.il"
+    assert [s['homework_number'] for s in specs] == [4, 5, None, 1]
+
+
+def test_specs_from_yaml_file(tmp_path):
+    """A YAML file may hold a list or a mapping with a queries list"""
+    path = tmp_path / "queries.yaml"
+    path.write_text("queries:\n  - {name: late, query: 'subject:late'}\n", encoding='utf-8')
+    assert expand_query_specs(load_query_specs(path))[0]['query'] == "subject:late"
+
+
+def test_fan_out_merges_and_tags():
+    """Searches run concurrently; overlapping results are merged and tagged"""
+    service = InMemoryGmailService([
+        make_message(mid, subject, f"https://github.com/{mid}/repo")
+        for mid, subject in [("m1", "Self check of homework 1"), ("m10", "Self check of homework 10"),
+                             ("m2", "Self check of homework 2"), ("x", "Newsletter")]
+    ])
+    built = []
+
+    def factory():
+        built.append(1)
+        return service
+
+    params = {'mail_source': service, 'max_emails': 0, 'queries': [
+        {'name': "HW{n}", 'email_subject': "Self check of homework ", 'homework_numbers': "1-2"},
+        {'name': "from m2", 'sender_email': "m2@example.com"},
+    ]}
+    submissions, checkpoints = run_extraction(service, params, factory)
+
+    assert checkpoints == []
+    assert {s['message_id']: s['query'] for s in submissions} == {'m1': "HW1", 'm2': "HW2, from m2"}
+    assert len(built) == 3
+
+
+def test_fan_out_leaves_checkpoints_to_the_caller(monkeypatch):
+    """Each search's checkpoint is returned, not saved before Excel1.xlsx is written"""
+    saved = []
+    monkeypatch.setattr(sync, 'save_checkpoint', lambda *args: saved.append(args))
+    specs = expand_query_specs([{'name': "HW{n}", 'email_subject': "HW{n}", 'homework_numbers': "1-2"}])
+
+    def collect(service, query_params):
+        return [{'email_id': query_params['email_subject'], 'received_time': None}], f"h-{query_params['query']}"
+
+    submissions, checkpoints = fan_out_queries(None, {}, specs, collect)
+    assert saved == []
+    assert [(p['email_subject'], history_id, [r['email_id'] for r in rows]) for p, history_id, rows in checkpoints] \
+        == [("HW1", "h-subject:HW1", ["HW1"]), ("HW2", "h-subject:HW2", ["HW2"])]
+    assert len(submissions) == 2
+
+
+def test_subject_template_number_must_not_continue():
+    """An L1 search drops the L10-L19 emails its subject substring also matched"""
+    specs = expand_query_specs([{'name': "L{n}", 'email_subject': "Homework - L{n}", 'homework_numbers': "1"}])
+    subjects = ["Homework - L1", "homework - l1 (late)", "Homework - L10", "Homework - L12 fix", ""]
+
+    def collect(service, query_params):
+        return [{'email_id': f"e{i}", 'email_subject': subject, 'received_time': None}
+                for i, subject in enumerate(subjects)], None
+
+    submissions, _ = fan_out_queries(None, {}, specs, collect)
+    assert sorted(s['email_id'] for s in submissions) == ["e0", "e1", "e4"]
@@ -0,0 +1,92 @@
+"""
+Test the precompiled Agent 1 extraction rule engine
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import re
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.config import EmailExtractionConfig
+from src.utils.validators import SUBJECT_PATTERN, GITHUB_URL_PATTERN
+from src.ui.agents.agent1_rules import ExtractionRules, FieldRule
+from src.ui.agents.agent1_message_parser import parse_message
+from tests.conftest import make_message
+
+
+def _settings(**extra) -> EmailExtractionConfig:
+    return EmailExtractionConfig(
+        subject_pattern=SUBJECT_PATTERN.pattern,
+        github_url_pattern=GITHUB_URL_PATTERN.pattern,
+        **extra
+    )
+
+
+def test_settings_patterns_reuse_validator_objects():
+    """Identical configured patterns are not compiled a second time"""
+    rules = ExtractionRules.from_settings(_settings())
+    assert rules.subject_pattern is SUBJECT_PATTERN
+    assert rules.rules[0].pattern is GITHUB_URL_PATTERN
+
+
+def test_evaluate_returns_fields_and_matched_rules():
+    """Homework number, GitHub URL and extra fields come from one evaluation"""
+    rules = ExtractionRules.from_settings(_settings(extra_fields=[
+        {'name': 'student_id', 'source': 'body', 'pattern': r'ID:\s*(\d{9})', 'group': 1},
+        {'name': 'domain', 'source': 'from', 'pattern': r'@([\w.]+)', 'group': 1},
+        {'name': 'late', 'source': 'subject', 'pattern': r'\blate\b', 'ignore_case': True},
+    ]))
+    fields = rules.evaluate(
+        "Self Check of Homework 7",
+        "Student <s@uni.ac.il>",
+        "ID: 123456789\nrepo https://github.com/alice/hw7.git thanks"
+    )
+
+    assert fields['homework_number'] == 7
+    assert fields['github_url'] == "https://github.com/alice/hw7.git"
+    assert fields['student_id'] == "123456789"
+    assert fields['domain'] == "uni.ac.il"
+    assert fields['late'] == ''
+    assert fields['matched_rules'] == ['github_url', 'student_id', 'domain']
+
+
+def test_rule_groups_are_independent_of_combined_scan():
+    """Each rule's group numbers refer to its own pattern"""
+    rules = ExtractionRules(extra_fields=[
+        FieldRule('grade', 'body', re.compile(r'(grade|score)\s*=\s*(\d+)'), 2),
+    ])
+    fields = rules.evaluate('', '', "score = 93 see https://github.com/a/b")
+    assert fields['grade'] == "93"
+    assert fields['github_url'] == "https://github.com/a/b"
+
+
+def test_overlapping_rules_both_match():
+    """A rule matching inside text an earlier rule claimed is still found"""
+    rules = ExtractionRules(extra_fields=[
+        FieldRule('repo_owner', 'body', re.compile(r'github\.com/([\w-]+)'), 1),
+        FieldRule('missing', 'body', re.compile(r'ID:\s*\d+')),
+    ])
+    fields = rules.evaluate('', '', "my repo: https://github.com/alice/hw7")
+    assert fields['github_url'] == "https://github.com/alice/hw7"
+    assert fields['repo_owner'] == "alice"
+    assert fields['missing'] == ''
+    assert fields['matched_rules'] == ['github_url', 'repo_owner']
+
+
+def test_parse_message_uses_rules():
+    """Submissions carry the structured fields; a custom URL rule is honoured"""
+    rules = ExtractionRules(github_url_pattern=re.compile(r'https://gitlab\.com/\S+'))
+    msg = make_message("m1", "self check of homework 12", "see https://gitlab.com/a/b")
+    submission = parse_message(msg, rules=rules)
+
+    assert submission['github_url'] == "https://gitlab.com/a/b"
+    assert submission['status'] == "Ready"
+    assert submission['homework_number'] == 12
+    assert submission['matched_rules'] == ['github_url']
+    assert submission['extra_fields'] == {}
@@ -0,0 +1,93 @@
+"""
+Test the Agent 1 submission index (dedupe and latest-per-student)
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.hash_utils import generate_email_id
+from src.ui.agents.agent1_submission_index import SubmissionIndex, student_key
+from src.ui.agents.agent1_message_parser import parse_message
+from tests.conftest import make_message
+
+
+def _row(message_id: str, sender: str, received: str, homework=3, status="Ready", subject="Homework") -> dict:
+    return {
+        'message_id': message_id,
+        'email_id': f"id_{message_id}",
+        'received_time': received,
+        'email_subject': subject,
+        'sender_email': sender,
+        'github_url': f"https://github.com/x/{message_id}",
+        'thread_id': f"t_{message_id}",
+        'status': status,
+        'homework_number': homework,
+    }
+
+
+def test_latest_resubmission_wins_within_a_run(tmp_path):
+    """Older Ready rows of the same student and homework are superseded"""
+    index = SubmissionIndex(tmp_path / "index.sqlite")
+    rows = [
+        _row("m1", "Alice@Uni.ac.il", "2025-12-01T10:00:00+02:00"),
+        _row("m2", "alice@uni.ac.il ", "2025-12-01T09:30:00+00:00"),  # later in UTC
+        _row("m3", "bob@uni.ac.il", "2025-12-01T08:00:00+00:00"),
+        _row("m4", "alice@uni.ac.il", "2025-12-02T08:00:00+00:00", status="Missing: github_url"),
+        _row("m2", "alice@uni.ac.il", "2025-12-01T09:30:00+00:00"),
+    ]
+    resolved = {s['message_id']: s['status'] for s in index.resolve(rows)}
+    index.close()
+
+    assert len(resolved) == 4
+    assert resolved == {
+        'm1': "Superseded: id_m2", 'm2': "Ready", 'm3': "Ready", 'm4': "Missing: github_url"
+    }
+
+
+def test_index_persists_across_runs(tmp_path):
+    """A submission older than one seen in a previous run is superseded"""
+    index = SubmissionIndex(tmp_path / "index.sqlite")
+    index.resolve([_row("new", "alice@uni.ac.il", "2025-12-05T10:00:00+00:00")])
+    index.close()
+
+    index = SubmissionIndex(tmp_path / "index.sqlite")
+    old = index.resolve([_row("old", "alice@uni.ac.il", "2025-12-01T10:00:00+00:00"),
+                         _row("hw4", "alice@uni.ac.il", "2025-12-01T10:00:00+00:00", homework=4)])
+    index.close()
+
+    assert [s['status'] for s in old] == ["Superseded: id_new", "Ready"]
+
+
+def test_known_messages_keep_their_email_id(tmp_path):
+    """A message indexed earlier keeps its recorded email_id"""
+    index = SubmissionIndex(tmp_path / "index.sqlite")
+    index.resolve([_row("m1", "alice@uni.ac.il", "2025-12-01T10:00:00+00:00")])
+    row = _row("m1", "alice@uni.ac.il", "2025-12-01T10:00:00+00:00")
+    row['email_id'] = "recomputed"
+    resolved = index.resolve([row])
+    index.close()
+
+    assert resolved[0]['email_id'] == "id_m1"
+    assert resolved[0]['status'] == "Ready"
+
+
+def test_subject_key_when_no_homework_number():
+    """Reply prefixes and spacing don't split one homework into two keys"""
+    first = _row("a", "a@x.com", "", homework=None, subject="Homework - L3")
+    reply = _row("b", "a@x.com", "", homework=None, subject="RE: Fwd:  homework -  L3")
+    assert student_key(first) == student_key(reply)
+
+
+def test_parser_uses_shared_email_id():
+    """email_id comes from hash_utils.generate_email_id"""
+    submission = parse_message(make_message("m1", "Homework 1", "https://github.com/a/b"))
+    assert submission['email_id'] == generate_email_id(
+        submission['sender_email'], submission['email_subject'], submission['received_time']
+    )
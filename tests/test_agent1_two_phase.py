@@ -0,0 +1,62 @@
+"""
+Test Agent 1 two-phase fetch (metadata first, bodies only for matches)
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.ui.agents.agent1_email_parser import extract_email_data
+from tests.conftest import FakeGmailService, make_message
+
+
+def _noisy_inbox() -> FakeGmailService:
+    """10 emails, only 3 of which are homework submissions"""
+    messages = {}
+    for i in range(10):
+        subject = f"AI Development Expert course - Homework - L{i}" if i % 4 == 0 else f"Course newsletter {i}"
+        messages[f"m{i}"] = make_message(f"m{i}", subject, f"https://github.com/s{i}/hw")
+    return FakeGmailService(messages)
+
+
+def test_bodies_fetched_only_for_matching_subjects():
+    """Non-matching emails are dropped after the metadata phase"""
+    service = _noisy_inbox()
+    messages = [{'id': f"m{i}"} for i in range(10)]
+    submissions = extract_email_data(service, messages, "homework - l", batch_size=50)
+
+    assert service.fetched == {'metadata': 10, 'full': 3}
+    assert len(submissions) == 3
+    assert all(s['status'] == "Ready" for s in submissions)
+
+
+def test_no_subject_filter_skips_metadata_phase():
+    """Without a subject filter every email is fetched in full once"""
+    service = _noisy_inbox()
+    extract_email_data(service, [{'id': f"m{i}"} for i in range(10)], None, batch_size=50)
+    assert service.fetched == {'metadata': 0, 'full': 10}
+
+
+def test_metadata_failures_become_error_rows():
+    """An email whose metadata cannot be fetched yields an error row"""
+    service = _noisy_inbox()
+    service.broken_ids = {'m4'}
+    submissions = extract_email_data(service, [{'id': f"m{i}"} for i in range(10)], "Homework", batch_size=50)
+
+    errors = [s for s in submissions if s['status'].startswith("Error:")]
+    assert len(errors) == 1
+    assert errors[0]['email_id'] == "error_metadata_1"
+    assert service.fetched['full'] == 2
+
+
+if __name__ == "__main__":
+    test_bodies_fetched_only_for_matching_subjects()
+    test_no_subject_filter_skips_metadata_phase()
+    test_metadata_failures_become_error_rows()
+    print("[+] All two-phase fetch tests passed!")
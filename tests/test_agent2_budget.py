@@ -0,0 +1,94 @@
+"""
+Test Agent 2 per-repository budgets (timeout, download size, files)
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import git
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.ui.agents.agent2_repo_cache as repo_cache
+from src.ui.agents.agent2_cat_file import CatFileBatch
+from src.ui.agents.agent2_git import run_git
+from src.ui.agents.agent2_repo_analyzer import analyze_repository
+from tests.conftest import AUTHOR, commit_files
+
+HANG = "sleep 31.7"  # Distinctive, to find leftover processes
+
+
+def _running(command: str) -> bool:
+    listing = subprocess.run(['ps', '-eo', 'args'], capture_output=True, text=True).stdout
+    return any(line.strip() == command for line in listing.splitlines())
+
+
+def test_hung_git_is_killed_at_the_deadline(tmp_path, repos_dir, monkeypatch):
+    """A git process (and the helpers it spawned) that outlives clone_timeout is killed"""
+    settings = repo_cache.get_settings().repository_analysis
+    monkeypatch.setattr(settings, 'clone_timeout', 1)
+    monkeypatch.setattr(repo_cache, 'fetch_mirror', lambda *args: run_git(['-c', f'alias.hang=!{HANG}', 'hang']))
+
+    start = time.monotonic()
+    result = analyze_repository("hung-email", "https://github.com/student/huge")
+    assert result['status'] == 'Failed: timeout'
+    assert time.monotonic() - start < 10
+    if os.name == 'posix':
+        assert not _running(HANG)
+
+
+def test_hung_cat_file_is_killed_at_the_deadline(tmp_path, repos_dir, monkeypatch):
+    """The long-lived blob reader is held to the same deadline, with its process group"""
+    commit_files(git.Repo.init(tmp_path / "remote"), {'main.py': "a\n"})
+    settings = repo_cache.get_settings().repository_analysis
+    monkeypatch.setattr(settings, 'analysis_mode', 'objects')
+    monkeypatch.setattr(settings, 'clone_timeout', 1)
+    monkeypatch.setattr(CatFileBatch, 'COMMAND', ['git', '-c', f'alias.hang=!{HANG}', 'hang'])
+
+    start = time.monotonic()
+    result = analyze_repository("hung-email", (tmp_path / "remote").as_uri())
+    assert result['status'] == 'Failed: timeout'
+    assert time.monotonic() - start < 10
+    if os.name == 'posix':
+        assert not _running(HANG)
+
+
+def test_download_cap_fails_and_discards_the_mirror(tmp_path, repos_dir, monkeypatch):
+    """A repository that grows its mirror past max_repo_bytes fails as too_large"""
+    remote = git.Repo.init(tmp_path / "remote")
+    commit_files(remote, {'main.py': "a\n"})
+    (tmp_path / "remote" / "blob.bin").write_bytes(os.urandom(2 * 1024 * 1024))
+    remote.index.add(['blob.bin'])
+    remote.index.commit("data", author=AUTHOR, committer=AUTHOR)
+    url = (tmp_path / "remote").as_uri()
+    settings = repo_cache.get_settings().repository_analysis
+    monkeypatch.setattr(settings, 'clone_mode', 'full')
+    monkeypatch.setattr(settings, 'max_repo_bytes', 1024 * 1024)
+
+    assert analyze_repository("big-email", url)['status'] == 'Failed: too_large'
+    assert not repo_cache.mirror_dir(url).exists()
+    monkeypatch.setattr(settings, 'max_repo_bytes', 0)
+    assert analyze_repository("big-email", url)['status'] == 'Ready'
+
+
+def test_file_count_and_size_limits(tmp_path, repos_dir, monkeypatch):
+    """Too many .py files, or one too large, fail in both analysis modes"""
+    remote = git.Repo.init(tmp_path / "remote")
+    commit_files(remote, {'a.py': "x\n", 'b.py': "y = 1\n" * 100})
+    url = (tmp_path / "remote").as_uri()
+    settings = repo_cache.get_settings().repository_analysis
+
+    for mode in ("objects", "checkout"):
+        monkeypatch.setattr(settings, 'analysis_mode', mode)
+        for limits, status in [((1, 0), 'Failed: too_large'), ((2, 100), 'Failed: too_large'), ((2, 600), 'Ready')]:
+            monkeypatch.setattr(settings, 'max_repo_files', limits[0])
+            monkeypatch.setattr(settings, 'max_file_bytes', limits[1])
+            assert analyze_repository(f"{mode}-email", url)['status'] == status, (mode, limits)
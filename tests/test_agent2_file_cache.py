@@ -0,0 +1,90 @@
+"""
+Test the Agent 2 per-file metrics cache
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import sys
+from pathlib import Path
+
+import git
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.ui.agents.agent2_file_cache as file_cache
+import src.ui.agents.agent2_object_db as object_db
+import src.ui.agents.agent2_pipeline as pipeline
+import src.ui.agents.agent2_stats as stats
+from src.utils.config import get_settings
+from tests.conftest import commit_files
+
+ROW_KEYS = ('status', 'total_files', 'total_lines', 'compliant_lines', 'grade', 'commit_sha')
+TEMPLATE = {'main.py': "import app\n", 'app/core.py': "x = 1\n" * 151, 'app/util.py': "y\r\nz\r\n"}
+
+
+@pytest.fixture
+def settings(repos_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(file_cache, 'get_cache_dir', lambda: tmp_path / "cache")
+    settings = get_settings().repository_analysis
+    monkeypatch.setattr(settings, 'result_cache', False)
+    monkeypatch.setattr(settings, 'analysis_mode', 'objects')
+    stats.file_cache_summary(reset=True)
+    return settings
+
+
+def _remote(path: Path, files: dict) -> str:
+    remote = git.Repo.init(path)
+    remote.git.config('uploadpack.allowFilter', 'true')
+    commit_files(remote, files)
+    return path.as_uri()
+
+
+def test_template_files_are_not_downloaded_twice(tmp_path, settings, monkeypatch):
+    """A second fork of the template fetches and counts only its own files"""
+    first = _remote(tmp_path / "first", {**TEMPLATE, 'hw.py': "a\n"})
+    second = _remote(tmp_path / "second", {**TEMPLATE, 'hw.py': "b\nc\n"})
+    fetched = []
+    prefetch = object_db.prefetch_blobs
+    monkeypatch.setattr(object_db, 'prefetch_blobs', lambda *args: fetched.append(prefetch(*args)) or fetched[-1])
+
+    [one] = pipeline.run_analysis([{'email_id': "first-email", 'github_url': first}], 1, 1)
+    [two] = pipeline.run_analysis([{'email_id': "second-email", 'github_url': second}], 1, 1)
+    assert (one['total_files'], one['total_lines']) == (4, 155)
+    assert (two['total_files'], two['total_lines']) == (4, 156)
+    assert fetched == [4, 1]
+    assert stats.file_cache_summary() == "File metrics cache hits: 3/8 (37.5%), 5/200000 entries"
+
+
+def test_cache_is_lru_bounded(tmp_path, monkeypatch):
+    """Least recently looked up files are evicted first"""
+    monkeypatch.setattr(file_cache, 'get_cache_dir', lambda: tmp_path)
+    cache = file_cache.open_file_cache(max_entries=2)
+    file_cache.store_file_metrics(cache, {file_cache.FILE_METRICS_KEY: [("a" * 40, {'lines': 3})]})
+    file_cache.store_file_metrics(cache, {file_cache.FILE_METRICS_KEY: [("b" * 40, {'lines': 5})]})
+    assert file_cache.lookup_files(cache, ["a" * 40]) == {"a" * 40: {'lines': 3}}
+    file_cache.store_file_metrics(cache, {file_cache.FILE_METRICS_KEY: [("c" * 40, {'lines': 7})]})
+    found = file_cache.lookup_files(cache, ["a" * 40, "b" * 40, "c" * 40])
+    assert found == {"a" * 40: {'lines': 3}, "c" * 40: {'lines': 7}}
+    assert file_cache.lookup_files(cache, ["a" * 40], signatures=True) == {}
+    assert cache.stats()['entries'] == 2
+    file_cache.close_file_cache(cache)
+
+
+def test_cached_metrics_match_counted(tmp_path, settings, monkeypatch):
+    """Rows graded from cached line counts equal rows counted from scratch"""
+    url = _remote(tmp_path / "remote", {**TEMPLATE, 'hw.py': "1\n2"})
+    rows = [{'email_id': "repo-email", 'github_url': url}]
+
+    results = []
+    for enabled in (False, True, True):
+        monkeypatch.setattr(settings, 'file_cache', enabled)
+        [result] = pipeline.run_analysis(rows, 1, 1)
+        results.append(tuple(result[key] for key in ROW_KEYS))
+        assert file_cache.FILE_METRICS_KEY not in result
+    assert results[0] == results[1] == results[2]
+    assert results[0][:3] == ('Ready', 4, 156)
+    assert stats.file_cache_summary(reset=True).startswith("File metrics cache hits: 4/8 (50.0%)")
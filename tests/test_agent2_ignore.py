@@ -0,0 +1,92 @@
+"""
+Test Agent 2 ignore rules (settings globs, .gitignore, pruning walker)
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import io
+import sys
+import zipfile
+from pathlib import Path
+
+import git
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.ui.agents.agent2_ignore as ignore
+import src.ui.agents.agent2_repo_cache as repo_cache
+from src.ui.agents.agent2_ignore import IgnoreRules, settings_rules, walk_files
+from src.ui.agents.agent2_repo_analyzer import analyze_repository
+from src.ui.agents.agent2_zip_analyzer import analyze_zip_archive
+from tests.conftest import commit_files, make_zip
+
+FILES = {
+    'main.py': "a\nb\n",
+    'pkg/util.py': "x\n" * 10,
+    'venv/lib/site.py': "v\n" * 500,
+    'pkg/node_modules/dep.py': "n\n" * 300,
+    'generated/api.py': "g\n" * 400,
+    'pkg/model_pb2.py': "p\n" * 200,
+    'build.py': "keep\n",  # A file, not the build/ directory
+    '.gitignore': "# generated code\ngenerated/\n*_pb2.py\n!pkg/model_pb2.py\n",
+}
+METRIC_KEYS = ('total_files', 'total_lines', 'skipped_dirs', 'skipped_files', 'skipped_bytes')
+
+
+def test_gitignore_style_matching():
+    """Trailing / is directory-only, a / anchors to the root, comments and negations are ignored"""
+    rules = IgnoreRules(["build/", "/docs/*.py", "*.egg-info/", "# comment", "!keep.py", "**/cache/**"])
+    assert rules.ignores("build", True) and rules.ignores("src/build", True)
+    assert not rules.ignores("build.py") and not rules.ignores("build")
+    assert rules.ignores("docs/conf.py") and not rules.ignores("src/docs/conf.py")
+    assert rules.ignores("pkg.egg-info", True) and rules.ignores("a/cache", True)
+    assert not rules.ignores("keep.py")
+    assert rules.with_gitignore("*.py").ignores("x.py")
+    assert IgnoreRules([], use_gitignore=False).with_gitignore("*.py").ignores("x.py") is False
+
+
+def test_default_globs_keep_nested_packages_named_env():
+    """Only root env/, build/ and dist/ are pruned; a student's env package is graded"""
+    rules = settings_rules()
+    assert rules.ignores("env", True) and rules.ignores("build", True) and rules.ignores("dist", True)
+    assert not rules.ignores("agents/env", True) and not rules.ignores("src/build", True)
+    assert rules.ignores("pkg/venv", True) and rules.ignores("web/node_modules", True)
+
+
+def test_walker_prunes_before_descending(tmp_path, monkeypatch):
+    """Ignored directories are never scanned; directly ignored .py files are counted with their bytes"""
+    for name, content in FILES.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(content, encoding='utf-8')
+    scanned = []
+    scandir = ignore.os.scandir
+    monkeypatch.setattr(ignore.os, 'scandir', lambda path: scanned.append(Path(path)) or scandir(path))
+
+    rules = IgnoreRules(["venv/", "node_modules/", "build/"]).with_gitignore(FILES['.gitignore'])
+    files, skipped = walk_files(tmp_path, rules)
+    assert sorted(p.relative_to(tmp_path).as_posix() for p in files) == ["build.py", "main.py", "pkg/util.py"]
+    assert skipped == {'skipped_dirs': 3, 'skipped_files': 1, 'skipped_bytes': 400}
+    assert not any(part in ("venv", "node_modules", "generated") for path in scanned for part in path.parts)
+
+
+def test_objects_checkout_and_zip_agree(tmp_path, repos_dir, monkeypatch):
+    """The three sources apply settings globs and the root .gitignore identically"""
+    remote = git.Repo.init(tmp_path / "remote")
+    commit_files(remote, FILES)
+    url = (tmp_path / "remote").as_uri()
+    settings = repo_cache.get_settings().repository_analysis
+    monkeypatch.setattr(settings, 'clone_mode', 'full')
+
+    results = {}
+    for mode in ("objects", "checkout"):
+        monkeypatch.setattr(settings, 'analysis_mode', mode)
+        result = analyze_repository(f"{mode}-email", url)
+        results[mode] = tuple(result[key] for key in METRIC_KEYS)
+    with zipfile.ZipFile(io.BytesIO(make_zip(FILES))) as archive:
+        metrics = analyze_zip_archive(archive, max_bytes=1024 * 1024, max_entries=100)
+    results['zip'] = (metrics['file_count'],) + tuple(metrics[key] for key in METRIC_KEYS[1:])
+
+    assert results['objects'] == results['checkout'] == results['zip'] == (3, 13, 3, 1, 400)
@@ -0,0 +1,87 @@
+"""
+Test Agent 2 analysis straight from the git object database
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import git
+import pytest
+from pydantic import ValidationError
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.ui.agents.agent2_object_db as object_db
+import src.ui.agents.agent2_repo_cache as repo_cache
+from src.ui.agents.agent2_line_counter import count_bytes_lines
+from src.ui.agents.agent2_repo_analyzer import analyze_repository
+from src.utils.agent_config import RepositoryAnalysisConfig
+from tests.conftest import commit_files
+
+METRIC_KEYS = ('total_files', 'total_lines', 'compliant_lines', 'grade', 'commit_sha')
+
+
+def test_count_bytes_lines_matches_readlines():
+    """Byte counting agrees with len(readlines()) on every newline style"""
+    samples = [b"", b"a", b"a\n", b"a\nb", b"a\r\nb\r\n", b"a\rb\rc", b"a\r\n\rb", "é\né".encode()]
+    for data in samples:
+        expected = len(io.TextIOWrapper(io.BytesIO(data), encoding='utf-8').readlines())
+        assert count_bytes_lines(data) == expected, data
+    assert count_bytes_lines(b"\xff\xfe\x00") == 1  # Not UTF-8, still counted
+
+
+def test_objects_mode_matches_checkout(tmp_path, repos_dir, monkeypatch):
+    """Reading blobs via cat-file gives the same metrics as a checkout, without a working tree"""
+    remote = git.Repo.init(tmp_path / "remote")
+    (Path(remote.working_tree_dir) / 'binary.py').write_bytes(b"\xff\xfe\n")
+    remote.index.add(['binary.py'])
+    commit_files(remote, {'main.py': "a\nb", 'pkg/big.py': "x\n" * 151, 'notes.txt': "n\n"})
+    url = (tmp_path / "remote").as_uri()
+    settings = repo_cache.get_settings().repository_analysis
+
+    results = {}
+    for mode in ("checkout", "objects"):
+        monkeypatch.setattr(settings, 'analysis_mode', mode)
+        result = analyze_repository(f"{mode}-email", url)
+        results[mode] = tuple(result[key] for key in METRIC_KEYS)
+    assert results['objects'] == results['checkout']
+    assert results['objects'][:3] == (3, 154, 3)
+    assert not (repos_dir / "objects-").exists()
+
+
+def test_lean_mirror_prefetches_python_blobs_once(tmp_path, repos_dir, monkeypatch):
+    """A lean mirror downloads only the .py blobs, in a single fetch"""
+    remote = git.Repo.init(tmp_path / "remote")
+    remote.git.config('uploadpack.allowFilter', 'true')
+    commit_files(remote, {'a.py': "1\n", 'b/c.py': "2\n3\n", 'data.csv': "x,y\n" * 50000})
+    url = (tmp_path / "remote").as_uri()
+    monkeypatch.setattr(repo_cache.get_settings().repository_analysis, 'analysis_mode', 'objects')
+
+    fetched = []
+    prefetch = object_db.prefetch_blobs
+    monkeypatch.setattr(object_db, 'prefetch_blobs',
+                        lambda *args: fetched.append(prefetch(*args)) or fetched[-1])
+    result = analyze_repository("lean-email", url)
+    assert (result['total_files'], result['total_lines']) == (2, 3)
+    assert fetched == [2]
+
+    mirror = repo_cache.mirror_dir(url)
+    missing = git.Repo(mirror).git.rev_list('--objects', '--missing=print', repo_cache.MIRROR_REF)
+    assert [line for line in missing.splitlines() if line.startswith('?')] != []
+    assert object_db.prefetch_blobs(mirror, repo_cache.MIRROR_REF, []) == 0
+    present = git.Repo(mirror).git.rev_parse(f"{repo_cache.MIRROR_REF}:a.py")
+    assert object_db.blob_sizes(mirror, ["0" * 40, present, "f" * 40]) == [2]  # "<oid> missing" lines left out
+
+
+def test_mode_typos_fail_validation():
+    """A misspelled mode is rejected instead of silently falling back to checkout"""
+    assert RepositoryAnalysisConfig(analysis_mode="checkout", clone_mode="full").analysis_mode == "checkout"
+    for field, value in (('analysis_mode', "object"), ('clone_mode', "Lean")):
+        with pytest.raises(ValidationError):
+            RepositoryAnalysisConfig(**{field: value})
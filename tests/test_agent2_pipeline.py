@@ -0,0 +1,128 @@
+"""
+Test the Agent 2 clone/count pipeline
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import sys
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import git
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.ui.agents.agent1_attachments as attachments
+import src.ui.agents.agent2_file_cache as file_cache
+import src.ui.agents.agent2_pipeline as pipeline
+import src.ui.agents.agent2_stats as stats
+from src.ui.agents.agent2_repo_analyzer import analyze_repository
+from src.ui.agents.agent2_submissions import cache_summary
+from src.utils.config import get_settings
+from tests.conftest import commit_files, make_zip
+
+ROW_KEYS = ('email_id', 'status', 'total_files', 'total_lines', 'compliant_lines', 'grade')
+
+
+@pytest.fixture
+def settings(repos_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(attachments, 'get_attachments_dir', lambda: tmp_path / "attachments")
+    monkeypatch.setattr(file_cache, 'get_cache_dir', lambda: tmp_path / "cache")
+    settings = get_settings().repository_analysis
+    monkeypatch.setattr(settings, 'result_cache', False)
+    return settings
+
+
+def _remote(path: Path, files: dict) -> str:
+    commit_files(git.Repo.init(path), files)
+    return path.as_uri()
+
+
+def test_pipeline_matches_serial_analysis(tmp_path, settings):
+    """Repositories, zips and failures come out of the process pool as analyze_repository rows"""
+    (tmp_path / "attachments").mkdir()
+    attachments.attachment_path("zip-email").write_bytes(make_zip({'a.py': "1\n" * 151, 'b.py': "2\n"}))
+    attachments.attachment_path("bad-email").write_bytes(b"not a zip")
+    rows = [
+        {'email_id': "repo-email", 'github_url': _remote(tmp_path / "remote", {'m.py': "a\nb", 'n.py': "c\n"})},
+        {'email_id': "zip-email", 'github_url': "attachment:hw.zip"},
+        {'email_id': "bad-email", 'github_url': "attachment:bad.zip"},
+        {'email_id': "gone-email", 'github_url': (tmp_path / "missing").as_uri()},
+    ]
+
+    piped = {r['email_id']: tuple(r[k] for k in ROW_KEYS) for r in pipeline.run_analysis(rows, 2, 2)}
+    serial = {row['email_id']: tuple(analyze_repository(**row)[k] for k in ROW_KEYS) for row in rows}
+    assert piped == serial
+    assert [piped[row['email_id']][1] for row in rows] == ['Ready', 'Ready', 'Failed: bad zip', 'Failed: clone']
+
+
+def test_shared_repository_is_analyzed_once(tmp_path, settings, monkeypatch):
+    """Several emails submitting one repository share a single clone and count"""
+    url = _remote(tmp_path / "remote", {'main.py': "x\n"})
+    prepared = []
+    prepare = pipeline.prepare_submission
+    monkeypatch.setattr(pipeline, 'prepare_submission', lambda *args: prepared.append(args) or prepare(*args))
+
+    results = pipeline.run_analysis([{'email_id': f"email-{i}", 'github_url': url} for i in range(3)], 2, 1)
+    assert len(prepared) == 1
+    assert sorted((r['email_id'], r['total_lines'], r.get('shared', False)) for r in results) == \
+        [("email-0", 1, False), ("email-1", 1, True), ("email-2", 1, True)]
+    assert not any(r.get('cached') for r in results)
+    assert cache_summary(results) == "Result cache hits: 0/3 (0.0%), 2 shared"
+
+
+def test_full_queue_applies_backpressure_and_reports_utilisation(tmp_path, settings, monkeypatch):
+    """A one-slot queue still drains every submission; utilisation is busy time over capacity"""
+    monkeypatch.setattr(settings, 'pipeline_queue_size', 1)
+    rows = [{'email_id': f"email-{i}", 'github_url': _remote(tmp_path / f"r{i}", {'m.py': "1\n" * (i + 1)})}
+            for i in range(4)]
+    stats.stage_summary(reset=True)
+    results = pipeline.run_analysis(rows, 3, 1)
+    assert sorted(r['total_lines'] for r in results) == [1, 2, 3, 4]
+    assert "clone stage 3 threads" in stats.stage_summary(reset=True)
+
+    stats.record_pipeline(10.0, 2, 4)
+    stats.record_stage('clone_busy', 10.0)
+    stats.record_stage('count_busy', 4.0)
+    assert stats.stage_summary(reset=True) == \
+        "Pipeline: clone stage 2 threads 50.0% busy, count stage 4 processes 10.0% busy, 0.00s blocked on a full queue"
+
+
+class _BrokenPool:
+    """A process pool whose workers have all died"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("A child process terminated abruptly")
+
+
+def test_dead_counting_pool_fails_rows_without_hanging(tmp_path, settings, monkeypatch):
+    """Clone threads blocked on a full queue still finish when counting breaks"""
+    monkeypatch.setattr(settings, 'pipeline_queue_size', 1)
+    monkeypatch.setattr(pipeline, 'ProcessPoolExecutor', _BrokenPool)
+    (tmp_path / "attachments").mkdir()
+    rows = []
+    for i in range(6):
+        attachments.attachment_path(f"zip-{i}").write_bytes(make_zip({'a.py': "1\n"}))
+        rows.append({'email_id': f"zip-{i}", 'github_url': "attachment:hw.zip"})
+
+    results = []
+    run = threading.Thread(target=lambda: results.extend(pipeline.run_analysis(rows, 3, 1)), daemon=True)
+    run.start()
+    run.join(timeout=60)
+    assert not run.is_alive()
+    assert sorted(r['email_id'] for r in results) == [row['email_id'] for row in rows]
+    assert {r['status'] for r in results} == {'Failed: A child process terminated abruptly'}
@@ -24,7 +24,7 @@ else:
         ready_rows = []
         for row in ws.iter_rows(min_row=2, values_only=True):
             # New format: 7 columns (removed hashed_email)
-            email_id, received_time, subject, sender, github_url, thread_id, status = row
+            email_id, received_time, subject, sender, github_url, thread_id, status = row[:7]
             if status == "Ready":
                 ready_rows.append({
                     'email_id': email_id,
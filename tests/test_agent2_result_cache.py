@@ -0,0 +1,93 @@
+"""
+Test the Agent 2 result cache (HEAD SHA check before cloning)
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import sys
+from pathlib import Path
+
+import git
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.ui.agents.agent2_file_cache as file_cache
+import src.ui.agents.agent2_repo_cache as repo_cache
+import src.ui.agents.agent2_result_cache as result_cache
+from src.ui.agents.agent2_pipeline import run_analysis
+from src.ui.agents.agent2_submissions import cache_summary
+from src.utils.config import get_settings
+from tests.conftest import commit_files
+
+
+@pytest.fixture
+def remote(tmp_path, monkeypatch):
+    monkeypatch.setattr(repo_cache, 'get_repos_dir', lambda: tmp_path / "repos")
+    monkeypatch.setattr(result_cache, 'get_cache_dir', lambda: tmp_path / "cache")
+    monkeypatch.setattr(file_cache, 'get_cache_dir', lambda: tmp_path / "cache")
+    repo = git.Repo.init(tmp_path / "remote")
+    commit_files(repo, {'main.py': "a\nb\n"})
+    return repo
+
+
+def _run(url: str) -> list:
+    return run_analysis([{'email_id': f"email-{i}", 'github_url': url} for i in range(2)], max_workers=1)
+
+
+def test_unchanged_head_is_served_from_cache(remote, monkeypatch):
+    """A second run resolves HEAD with ls-remote and never fetches"""
+    url = Path(remote.working_tree_dir).as_uri()
+    first = _run(url)
+    assert cache_summary(first) == "Result cache hits: 0/2 (0.0%), 1 shared"
+
+    def no_fetch(*args):
+        raise AssertionError("fetched an unchanged repository")
+
+    monkeypatch.setattr(repo_cache, 'fetch_mirror', no_fetch)
+    second = _run(url)
+    assert cache_summary(second) == "Result cache hits: 1/2 (50.0%), 1 shared"
+    assert {(r['email_id'], r['total_lines'], r['grade']) for r in second} == \
+        {("email-0", 2, 100.0), ("email-1", 2, 100.0)}
+
+
+def test_new_commit_or_settings_invalidate(remote, monkeypatch):
+    """A new HEAD commit or different grading settings mean a fresh analysis"""
+    url = Path(remote.working_tree_dir).as_uri()
+    _run(url)
+
+    commit_files(remote, {'extra.py': "x\n"})
+    results = _run(url)
+    assert cache_summary(results) == "Result cache hits: 0/2 (0.0%), 1 shared"
+    assert {r['total_lines'] for r in results} == {3}
+
+    monkeypatch.setattr(get_settings().repository_analysis, 'ignore_globs', ["/docs/"])
+    assert cache_summary(_run(url)) == "Result cache hits: 0/2 (0.0%), 1 shared"
+
+
+def test_config_hash_tracks_metric_inputs(monkeypatch):
+    """Only settings the counters use change the hash; clone_globs only matter for lean checkouts"""
+    settings = get_settings().repository_analysis
+    monkeypatch.setattr(settings, 'analysis_mode', 'objects')
+    monkeypatch.setattr(settings, 'clone_mode', 'lean')
+    base = result_cache.grading_config_hash()
+    monkeypatch.setattr(get_settings().grading, 'line_limit', 100)
+    monkeypatch.setattr(settings, 'line_limit', 100)
+    monkeypatch.setattr(settings, 'clone_globs', ["*.py", "*.md"])
+    assert result_cache.grading_config_hash() == base
+
+    monkeypatch.setattr(settings, 'analysis_mode', 'checkout')
+    lean = result_cache.grading_config_hash()
+    assert lean != base
+    monkeypatch.setattr(settings, 'clone_mode', 'full')
+    assert result_cache.grading_config_hash() == base  # A full checkout counts every .py file too
+
+
+def test_unreachable_remote_is_not_cached(tmp_path, remote):
+    """A failing ls-remote falls back to a normal (failing) analysis"""
+    missing = (tmp_path / "missing").as_uri()
+    assert result_cache.remote_head_sha(missing) is None
+    assert [r['status'] for r in _run(missing)] == ['Failed: clone'] * 2
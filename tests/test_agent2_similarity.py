@@ -0,0 +1,114 @@
+"""
+Test Agent 2 near-duplicate detection (MinHash signatures and LSH index)
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import git
+import openpyxl
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.ui.agents.agent1_attachments as attachments
+import src.ui.agents.agent2_file_cache as file_cache
+import src.ui.agents.agent2_pipeline as pipeline
+import src.ui.agents.agent2_similarity as similarity
+from src.ui.agents.agent2_minhash import (SIGNATURE_KEY, estimate_jaccard, file_signature, merge_signatures,
+                                          shingle_hashes)
+from src.utils.config import get_settings
+from tests.conftest import commit_files, make_zip
+
+
+def _code(seed: int, functions: int = 30) -> str:
+    """A reproducible module of distinct functions"""
+    rng = random.Random(seed)
+    return "".join(f"def step_{seed}_{i}(value):\n    total = value * {rng.randrange(1000)} + {rng.randrange(1000)}\n"
+                   f"    return helper_{rng.randrange(50)}(total, {rng.randrange(100)})\n\n" for i in range(functions))
+
+
+@pytest.fixture
+def settings(repos_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(attachments, 'get_attachments_dir', lambda: tmp_path / "attachments")
+    monkeypatch.setattr(file_cache, 'get_cache_dir', lambda: tmp_path / "cache")
+    monkeypatch.setattr(similarity, 'get_cache_dir', lambda: tmp_path / "cache")
+    settings = get_settings().repository_analysis
+    monkeypatch.setattr(settings, 'result_cache', False)
+    monkeypatch.setattr(settings, 'similarity', True)
+    return settings
+
+
+def _remote(path: Path, files: dict) -> str:
+    commit_files(git.Repo.init(path), files)
+    return path.as_uri()
+
+
+def test_signatures_estimate_jaccard():
+    """Signature agreement tracks the true shingle Jaccard; file signatures merge into the union's"""
+    first, second = _code(1).encode(), _code(2).encode()
+    edited = first.replace(b"step_1_3(", b"renamed(") + b"# a new comment\n"
+    exact = len(shingle_hashes(first) & shingle_hashes(edited)) / len(shingle_hashes(first) | shingle_hashes(edited))
+    assert abs(estimate_jaccard(file_signature(first), file_signature(edited)) - exact) < 0.15
+    assert estimate_jaccard(file_signature(first), file_signature(second)) < 0.2
+    assert file_signature(b"# only a comment\n") is None
+    union = merge_signatures([file_signature(first), None, file_signature(second)])
+    assert union == [min(a, b) for a, b in zip(file_signature(first), file_signature(second))]
+
+
+def test_copied_submissions_are_paired_across_runs(tmp_path, settings):
+    """Only the near-copy is reported, in this run and against the persisted index later"""
+    original = {'main.py': _code(1), 'pkg/util.py': _code(2)}
+    copied = {'main.py': "# My solution\n" + _code(1).replace("step_1_3(", "solve("), 'pkg/util.py': _code(2),
+              'extra.py': "print(1)\n"}
+    rows = [{'email_id': "original-email", 'github_url': _remote(tmp_path / "original", original)},
+            {'email_id': "copied-email", 'github_url': _remote(tmp_path / "copied", copied)},
+            {'email_id': "other-email", 'github_url': _remote(tmp_path / "other", {'main.py': _code(3)})}]
+
+    pairs = similarity.find_similar(pipeline.run_analysis(rows, 2, 2))
+    assert [(p['email_id'], p['similar_email_id']) for p in pairs] in ([("copied-email", "original-email")],
+                                                                      [("original-email", "copied-email")])
+    assert pairs[0]['jaccard'] >= settings.similarity_threshold
+
+    (tmp_path / "attachments").mkdir()
+    attachments.attachment_path("zip-email").write_bytes(make_zip(original))
+    later = pipeline.run_analysis([{'email_id': "zip-email", 'github_url': "attachment:hw.zip"}], 1, 1)
+    pairs = similarity.find_similar(later)
+    assert sorted(p['similar_email_id'] for p in pairs) == ["copied-email", "original-email"]
+    assert max(p['jaccard'] for p in pairs) == 1.0
+
+    wb = openpyxl.Workbook()
+    similarity.add_similarity_sheet(wb, pairs)
+    sheet = wb[similarity.SHEET_TITLE]
+    assert [cell.value for cell in sheet[1]] == similarity.SHEET_HEADERS
+    assert sheet.max_row == 3
+    assert similarity.similarity_summary(later, pairs).startswith("Near-duplicates: 2 pairs at >= 80%")
+
+
+def test_signature_is_the_same_in_every_mode(tmp_path, settings, monkeypatch):
+    """Objects mode (counted or from the file cache), checkout and zip sign the same code alike"""
+    files = {'main.py': _code(4), 'pkg/a.py': _code(5), 'venv/lib.py': _code(6)}
+    url = _remote(tmp_path / "remote", files)
+    (tmp_path / "attachments").mkdir()
+    attachments.attachment_path("zip-email").write_bytes(make_zip(files))
+
+    signatures = []
+    for mode in ("objects", "objects", "checkout"):
+        monkeypatch.setattr(settings, 'analysis_mode', mode)
+        [result] = pipeline.run_analysis([{'email_id': f"{mode}-email", 'github_url': url}], 1, 1)
+        signatures.append(result[SIGNATURE_KEY])
+    [zipped] = pipeline.run_analysis([{'email_id': "zip-email", 'github_url': "attachment:hw.zip"}], 1, 1)
+    signatures.append(zipped[SIGNATURE_KEY])
+    expected = merge_signatures([file_signature(_code(4).encode()), file_signature(_code(5).encode())])
+    assert signatures == [expected] * 4
+
+    monkeypatch.setattr(settings, 'similarity', False)
+    [unsigned] = pipeline.run_analysis([{'email_id': "off-email", 'github_url': url}], 1, 1)
+    assert SIGNATURE_KEY not in unsigned
+    assert similarity.find_similar([unsigned]) == []
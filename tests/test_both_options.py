@@ -56,7 +56,7 @@ if success:
         if row_count > 0:
             lessons_found = []
             for i, row in enumerate(ws.iter_rows(min_row=2, values_only=True), 1):
-                email_id, received_time, subject, sender, github_url, thread_id, status = row
+                email_id, received_time, subject, sender, github_url, thread_id, status = row[:7]
                 # Extract lesson number
                 if '- L' in subject:
                     lesson = subject.split('- L')[1].split('-')[0].strip()
@@ -0,0 +1,146 @@
+"""
+Test the process-wide Gmail service factory
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import json
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.ui.agents.gmail_auth as gmail_auth
+import src.ui.agents.gmail_discovery as gmail_discovery
+
+
+class FakeCredentials:
+    """Minimal stand-in for google.oauth2.credentials.Credentials"""
+
+    def __init__(self, expires_in: timedelta):
+        self.valid = True
+        self.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + expires_in
+        self.refreshed = 0
+
+    def refresh(self, request):
+        self.refreshed += 1
+        self.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1)
+
+
+@pytest.fixture
+def auth(monkeypatch):
+    """Patch credential loading and service building; count calls"""
+    calls = {'load': 0, 'build': []}
+    creds = FakeCredentials(timedelta(hours=1))
+
+    def load():
+        calls['load'] += 1
+        return creds
+
+    def build(document, credentials):
+        calls['build'].append(document)
+        return object()
+
+    gmail_auth.reset_gmail_auth()
+    monkeypatch.setattr(gmail_auth, '_load_credentials', load)
+    monkeypatch.setattr(gmail_auth, '_save_token', lambda c: None)
+    monkeypatch.setattr(gmail_auth, 'build_from_document', build)
+    yield calls, creds
+    gmail_auth.reset_gmail_auth()
+
+
+def test_credentials_and_service_reused_per_thread(auth):
+    """One OAuth load per process, one service per thread"""
+    calls, _ = auth
+    first = gmail_auth.get_gmail_service()
+    assert gmail_auth.get_gmail_service() is first
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(gmail_auth.get_gmail_service()))
+    thread.start()
+    thread.join()
+
+    assert other[0] is not first
+    assert calls['load'] == 1
+    assert len(calls['build']) == 2
+
+
+def test_discovery_document_is_shared_text(auth):
+    """Every build gets the same cached JSON text, never a shared dict"""
+    calls, _ = auth
+    gmail_auth.get_gmail_service()
+    gmail_auth.reset_gmail_auth()
+    gmail_auth.get_gmail_service()
+
+    first, second = calls['build']
+    assert isinstance(first, str) and first is second
+    assert '"name": "gmail"' in first
+
+
+def test_proactive_refresh_before_expiry(auth):
+    """Credentials expiring within the margin are refreshed before use"""
+    _, creds = auth
+    gmail_auth.get_gmail_service()
+    assert creds.refreshed == 0
+
+    creds.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(minutes=2)
+    gmail_auth.get_gmail_service()
+    assert creds.refreshed == 1
+    assert not gmail_auth._needs_refresh(creds)
+
+
+def test_modify_scope_only_with_label_work_queue(tmp_path, monkeypatch):
+    """Existing readonly+compose tokens stay valid unless labelling is on; corrupt tokens re-authorize"""
+    settings = gmail_auth.get_settings().email_extraction
+    token = tmp_path / "token.json"
+    token.write_text(json.dumps({'scopes': gmail_auth.GMAIL_SCOPES}), encoding='utf-8')
+
+    monkeypatch.setattr(settings, 'label_work_queue', False)
+    assert gmail_auth.MODIFY_SCOPE not in gmail_auth.gmail_scopes()
+    assert gmail_auth._has_scopes(token, gmail_auth.gmail_scopes())
+    monkeypatch.setattr(settings, 'label_work_queue', True)
+    assert gmail_auth.MODIFY_SCOPE in gmail_auth.gmail_scopes()
+    assert not gmail_auth._has_scopes(token, gmail_auth.gmail_scopes())
+
+    for corrupt in ('{"scopes": [', '[1, 2]'):
+        token.write_text(corrupt, encoding='utf-8')
+        assert not gmail_auth._has_scopes(token, gmail_auth.GMAIL_SCOPES)
+    assert not gmail_auth._has_scopes(tmp_path / "missing.json", gmail_auth.GMAIL_SCOPES)
+
+
+def test_failed_discovery_download_is_not_cached(tmp_path, monkeypatch):
+    """An error page is never cached; a good document is written whole and reused"""
+    responses = [(503, b"<html>Service Unavailable</html>"), (200, b"<html>Captive portal</html>"),
+                 (200, b'{"name": "gmail"}')]
+
+    class FakeHttp:
+        def __init__(self, timeout):
+            pass
+
+        def request(self, url):
+            status, content = responses.pop(0)
+            return type('Response', (), {'status': status})(), content
+
+    monkeypatch.setattr(gmail_discovery, '_discovery_document', None)
+    monkeypatch.setattr(gmail_discovery.discovery_cache, 'get_static_doc', lambda *args: None)
+    monkeypatch.setattr(gmail_discovery, 'get_cache_dir', lambda: tmp_path)
+    monkeypatch.setattr(gmail_discovery.httplib2, 'Http', FakeHttp)
+    cache_file = tmp_path / gmail_discovery.DISCOVERY_CACHE_FILE
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            gmail_discovery.get_discovery_document()
+        assert not cache_file.exists()
+    assert gmail_discovery.get_discovery_document() == '{"name": "gmail"}'
+    assert cache_file.read_text(encoding='utf-8') == '{"name": "gmail"}'
+    assert [path.name for path in tmp_path.iterdir()] == [gmail_discovery.DISCOVERY_CACHE_FILE]
+
+    monkeypatch.setattr(gmail_discovery, '_discovery_document', None)
+    assert gmail_discovery.get_discovery_document() == '{"name": "gmail"}'  # From the file, no request
@@ -0,0 +1,69 @@
+"""
+Test batched Gmail message fetching in Agent 1
+
+Uses a fake Gmail service (no network) to verify that messages.get calls
+are grouped into batch requests and that per-item failures become error rows.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.ui.agents.gmail_batch import fetch_messages
+from src.ui.agents.agent1_email_parser import extract_email_data
+from tests.conftest import build_service
+
+
+def test_batches_group_calls():
+    """250 messages with batch_size=100 need 3 HTTP round-trips"""
+    service = build_service(250)
+    ids = [f"m{i}" for i in range(250)]
+    results = list(fetch_messages(service, ids, batch_size=100))
+
+    assert service.http_calls == 3
+    assert [r[0] for r in results] == ids
+    assert all(error is None for _, _, error in results)
+
+
+def test_batch_size_is_capped_at_gmail_limit():
+    """Batch sizes above 100 are clamped to the Gmail limit"""
+    service = build_service(150)
+    list(fetch_messages(service, [f"m{i}" for i in range(150)], batch_size=500))
+    assert service.http_calls == 2
+
+
+def test_per_item_failures_become_error_rows():
+    """A failed item in a batch yields its own error row; others still parse"""
+    service = build_service(5, broken_ids={'m2'})
+    messages = [{'id': f"m{i}"} for i in range(5)]
+    submissions = extract_email_data(service, messages, batch_size=50)
+
+    assert service.http_calls == 1
+    assert len(submissions) == 5
+    assert submissions[2]['status'].startswith("Error:")
+    assert sum(1 for s in submissions if s['status'] == "Ready") == 4
+
+
+def test_serial_mode_matches_batched_mode():
+    """batch_size=1 keeps one request per email and produces the same rows"""
+    messages = [{'id': f"m{i}"} for i in range(4)]
+    serial_service = build_service(4)
+    serial = extract_email_data(serial_service, messages, batch_size=1)
+    batched = extract_email_data(build_service(4), messages, batch_size=50)
+
+    assert serial_service.http_calls == 4
+    assert serial == batched
+
+
+if __name__ == "__main__":
+    test_batches_group_calls()
+    test_batch_size_is_capped_at_gmail_limit()
+    test_per_item_failures_become_error_rows()
+    test_serial_mode_matches_batched_mode()
+    print("[+] All batch fetch tests passed!")
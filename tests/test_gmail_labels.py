@@ -0,0 +1,109 @@
+"""
+Test the Gmail label work queue (batchModify labelling and query exclusion)
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import sys
+from pathlib import Path
+
+import openpyxl
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.ui.agents.gmail_auth as gmail_auth
+import src.utils.paths as paths
+from src.ui.agent_runner import _execute_agent4
+from src.ui.agents.gmail_labels import (
+    add_label, exclude_labels_query, mark_drafted, mark_extracted
+)
+from src.ui.agents.mail_source_memory import InMemoryGmailService
+from tests.conftest import make_message
+
+LABELS = ["grader/extracted", "grader/drafted"]
+
+
+def _service(count: int) -> InMemoryGmailService:
+    return InMemoryGmailService([make_message(f"m{i}", f"Homework {i}", "https://github.com/a/b")
+                                 for i in range(count)])
+
+
+def _listed(service, query: str) -> list:
+    response = service.users().messages().list(userId='me', q=query, maxResults=500).execute()
+    return sorted(m['id'] for m in response.get('messages', []))
+
+
+def test_exclude_labels_query():
+    """Nested label names are searched with '-' instead of '/'"""
+    assert exclude_labels_query("subject:Homework", LABELS) == \
+        "subject:Homework -label:grader-extracted -label:grader-drafted"
+    assert exclude_labels_query("", LABELS[:1]) == "-label:grader-extracted"
+
+
+def test_labelled_messages_leave_the_queue(tmp_path):
+    """Extracted and drafted emails drop out of the search; errors stay queued"""
+    service = _service(4)
+    query = exclude_labels_query("subject:Homework", LABELS)
+    submissions = [
+        {'email_id': f"e{i}", 'message_id': f"m{i}", 'status': status}
+        for i, status in enumerate(["Ready", "Missing: github_url", "Error: timeout"])
+    ]
+
+    assert mark_extracted(service, submissions, LABELS[0], db_path=tmp_path / "q.sqlite") == 2
+    assert _listed(service, query) == ["m2", "m3"]
+    assert mark_drafted(service, ["e0", "unknown"], LABELS[1], db_path=tmp_path / "q.sqlite") == 1
+    assert _listed(service, "label:grader-drafted") == ["m0"]
+    assert service.calls['labels.create'] == 2
+
+
+def test_batch_modify_is_chunked():
+    """More than 1000 ids are split across batchModify calls, label created once"""
+    service = _service(1500)
+    assert add_label(service, [f"m{i}" for i in range(1500)] + ["m0", None], LABELS[0]) == 1500
+    assert service.calls['messages.batchModify'] == 2
+    assert service.calls['labels.create'] == 1
+    assert _listed(service, exclude_labels_query("", LABELS)) == []
+
+
+class _DraftsService:
+    """Records drafts.create calls"""
+
+    def __init__(self):
+        self.drafts_created = []
+
+    def users(self):
+        return self
+
+    def drafts(self):
+        return self
+
+    def create(self, userId, body):
+        self.drafts_created.append(body['message']['threadId'])
+        return self
+
+    def execute(self):
+        return {'id': f"draft{len(self.drafts_created)}"}
+
+
+def _workbook(path: Path, rows: list):
+    wb = openpyxl.Workbook()
+    for row in rows:
+        wb.active.append(row)
+    wb.save(path)
+
+
+def test_legacy_agent4_creates_drafts(tmp_path, monkeypatch):
+    """The legacy Agent 4 runner (Streamlit "Run All") authenticates and drafts replies"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(paths, 'get_excel_file', lambda name: tmp_path / name)
+    service = _DraftsService()
+    monkeypatch.setattr(gmail_auth, 'get_gmail_service', lambda *args: service)
+    _workbook(tmp_path / "Excel3.xlsx", [["email_id"], ["e1", 90, "A", "coach", "Well done", 1, "Ready"]])
+    _workbook(tmp_path / "Excel1.xlsx", [["email_id"], ["e1", "2025-12-01", "Homework 1", "s@uni.ac.il",
+                                                      "https://github.com/s/hw", "t1", "Ready", "HW1"]])
+
+    assert _execute_agent4()
+    assert service.drafts_created == ["t1"]
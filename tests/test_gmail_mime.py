@@ -0,0 +1,81 @@
+"""
+Test the size-capped MIME body decoder used by Agent 1
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import sys
+import base64
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.ui.agents.gmail_mime import extract_body_text, decode_part_data, html_to_text
+
+
+def _encode(text: str) -> str:
+    # Gmail sends unpadded base64url
+    return base64.urlsafe_b64encode(text.encode()).decode().rstrip('=')
+
+
+def _part(mime_type: str, text: str = None, **extra) -> dict:
+    part = {'mimeType': mime_type, 'headers': [], 'body': {}}
+    if text is not None:
+        part['body'] = {'data': _encode(text), 'size': len(text)}
+    part.update(extra)
+    return part
+
+
+def test_prefers_plain_over_html():
+    """text/plain wins even when the HTML alternative comes first"""
+    payload = _part('multipart/alternative', parts=[
+        _part('text/html', '<p>html https://github.com/a/html</p>'),
+        _part('text/plain', 'plain https://github.com/a/plain'),
+    ])
+    assert extract_body_text(payload) == 'plain https://github.com/a/plain'
+
+
+def test_html_fallback_strips_tags_and_keeps_links():
+    """Without text/plain, HTML is converted to text and hrefs are kept"""
+    payload = _part('multipart/mixed', parts=[
+        _part('text/html', '<style>p {}</style><p>My <a href="https://github.com/a/b">repo</a> &amp; more</p>'),
+    ])
+    text = extract_body_text(payload)
+    assert 'https://github.com/a/b' in text
+    assert '<' not in text and 'p {}' not in text
+    assert '& more' in text
+
+
+def test_attachments_are_never_decoded():
+    """Parts with a filename or attachmentId are skipped"""
+    payload = _part('multipart/mixed', parts=[
+        _part('text/plain', 'not valid base64 !!!', filename='notes.txt'),
+        _part('application/zip', body={'attachmentId': 'att1', 'size': 10 ** 7}),
+        _part('text/plain', 'body https://github.com/a/b'),
+    ])
+    payload['parts'][0]['body']['data'] = '!!!'
+    assert extract_body_text(payload) == 'body https://github.com/a/b'
+
+
+def test_decoding_stops_at_budget():
+    """Only max_bytes are decoded from a long part"""
+    text = 'https://github.com/a/b\n' + 'quoted reply\n' * 10000
+    assert extract_body_text(_part('text/plain', text), max_bytes=100) == text[:100]
+    assert extract_body_text(_part('text/plain', text), max_bytes=0) == text
+
+
+def test_decode_part_data_handles_unpadded_prefixes():
+    """Any budget works with unpadded base64url input"""
+    data = _encode('abcdefghij')
+    for budget in range(1, 12):
+        assert decode_part_data(data, budget) == b'abcdefghij'[:budget]
+
+
+def test_single_part_message_without_mime_type():
+    """A bare payload body is treated as text/plain"""
+    payload = {'headers': [], 'body': {'data': _encode('hello')}}
+    assert extract_body_text(payload) == 'hello'
+    assert html_to_text('<b>x</b>') == ' x '
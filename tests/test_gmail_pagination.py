@@ -0,0 +1,93 @@
+"""
+Test paginated Gmail search used by Agent 1
+
+Uses a fake messages.list endpoint (no network) to verify that
+nextPageToken is followed lazily and that max_emails is respected.
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.ui.agents.gmail_search import iter_messages
+
+
+class FakeListRequest:
+    def __init__(self, service, kwargs):
+        self.service = service
+        self.kwargs = kwargs
+
+    def execute(self):
+        self.service.list_calls.append(self.kwargs)
+        start = int(self.kwargs.get('pageToken', 0))
+        end = min(start + self.kwargs['maxResults'], self.service.total)
+        response = {'messages': [{'id': f"m{i}", 'threadId': f"t{i}"} for i in range(start, end)]}
+        if end < self.service.total:
+            response['nextPageToken'] = str(end)
+        return response
+
+
+class FakeGmailService:
+    def __init__(self, total: int):
+        self.total = total
+        self.list_calls = []
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def list(self, **kwargs):
+        return FakeListRequest(self, kwargs)
+
+
+def test_follows_next_page_token():
+    """1,200 results are returned across three 500-id pages"""
+    service = FakeGmailService(1200)
+    ids = [m['id'] for m in iter_messages(service, 'subject:Homework', max_emails=0)]
+
+    assert len(ids) == 1200
+    assert len(set(ids)) == 1200
+    assert len(service.list_calls) == 3
+    assert service.list_calls[1]['pageToken'] == '500'
+
+
+def test_respects_max_emails():
+    """A limit above 100 is honoured and the last page request is trimmed"""
+    service = FakeGmailService(1200)
+    ids = [m['id'] for m in iter_messages(service, '', max_emails=650)]
+
+    assert len(ids) == 650
+    assert [call['maxResults'] for call in service.list_calls] == [500, 150]
+
+
+def test_is_lazy():
+    """The second page is not requested until the first is consumed"""
+    service = FakeGmailService(1200)
+    stream = iter_messages(service, '', max_emails=None, page_size=100)
+
+    first = next(stream)
+    assert first['id'] == 'm0'
+    assert len(service.list_calls) == 1
+
+
+def test_empty_mailbox():
+    """No results yields nothing after a single request"""
+    service = FakeGmailService(0)
+    assert list(iter_messages(service, 'from:nobody@example.com', max_emails=10)) == []
+    assert len(service.list_calls) == 1
+
+
+if __name__ == "__main__":
+    test_follows_next_page_token()
+    test_respects_max_emails()
+    test_is_lazy()
+    test_empty_mailbox()
+    print("[+] All pagination tests passed!")
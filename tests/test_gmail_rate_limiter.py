@@ -0,0 +1,97 @@
+"""
+Test the Gmail quota limiter, rate-limit retries and concurrent fetching
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.ui.agents import gmail_rate_limiter
+from src.ui.agents.gmail_rate_limiter import TokenBucket, execute_with_backoff, is_rate_limit_error
+from src.ui.agents.gmail_batch import fetch_messages
+from tests.conftest import build_service
+
+
+def _http_error(status: int, content: bytes = b"") -> HttpError:
+    return HttpError(httplib2.Response({'status': status}), content)
+
+
+class FlakyRequest:
+    """Fails with the given errors first, then succeeds"""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def execute(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return {'ok': True}
+
+
+def test_token_bucket_limits_throughput():
+    """A 100 units/s bucket holding 10 units takes ~0.1s for 20 more units"""
+    bucket = TokenBucket(rate=100, capacity=10)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire(5)
+    assert time.monotonic() - start >= 0.18
+
+
+def test_rate_limit_errors_are_detected():
+    """429 and 403 rateLimitExceeded are retried; other 403s are not"""
+    assert is_rate_limit_error(_http_error(429))
+    assert is_rate_limit_error(_http_error(403, b'{"reason": "userRateLimitExceeded"}'))
+    assert not is_rate_limit_error(_http_error(403, b'{"reason": "insufficientPermissions"}'))
+    assert not is_rate_limit_error(RuntimeError("boom"))
+
+
+def test_execute_with_backoff_retries_429(monkeypatch):
+    """A request is retried after 429 and the shared limiter is paused"""
+    monkeypatch.setattr(gmail_rate_limiter, 'backoff_delay', lambda attempt: 0.01)
+    request = FlakyRequest([_http_error(429), _http_error(429)])
+
+    assert execute_with_backoff(request, TokenBucket(1000)) == {'ok': True}
+    assert request.calls == 3
+
+
+def test_execute_with_backoff_gives_up():
+    """Non rate-limit errors are raised immediately"""
+    request = FlakyRequest([_http_error(404)])
+    try:
+        execute_with_backoff(request)
+        assert False, "expected HttpError"
+    except HttpError:
+        assert request.calls == 1
+
+
+def test_concurrent_fetch_keeps_order_with_one_service_per_thread():
+    """Results come back in input order; each worker builds at most one service"""
+    built = []
+    lock = threading.Lock()
+
+    def factory():
+        with lock:
+            built.append(threading.get_ident())
+        return build_service(40, broken_ids={'m7'})
+
+    ids = [f"m{i}" for i in range(40)]
+    results = list(fetch_messages(None, ids, workers=4, service_factory=factory))
+
+    assert [r[0] for r in results] == ids
+    assert results[7][2] is not None
+    assert sum(1 for _, msg, _ in results if msg) == 39
+    assert 1 <= len(built) <= 4
+    assert len(set(built)) == len(built)
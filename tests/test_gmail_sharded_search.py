@@ -0,0 +1,64 @@
+"""
+Test date-window sharded Gmail listing
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.ui.agents.gmail_search import iter_messages
+from src.ui.agents.gmail_sharded_search import DAY_SECONDS, list_messages
+from src.ui.agents.mail_source_memory import InMemoryGmailService
+from tests.conftest import make_message
+
+
+def _inbox() -> InMemoryGmailService:
+    """600 emails over ~400 days plus a dense burst of 900 within one day"""
+    now = time.time()
+    ages = [i * 0.67 * DAY_SECONDS for i in range(600)] + [5 * DAY_SECONDS + i * 90 for i in range(900)]
+    messages = []
+    for i, age in enumerate(ages):
+        message = make_message(f"m{i}", f"Homework {i}", "https://github.com/a/b")
+        message['internalDate'] = str(int((now - age) * 1000))
+        messages.append(message)
+    return InMemoryGmailService(messages)
+
+
+def test_sharded_listing_matches_plain_listing():
+    """Every email is listed once, newest first, across split and grown windows"""
+    service = _inbox()
+    expected = [m['id'] for m in iter_messages(service, 'subject:homework', page_size=100)]
+    lists_before = service.calls['messages.list']
+
+    sharded = [m['id'] for m in list_messages(service, 'subject:homework', workers=4,
+                                              service_factory=lambda: service, window_days=7, page_size=100)]
+
+    assert sharded == expected
+    # Dense windows were split instead of paged, sparse ones grown
+    assert service.calls['messages.list'] - lists_before < 2 * len(expected) / 100 + 60
+
+
+def test_max_emails_and_since_bound():
+    """max_emails stops early; since bounds the oldest window"""
+    service = _inbox()
+    newest = list_messages(service, '', max_emails=50, workers=3, service_factory=lambda: service)
+    assert len(list(newest)) == 50
+
+    since = time.time() - 30 * DAY_SECONDS
+    recent = list(list_messages(service, '', workers=3, service_factory=lambda: service,
+                                window_days=2, since=since))
+    assert {m['id'] for m in recent} == {m['id'] for m in iter_messages(service, f"after:{int(since)}")}
+
+
+def test_single_worker_is_plain_listing():
+    """workers=1 (the default) keeps the sequential paginated listing"""
+    service = _inbox()
+    list(list_messages(service, '', page_size=500))
+    assert service.calls['messages.list'] == 3
@@ -0,0 +1,47 @@
+"""
+Test the Agent 2 byte-level line counter
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import io
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.ui.agents.agent2_line_counter import count_file_lines, count_stream_lines
+from src.ui.agents.agent2_stages import analyze_python_files
+
+SAMPLES = [b"", b"a", b"a\n", b"a\nb", b"\n\n", b"a\r\nb\r\n", b"a\r\nb", b"a\rb\rc", b"a\r\n\rb\r",
+           "é\nü".encode('utf-8'), b"x = 1\n" * 1000 + b"tail"]
+
+
+def _readlines(data: bytes) -> int:
+    return len(io.TextIOWrapper(io.BytesIO(data), encoding='utf-8').readlines())
+
+
+def test_buffer_boundaries_do_not_change_the_count():
+    """Any buffer size (even one byte, splitting \\r\\n) matches readlines()"""
+    for data in SAMPLES:
+        for size in (1, 2, 3, 7, 1024 * 1024):
+            assert count_stream_lines(io.BytesIO(data), size) == _readlines(data), (data[:20], size)
+
+
+def test_mmap_and_buffered_reads_agree(tmp_path):
+    """Memory-mapped big files count the same as buffered reads"""
+    for i, data in enumerate(SAMPLES):
+        path = tmp_path / f"f{i}.py"
+        path.write_bytes(data)
+        assert count_file_lines(path, mmap_threshold=1) == count_file_lines(path) == _readlines(data)
+
+
+def test_non_utf8_files_stay_in_the_grade(tmp_path):
+    """A file readlines() could not decode is counted instead of silently skipped"""
+    (tmp_path / "ok.py").write_bytes(b"a\nb\n")
+    (tmp_path / "latin1.py").write_bytes("caf\xe9\n".encode('latin-1') * 200)
+    metrics = analyze_python_files(tmp_path)
+    assert (metrics['total_lines'], metrics['compliant_lines'], metrics['file_count']) == (202, 2, 2)
@@ -0,0 +1,144 @@
+"""
+Test the offline Agent 1 mail sources (in-memory Gmail, mbox/Maildir/EML)
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import sys
+import mailbox
+from email.message import EmailMessage
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import openpyxl
+
+import src.ui.agents.agent1_history_sync as history_sync
+import src.ui.agents.mail_source as mail_source
+import src.utils.paths as paths
+from src.ui.agent_runner import _execute_agent1
+from src.ui.agents.mail_query import build_index_entry, compile_query
+from src.ui.agents.mail_source_local import open_local_mailbox, message_to_resource
+from src.ui.agents.mail_source_memory import InMemoryGmailService
+from src.ui.agents.agent1_pipeline import run_extraction
+from src.ui.agents.agent1_sync import collect_submissions, save_sync_checkpoint
+from scripts.benchmark_agent1_replay import build_synthetic_inbox
+
+PARAMS = {'email_subject': 'Homework', 'sender_email': None, 'max_emails': 0, 'query': 'subject:Homework'}
+
+
+def _email(i: int, subject: str = None, attachment: bool = False) -> EmailMessage:
+    msg = EmailMessage()
+    msg['From'] = f"Student {i} <s{i}@uni.ac.il>"
+    msg['Subject'] = subject or f"Homework {i}"
+    msg['Date'] = f"Mon, {i + 1:02d} Dec 2025 10:00:00 +0000"
+    msg['Message-ID'] = f"<m{i}@uni.ac.il>"
+    msg.set_content(f"My repo: https://github.com/s{i}/hw{i}\n")
+    msg.add_alternative(f'<p><a href="https://github.com/s{i}/html">repo</a></p>', subtype='html')
+    if attachment:
+        msg.add_attachment(b"PK\x03\x04zip", maintype='application', subtype='zip', filename="hw.zip")
+    return msg
+
+
+def test_query_matching_subset():
+    """subject/from/date/negation/{any} terms follow Gmail semantics"""
+    entry = build_index_entry("Self check of Homework 3", "Bob <bob@uni.ac.il>", "see repo", 1764583200.0)
+    assert compile_query('subject:homework from:uni.ac.il')(entry)
+    assert compile_query('subject:{lecture homework}')(entry)
+    assert not compile_query('subject:home')(entry)
+    assert not compile_query('-subject:homework')(entry)
+    assert compile_query('after:2025/12/01 before:2025/12/02')(entry)
+    assert not compile_query('after:2025/12/02')(entry)
+    assert compile_query('"check of homework" repo')(entry)
+
+
+def test_mbox_maildir_and_eml_sources(tmp_path):
+    """All local formats load into the same Gmail-shaped resources"""
+    mbox = mailbox.mbox(str(tmp_path / "inbox.mbox"))
+    maildir = mailbox.Maildir(str(tmp_path / "Maildir"))
+    (tmp_path / "eml").mkdir()
+    for i in range(3):
+        mbox.add(_email(i))
+        maildir.add(_email(i))
+        (tmp_path / "eml" / f"{i}.eml").write_bytes(_email(i).as_bytes())
+    mbox.close()
+
+    for path in (tmp_path / "inbox.mbox", tmp_path / "Maildir", tmp_path / "eml"):
+        service = open_local_mailbox(path)
+        listed = service.users().messages().list(userId='me', q='subject:homework').execute()
+        assert [m['id'] for m in listed['messages']] == [message_to_resource(_email(i))[0]['id'] for i in (2, 1, 0)]
+
+
+def test_legacy_runner_reads_the_configured_mailbox(tmp_path, monkeypatch):
+    """mail_source: local in settings.yaml is honoured by the legacy Agent 1 runner too"""
+    mbox = mailbox.mbox(str(tmp_path / "inbox.mbox"))
+    for i in range(2):
+        mbox.add(_email(i))
+    mbox.close()
+    settings = mail_source.get_settings().email_extraction
+    monkeypatch.setattr(settings, 'mail_source', 'local')
+    monkeypatch.setattr(settings, 'mail_path', str(tmp_path / "inbox.mbox"))
+    monkeypatch.setattr(mail_source, 'get_gmail_service', lambda *args: pytest.fail("Gmail opened"))
+    monkeypatch.setattr(paths, 'get_excel_dir', lambda: tmp_path / "excel")
+
+    assert _execute_agent1(dict(PARAMS))
+    rows = list(openpyxl.load_workbook(tmp_path / "excel" / "Excel1.xlsx").active.values)
+    assert sorted(row[4] for row in rows[1:]) == ["https://github.com/s0/hw0", "https://github.com/s1/hw1"]
+
+
+def test_attachments_served_by_attachments_get():
+    """Attachment parts carry an attachmentId; content comes from attachments.get"""
+    resource, attachments = message_to_resource(_email(1, attachment=True))
+    service = InMemoryGmailService([resource], attachments)
+    part = resource['payload']['parts'][-1]
+
+    assert 'data' not in part['body']
+    response = service.users().messages().attachments().get(
+        userId='me', messageId=resource['id'], id=part['body']['attachmentId']).execute()
+    assert response['size'] == len(b"PK\x03\x04zip")
+
+
+def test_run_extraction_offline_keeps_no_state():
+    """An in-memory source extracts text/plain URLs and returns no checkpoint"""
+    resources = [message_to_resource(_email(i, "Newsletter" if i == 2 else None))[0] for i in range(4)]
+    service = InMemoryGmailService(resources)
+    submissions, checkpoints = run_extraction(service, {**PARAMS, 'mail_source': service}, lambda: service)
+
+    assert checkpoints == []
+    assert sorted(s['github_url'] for s in submissions) == [f"https://github.com/s{i}/hw{i}" for i in (0, 1, 3)]
+
+
+def test_incremental_sync_against_in_memory_history(tmp_path, monkeypatch):
+    """history.list on the in-memory service drives the incremental path"""
+    monkeypatch.setattr(history_sync, 'get_cache_dir', lambda: tmp_path)
+    service = InMemoryGmailService([message_to_resource(_email(i))[0] for i in range(3)])
+    first, history_id = collect_submissions(service, PARAMS, batch_size=50)
+    save_sync_checkpoint(PARAMS, history_id, first)
+
+    service.add_message(message_to_resource(_email(7))[0])
+    service.delete_message(message_to_resource(_email(0))[0]['id'])
+    gets_before = service.calls['messages.get']
+    second, _ = collect_submissions(service, PARAMS, batch_size=50)
+
+    assert service.calls['history.list'] == 1
+    assert service.calls['messages.get'] - gets_before == 2  # metadata + full for the new email
+    assert sorted(s['email_subject'] for s in second) == ["Homework 1", "Homework 2", "Homework 7"]
+
+
+def test_synthetic_replay_extracts_homework():
+    """A small synthetic inbox replays end to end"""
+    converted = [message_to_resource(msg) for msg in build_synthetic_inbox(300, seed=3)]
+    service = InMemoryGmailService([resource for resource, _ in converted])
+    params = {'mail_source': service, 'email_subject': "Homework - L", 'max_emails': 0,
+              'query': 'subject:Homework', 'batch_size': 50}
+    submissions, _ = run_extraction(service, params, lambda: service)
+
+    ready = [s for s in submissions if s['status'] == "Ready"]
+    assert 50 < len(submissions) < 150
+    assert all(s['github_url'].startswith("https://github.com/student") for s in ready)
+    assert len(ready) >= 0.8 * len(submissions)
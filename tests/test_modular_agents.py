@@ -101,11 +101,51 @@ def check_file_line_counts():
         "src/ui/agents/__init__.py",
         "src/ui/agents/agent_dispatcher.py",
         "src/ui/agents/gmail_auth.py",
+        "src/ui/agents/gmail_discovery.py",
+        "src/ui/agents/gmail_labels.py",
         "src/ui/agents/excel_utils.py",
+        "src/ui/agents/gmail_batch.py",
+        "src/ui/agents/gmail_search.py",
+        "src/ui/agents/gmail_sharded_search.py",
+        "src/ui/agents/gmail_rate_limiter.py",
+        "src/ui/agents/gmail_concurrent.py",
+        "src/ui/agents/gmail_mime.py",
+        "src/ui/agents/mail_query.py",
+        "src/ui/agents/mail_source.py",
+        "src/ui/agents/mail_source_http.py",
+        "src/ui/agents/mail_source_labels.py",
+        "src/ui/agents/mail_source_local.py",
+        "src/ui/agents/mail_source_memory.py",
         "src/ui/agents/agent1_params.py",
         "src/ui/agents/agent1_email_parser.py",
+        "src/ui/agents/agent1_metadata_filter.py",
+        "src/ui/agents/agent1_message_parser.py",
+        "src/ui/agents/agent1_rules.py",
+        "src/ui/agents/agent1_history_sync.py",
+        "src/ui/agents/agent1_sync.py",
+        "src/ui/agents/agent1_message_cache.py",
+        "src/ui/agents/agent1_submission_index.py",
+        "src/ui/agents/agent1_queries.py",
+        "src/ui/agents/agent1_attachments.py",
+        "src/ui/agents/agent1_pipeline.py",
         "src/ui/agents/agent1_executor.py",
         "src/ui/agents/agent2_repo_analyzer.py",
+        "src/ui/agents/agent2_zip_analyzer.py",
+        "src/ui/agents/agent2_repo_cache.py",
+        "src/ui/agents/agent2_git.py",
+        "src/ui/agents/agent2_cat_file.py",
+        "src/ui/agents/agent2_object_db.py",
+        "src/ui/agents/agent2_line_counter.py",
+        "src/ui/agents/agent2_stats.py",
+        "src/ui/agents/agent2_result_cache.py",
+        "src/ui/agents/agent2_ignore.py",
+        "src/ui/agents/agent2_budget.py",
+        "src/ui/agents/agent2_file_cache.py",
+        "src/ui/agents/agent2_minhash.py",
+        "src/ui/agents/agent2_similarity.py",
+        "src/ui/agents/agent2_stages.py",
+        "src/ui/agents/agent2_pipeline.py",
+        "src/ui/agents/agent2_submissions.py",
         "src/ui/agents/agent2_executor.py",
         "src/ui/agents/agent3_feedback_generator.py",
         "src/ui/agents/agent3_executor.py",
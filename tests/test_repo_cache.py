@@ -0,0 +1,88 @@
+"""
+Test the Agent 2 bare-mirror repository cache
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import git
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.ui.agents.agent2_repo_cache as repo_cache
+import src.ui.agents.agent2_stats as stats
+from src.ui.agents.agent2_repo_analyzer import analyze_repository
+from tests.conftest import commit_files
+
+
+def test_canonical_repo_url():
+    """URL variants of one GitHub repository share a mirror"""
+    variants = ["https://github.com/Student/HW1", "https://github.com/student/hw1.git",
+                "git@github.com:student/hw1.git", "https://www.github.com/student/hw1/tree/main/src",
+                "http://github.com/student/hw1/"]
+    assert {repo_cache.canonical_repo_url(url) for url in variants} == {"https://github.com/student/hw1"}
+    assert len({repo_cache.mirror_dir(url) for url in variants}) == 1
+
+
+def test_rerun_fetches_into_existing_mirror(tmp_path, repos_dir):
+    """The second run updates the same mirror and sees the new commit"""
+    remote = git.Repo.init(tmp_path / "remote")
+    commit_files(remote, {'main.py': "a\nb\n", 'old.py': "x\n"})
+    url = (tmp_path / "remote").as_uri()
+
+    first = analyze_repository("email-one", url)
+    mirror = repo_cache.mirror_dir(url)
+    assert (first['status'], first['total_files'], first['total_lines']) == ('Ready', 2, 3)
+    assert git.Repo(mirror).bare
+
+    commit_files(remote, {'pkg/new.py': "1\n2\n3\n"}, removed=('old.py',))
+    second = analyze_repository("email-one", url)
+    assert (second['total_files'], second['total_lines']) == (2, 5)
+    assert list((repos_dir / repo_cache.MIRRORS_DIR).iterdir()) == [mirror]
+    assert git.Repo(mirror).git.rev_parse(repo_cache.MIRROR_REF) == remote.head.commit.hexsha
+    assert not (repos_dir / "email-on" / "old.py").exists()
+
+
+def test_lru_eviction_honours_budget(repos_dir):
+    """Oldest mirrors go first until the cache fits the disk budget"""
+    root = repos_dir / repo_cache.MIRRORS_DIR
+    for age, name in enumerate(["new", "mid", "old"]):
+        mirror = root / f"{name}.git"
+        mirror.mkdir(parents=True)
+        (mirror / repo_cache.SIZE_FILE).write_text("400")
+        os.utime(mirror, (1e9 - age * 100, 1e9 - age * 100))
+
+    assert repo_cache.evict_mirrors(0) == 0
+    assert repo_cache.evict_mirrors(1000) == 1
+    assert sorted(p.name for p in root.iterdir()) == ["mid.git", "new.git"]
+
+
+def test_lean_clone_fetches_only_python_blobs(tmp_path, repos_dir, monkeypatch):
+    """Lean mode skips non-.py blobs entirely and reports the bytes saved"""
+    remote = git.Repo.init(tmp_path / "remote")
+    remote.git.config('uploadpack.allowFilter', 'true')
+    data = "".join(f"{i},{i * i},{i * 7 % 13}\n" for i in range(200000))
+    commit_files(remote, {'main.py': "a\nb\n", 'data/big.csv': data, 'pkg/util.py': "x\n"})
+    url = (tmp_path / "remote").as_uri()
+    settings = repo_cache.get_settings().repository_analysis
+    monkeypatch.setattr(settings, 'repo_cache', False)
+    monkeypatch.setattr(settings, 'analysis_mode', 'checkout')
+
+    sizes = {}
+    for mode in ("full", "lean"):
+        monkeypatch.setattr(settings, 'clone_mode', mode)
+        stats.transfer_summary(reset=True)
+        result = analyze_repository(f"{mode}-email", url)
+        assert (result['total_files'], result['total_lines']) == (2, 3)
+        sizes[mode] = stats._transfers['bytes']
+
+    workdir = repos_dir / "lean-ema"
+    assert sorted(p.name for p in workdir.rglob('*') if p.is_file()) == ["main.py", "util.py"]
+    assert not (repos_dir / "lean-ema.git").exists()
+    assert 0 < sizes['lean'] * 10 < sizes['full']
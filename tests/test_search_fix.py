@@ -54,5 +54,5 @@ if success:
         if row_count > 0:
             print("Email subjects:")
             for i, row in enumerate(ws.iter_rows(min_row=2, values_only=True), 1):
-                email_id, received_time, subject, sender, github_url, thread_id, status = row
+                email_id, received_time, subject, sender, github_url, thread_id, status = row[:7]
                 print(f"{i}. {subject}")
@@ -0,0 +1,100 @@
+"""
+Test zipped submissions (Agent 1 attachment download, Agent 2 in-memory analysis)
+
+Author: Hadar Wayn
+Date: December 2025
+"""
+
+import io
+import sys
+import zipfile
+from email.message import EmailMessage
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.ui.agents.agent1_attachments as attachments
+from src.ui.agents.agent1_email_parser import extract_email_data
+from src.ui.agents.agent2_repo_analyzer import analyze_repository
+from src.ui.agents.agent2_zip_analyzer import ZipTooLargeError, analyze_zip_archive
+from src.ui.agents.mail_source_local import message_to_resource
+from src.ui.agents.mail_source_memory import InMemoryGmailService
+from src.utils.config import get_settings
+from tests.conftest import make_zip
+
+
+def _service(content: bytes) -> tuple:
+    msg = EmailMessage()
+    msg['From'] = "Student <s1@uni.ac.il>"
+    msg['Subject'] = "Homework 1"
+    msg['Date'] = "Mon, 01 Dec 2025 10:00:00 +0000"
+    msg.set_content("My homework is attached\n")
+    msg.add_attachment(content, maintype='application', subtype='zip', filename="hw1.zip")
+    resource, parts = message_to_resource(msg)
+    return InMemoryGmailService([resource], parts), resource['id']
+
+
+@pytest.fixture
+def attachments_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(attachments, 'get_attachments_dir', lambda: tmp_path)
+    return tmp_path
+
+
+def test_zip_attachment_becomes_ready_submission(attachments_dir):
+    """An email without a GitHub URL is submitted by its zip, downloaded once"""
+    service, message_id = _service(make_zip({'main.py': "print('hi')\n"}))
+    [row] = extract_email_data(service, [{'id': message_id}], max_attachment_bytes=1024 * 1024)
+
+    assert (row['status'], row['github_url']) == ("Ready", "attachment:hw1.zip")
+    assert 'zip_attachment' not in row
+    assert attachments.attachment_path(row['email_id']).exists()
+
+    extract_email_data(service, [{'id': message_id}], max_attachment_bytes=1024 * 1024)
+    assert service.calls['attachments.get'] == 1
+
+    [ignored] = extract_email_data(service, [{'id': message_id}])
+    assert ignored['status'] == "Missing: github_url"
+    [too_large] = extract_email_data(service, [{'id': message_id}], max_attachment_bytes=10)
+    assert too_large['status'] == attachments.TOO_LARGE_STATUS
+
+
+def test_lines_counted_like_readlines(attachments_dir):
+    """Line counts match text-mode readlines() without extracting anything"""
+    files = {
+        'pkg/a.py': "x = 1\ny = 2",                 # No trailing newline
+        'pkg/b.py': "a\r\nb\r\n",                   # Windows newlines
+        'pkg/long.py': "pass\n" * 200,              # Over the line limit
+        'pkg/bad.py': b"\xff\xfe not utf-8\n",      # Counted: lines need no decoding
+        '__MACOSX/pkg/._a.py': "metadata\n",
+        'README.md': "# not python\n",
+    }
+    with zipfile.ZipFile(io.BytesIO(make_zip(files))) as archive:
+        metrics = analyze_zip_archive(archive, max_bytes=1024 * 1024, max_entries=100)
+    assert metrics == {'total_lines': 205, 'compliant_lines': 5, 'file_count': 4,
+                       'skipped_dirs': 0, 'skipped_files': 0, 'skipped_bytes': 0}
+
+    service, message_id = _service(make_zip({'main.py': "a\nb\nc\n"}))
+    [row] = extract_email_data(service, [{'id': message_id}], max_attachment_bytes=1024 * 1024)
+    result = analyze_repository(row['email_id'], row['github_url'])
+    assert (result['status'], result['total_lines'], result['grade']) == ('Ready', 3, 100.0)
+
+
+def test_zip_bomb_is_rejected_before_decompressing(attachments_dir, monkeypatch):
+    """Declared uncompressed sizes and entry counts are checked up front"""
+    bomb = make_zip({'bomb.py': b"\n" * (20 * 1024 * 1024)})
+    assert len(bomb) < 100 * 1024
+    with zipfile.ZipFile(io.BytesIO(bomb)) as archive:
+        with pytest.raises(ZipTooLargeError):
+            analyze_zip_archive(archive, max_bytes=1024 * 1024, max_entries=100)
+    with zipfile.ZipFile(io.BytesIO(make_zip({f"f{i}.py": "" for i in range(20)}))) as archive:
+        with pytest.raises(ZipTooLargeError):
+            analyze_zip_archive(archive, max_bytes=1024 * 1024, max_entries=10)
+
+    monkeypatch.setattr(get_settings().repository_analysis, 'max_zip_bytes', 1024 * 1024)
+    attachments.attachment_path("bomb-email").write_bytes(bomb)
+    result = analyze_repository("bomb-email", "attachment:bomb.zip")
+    assert result['status'] == 'Failed: zip too large'